@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from .assignments import link_unassigned
+from .auth import hash_password
+from .importer import load_photographers_from_excel
+from .models import Photographer
+from .offload import run_in_process
+
+# 작가 계정 일괄 생성(스케줄 엑셀 자동 생성 / 작가 엑셀 / 작가 추가 공용)
+# - 기존 이름/아이디는 쿼리 1번으로 읽어 메모리에서 중복 확인
+# - 같은 초기 비밀번호 해시는 한 번만 계산해서 재사용(pbkdf2가 요청당 1번)
+# - 새 계정은 한 번의 executemany로 insert
+# - 이름만 먼저 입력돼 있던 스케줄은 새 작가 id에 연결
+
+DEFAULT_PASSWORD = "1234"
+
+
+def load_account_names(session: Session) -> tuple[set[str], set[str]]:
+    """(이름, 아이디) 집합"""
+    rows = session.exec(select(Photographer.name, Photographer.username)).all()
+    return {n for n, _ in rows}, {u for _, u in rows}
+
+
+def unique_username(base: str, taken: set[str]) -> str:
+    """username 기본 = 이름, 중복이면 숫자 붙임(이름2, 이름3 ...)"""
+    username = base
+    suffix = 1
+    while username in taken:
+        suffix += 1
+        username = f"{base}{suffix}"
+    return username
+
+
+def create_photographers(session: Session, people: Iterable[Photographer], password: str = DEFAULT_PASSWORD) -> int:
+    """세션에 넣지 않은 Photographer들을 계정으로 생성. 이미 있는 이름은 건너뜀. 생성 수 반환
+
+    username/password_hash는 여기서 채움. 다른 요청과 겹쳐 유니크 제약에 걸리면 다시 읽어 1번 재시도
+    """
+    people = list(people)
+    password_hash = None
+    for attempt in range(2):
+        names, usernames = load_account_names(session)
+        values = []
+        for p in people:
+            name = (p.name or "").strip()
+            if not name or name in names:
+                continue
+            names.add(name)
+            username = unique_username(name, usernames)
+            usernames.add(username)
+            if password_hash is None:
+                password_hash = hash_password(password)
+            values.append({
+                **p.model_dump(exclude={"id"}),
+                "name": name,
+                "username": username,
+                "password_hash": password_hash,
+            })
+        if not values:
+            return 0
+        try:
+            session.execute(insert(Photographer), values)
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            if attempt:
+                raise
+            continue
+        link_unassigned(session, [v["name"] for v in values])
+        return len(values)
+    return 0
+
+
+def provision_from_schedules(session: Session, rows: Iterable[dict], seen: set[str] | None = None) -> int:
+    """스케줄에 나온 메인/서브 이름 중 없는 작가 자동 생성(비번 1234)
+
+    seen: 이미 확인한 이름(청크 단위 저장에서 공유) → 새 이름이 없는 청크는 조회 없이 건너뜀
+    """
+    names = dict.fromkeys(nm for r in rows for nm in (r.get("main_name"), r.get("sub_name")) if nm)
+    if seen is not None:
+        names = [nm for nm in names if nm not in seen]
+        if not names:
+            return 0
+        seen.update(names)
+    return create_photographers(session, [Photographer(name=nm, status="활성", is_admin=False) for nm in names])
+
+
+def import_photographers_file(session: Session, path: str) -> tuple[int, int]:
+    """작가 엑셀 -> 기존 작가 수정 + 새 작가 생성(워커 스레드에서 호출). (생성 수, 수정 수) 반환"""
+    rows = run_in_process(load_photographers_from_excel, path)
+    imported = 0
+    updated = 0
+
+    # 기존 작가는 이름으로 한 번에 조회
+    names = {r.get("name") for r in rows if r.get("name")}
+    existing = {p.name: p for p in session.exec(select(Photographer).where(Photographer.name.in_(names))).all()} if names else {}
+    new_people: dict[str, Photographer] = {}
+
+    for r in rows:
+        name = r.get("name")
+        if not name:
+            continue
+        p = existing.get(name) or new_people.get(name.strip())
+        if p:
+            # update
+            p.phone = r.get("phone") or p.phone
+            p.address = r.get("address") or p.address
+            p.region = r.get("region") or p.region
+            if r.get("has_car") is not None:
+                p.has_car = r.get("has_car")
+            if r.get("start_date") is not None:
+                p.start_date = r.get("start_date")
+            p.gender = r.get("gender") or p.gender
+            p.role = r.get("role") or p.role
+            updated += 1
+        else:
+            # create (default password 1234) — 아래에서 한 번에 생성
+            new_people[name.strip()] = Photographer(
+                name=name.strip(),
+                phone=r.get("phone"),
+                address=r.get("address"),
+                region=r.get("region"),
+                has_car=r.get("has_car"),
+                start_date=r.get("start_date"),
+                status="활성",
+                memo=None,
+                gender=r.get("gender"),
+                role=r.get("role"),
+                is_admin=False,
+            )
+            imported += 1
+
+    session.commit()
+    create_photographers(session, new_people.values())
+    return imported, updated
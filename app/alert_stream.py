@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from .alerts import alert_state, feed_item
+from .db import read_engine
+
+# 알림 서버 푸시(SSE)
+# - 평가기는 프로세스에 1개: 관리자 탭이 N개 열려 있어도 평가는 1번
+# - 변경분(새 지연 overdue / 해소 cleared)만 각 탭으로 전송
+# - 체크/수정 시 alert_state.invalidate()가 깨우고, 마감 경과는 TICK_SECONDS 주기로 확인
+
+TICK_SECONDS = 15
+KEEPALIVE_SECONDS = 25
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class AlertBroadcaster:
+    def __init__(self, interval: float = TICK_SECONDS) -> None:
+        self.interval = interval
+        self._subscribers: set[asyncio.Queue] = set()
+        self._current: dict[str, dict] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._eval_lock: asyncio.Lock | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._eval_lock = asyncio.Lock()
+        self._task = self._loop.create_task(self._run())
+        alert_state.add_listener(self.notify)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        """다른 스레드(동기 핸들러)에서 호출 가능"""
+        if self._loop is None or self._wake is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # 루프 종료 중
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            # 보는 탭이 없으면 평가 생략
+            if not self._subscribers:
+                continue
+            try:
+                await self._evaluate()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _load() -> list[dict]:
+        with Session(read_engine) as session:
+            return [feed_item(r) for r in alert_state.overdue_rows(session, datetime.now())]
+
+    async def _evaluate(self) -> None:
+        async with self._eval_lock:
+            items = await run_in_threadpool(self._load)
+            new = {a["key"]: a for a in items}
+            deltas = [("overdue", a) for k, a in new.items() if self._current.get(k) != a]
+            deltas += [("cleared", {"key": k}) for k in self._current if k not in new]
+            self._current = new
+            if not deltas:
+                return
+            count = len(new)
+            for q in list(self._subscribers):
+                for event, data in deltas:
+                    q.put_nowait((event, {**data, "count": count}))
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        """SSE 문자열 스트림. 첫 이벤트는 현재 지연 목록(snapshot)."""
+        q: asyncio.Queue = asyncio.Queue()
+        self._subscribers.add(q)
+        try:
+            # 구독자가 없던 동안은 평가를 건너뛰므로 접속 시 한 번 맞춰줌
+            await self._evaluate()
+            while not q.empty():
+                q.get_nowait()
+            alerts = list(self._current.values())
+            yield _sse("snapshot", {"ok": True, "now": datetime.now().isoformat(), "count": len(alerts), "alerts": alerts})
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(q.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event, data)
+        finally:
+            self._subscribers.discard(q)
+
+
+alert_broadcaster = AlertBroadcaster()
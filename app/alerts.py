@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from sqlmodel import Session, select
+
+from .db import DATABASE_URL, READ_DATABASE_URL, is_sqlite
+from .models import Photographer, Schedule, Checkin, TravelTime
+from .offline_route import estimate_offline
+from .route_worker import route_worker
+from .travel_times import Pair, load_travel_table, pick_travel_time, route_key, storage_bucket
+
+# 알림 평가 엔진
+# - /admin/alerts, /admin/alerts/feed 가 같이 사용
+# - 스케줄/작가/체크인/이동시간을 고정된 몇 번의 일괄 쿼리로 읽고,
+#   (날짜, 웨딩홀, 작가) 묶음 상태는 메모리에서 계산
+#   (스케줄 수가 늘어도 쿼리 수는 그대로)
+
+# (표시, 작가 id, 작가 id가 없을 때 표시할 스케줄 이름)
+ROLES = (("메인", "main_photographer_id", "main_name"), ("서브", "sub_photographer_id", "sub_name"))
+
+
+def alert_window(now: datetime) -> tuple[date, date]:
+    """오늘~7일 내 스케줄 모니터링"""
+    start = now.date()
+    end = start + timedelta(days=7)
+    return start, end
+
+
+def compute_deadlines(schedule: Schedule, travel_minutes: int | None) -> dict:
+    # 기준 도착목표시간: arrival_target_time 있으면 우선, 없으면 예식시간 - 2시간
+    if schedule.wedding_time is None:
+        return {"arrival_target_dt": None, "wake_deadline": None, "depart_deadline": None}
+
+    base_time = schedule.arrival_target_time or (datetime.combine(schedule.wedding_date, schedule.wedding_time) - timedelta(hours=2)).time()
+    arrival_target_dt = datetime.combine(schedule.wedding_date, base_time)
+
+    wake_deadline = arrival_target_dt - timedelta(hours=2)
+
+    # 출발마감: 이동시간이 있으면 arrival_target - travel, 없으면 arrival_target - 60분
+    if travel_minutes is None:
+        depart_deadline = arrival_target_dt - timedelta(minutes=60)
+    else:
+        depart_deadline = arrival_target_dt - timedelta(minutes=travel_minutes)
+
+    return {
+        "arrival_target_dt": arrival_target_dt,
+        "wake_deadline": wake_deadline,
+        "depart_deadline": depart_deadline,
+    }
+
+
+def resolve_travel_minutes(
+    schedule: Schedule,
+    pair: Pair | None,
+    buckets: dict[str, TravelTime],
+    arrival_target_dt: datetime | None,
+    offline_minutes: int | None = None,
+) -> tuple[int | None, bool, str | None]:
+    """(이동시간, 계산중 여부, 출처). 네트워크 호출은 하지 않음.
+
+    출처: "route"(이동시간 표) / "default"(수동 기본값) / "offline"(직선거리 추정) / None
+    """
+    # 1) 이동시간 표 확인 — 도착목표 기준 출발 시간대와 가장 가까운 값(없으면 시간대 무관 값)
+    row, missing, departure = pick_travel_time(buckets, arrival_target_dt, schedule.travel_minutes_default)
+    if row:
+        if pair is not None and storage_bucket(missing or "", departure):
+            # 정확한 시간대 값은 백그라운드에서 보충(이미 지난 출발 시각은 그 시간대 교통을 알 수 없으므로 건너뜀)
+            route_worker.submit(pair, schedule.id, missing, departure)
+        return row.minutes, False, "route"
+
+    # 2) 스케줄에 수동 기본값이 있으면 그걸 사용 (계산 실패 대비)
+    if schedule.travel_minutes_default is not None:
+        return schedule.travel_minutes_default, False, "default"
+
+    # 3) 주소가 둘 다 있으면 워커에 계산을 맡기고, 그동안은 오프라인 추정값(있으면) 사용
+    if pair is not None:
+        bucket = storage_bucket(missing or "", departure)
+        route_worker.submit(pair, schedule.id, bucket, departure)
+        pending = route_worker.is_pending(pair, bucket)
+        if offline_minutes is not None:
+            return offline_minutes, pending, "offline"
+        return None, pending, None
+
+    return None, False, None
+
+
+def _snapshot(s: Schedule) -> Schedule:
+    # 세션과 분리된 사본 (세션 종료 후 alert_state에 보관해도 안전하게 읽기)
+    return Schedule(**s.model_dump())
+
+
+def evaluate_alerts(
+    session: Session,
+    now: datetime,
+    start: date | None = None,
+    end: date | None = None,
+    schedules: list[Schedule] | None = None,
+) -> list[dict]:
+    """기간 내 (스케줄, 메인/서브)별 알림 상태 행 목록.
+
+    쿼리: 스케줄 1회 + 작가 1회 + 체크인 1회 + 이동시간 표 1회 (+ 표에 없는 쌍이 있으면 좌표 1회)
+    schedules를 넘기면 스케줄 조회는 생략(증분 갱신용)
+    """
+    in_window = None
+    if schedules is None:
+        if start is None or end is None:
+            start, end = alert_window(now)
+        in_window = (Schedule.wedding_date >= start) & (Schedule.wedding_date <= end)
+        schedules = session.exec(
+            select(Schedule).where(in_window).order_by(Schedule.wedding_date, Schedule.wedding_time)
+        ).all()
+    if not schedules:
+        return []
+
+    ids = {getattr(s, attr) for s in schedules for _, attr, _ in ROLES if getattr(s, attr)}
+
+    photographers = session.exec(select(Photographer).where(Photographer.id.in_(ids))).all() if ids else []
+    by_id = {p.id: p for p in photographers}
+
+    # 기간 전체: 스케줄과 조인(수천 개 id를 IN 목록으로 보내지 않음), 증분 갱신: 바뀐 스케줄 id만
+    if in_window is not None:
+        checkins = session.exec(
+            select(Checkin).join(Schedule, Schedule.id == Checkin.schedule_id).where(in_window)
+        ).all()
+    else:
+        checkins = session.exec(select(Checkin).where(Checkin.schedule_id.in_([s.id for s in schedules]))).all()
+
+    checkin_map: dict[tuple[int, int], Checkin] = {}
+    for c in checkins:
+        checkin_map.setdefault((c.schedule_id, c.photographer_id), c)
+
+    # 스케줄별 이동시간은 (작가 주소, 웨딩홀 주소) 키로 이동시간 표에서 계산
+    pair_map = {
+        (s.id, pid): route_key(by_id[pid].address or "", s.venue_address)
+        for s in schedules for _, attr, _ in ROLES if (pid := getattr(s, attr)) in by_id
+    }
+    travel_table = load_travel_table(session, (p for p in pair_map.values() if p))
+
+    # 시간대 무관 값이 없는 쌍(표에 없음 / 다른 요일·시간대 값만 있음)은 오프라인(직선거리) 추정을 한 번에 계산
+    # → pick_travel_time이 고를 값이 없으면 항상 추정값으로 대신함
+    no_route = {p for p in pair_map.values() if p and "" not in travel_table.get(p, {})}
+    offline_map = estimate_offline(session, no_route) if no_route else {}
+
+    # 같은 날+같은 장소 묶음: (날짜, 웨딩홀, 작가) 단위로 출발/도착 여부
+    schedule_by_id = {s.id: s for s in schedules}
+    departed_groups: set[tuple[date, str, int]] = set()
+    arrived_groups: set[tuple[date, str, int]] = set()
+    for c in checkins:
+        s = schedule_by_id.get(c.schedule_id)
+        if s is None or c.photographer_id is None:
+            continue
+        group = (s.wedding_date, s.venue, c.photographer_id)
+        if c.depart_time is not None:
+            departed_groups.add(group)
+        if c.arrive_time is not None:
+            arrived_groups.add(group)
+
+    rows = []
+    for s in schedules:
+        view = _snapshot(s)
+        arrival_target_dt = compute_deadlines(s, None)["arrival_target_dt"]
+        for role, attr, name_attr in ROLES:
+            pid = getattr(s, attr)
+            # 계정이 없는 이름(작가 id 없음)은 체크할 수 없으므로 이름만 표시
+            name = by_id[pid].name if pid in by_id else getattr(s, name_attr)
+            if not name:
+                continue
+            pair = pair_map.get((s.id, pid))
+            travel_mins, travel_pending, travel_source = resolve_travel_minutes(
+                s, pair, travel_table.get(pair, {}) if pair else {}, arrival_target_dt,
+                offline_map.get(pair) if pair else None,
+            )
+
+            deadlines = compute_deadlines(s, travel_mins)
+            arrival_target_dt = deadlines["arrival_target_dt"]
+            wake_deadline = deadlines["wake_deadline"]
+            depart_deadline = deadlines["depart_deadline"]
+
+            chk = checkin_map.get((s.id, pid)) if pid is not None else None
+            group = (s.wedding_date, s.venue, pid)
+
+            # 상태 판단 (같은 날+같은 장소 묶음 도착/출발 처리된 경우도 OK로 간주)
+            wake_ok = bool(chk and chk.wake_time)
+            depart_ok = bool(chk and chk.depart_time) or group in departed_groups
+            arrive_ok = bool(chk and chk.arrive_time) or group in arrived_groups
+
+            # 알림 플래그 (지금 시각 기준)
+            wake_overdue = (wake_deadline is not None) and (now >= wake_deadline) and (not wake_ok)
+            depart_overdue = (depart_deadline is not None) and (now >= depart_deadline) and (not depart_ok)
+            arrive_overdue = (arrival_target_dt is not None) and (now >= arrival_target_dt) and (not arrive_ok)
+
+            rows.append({
+                "schedule": view,
+                "role": role,
+                "name": name,
+                "venue_address": s.venue_address,
+                "arrival_target_dt": arrival_target_dt,
+                "wake_deadline": wake_deadline,
+                "depart_deadline": depart_deadline,
+                "travel_mins": travel_mins,
+                "travel_pending": travel_pending,
+                "travel_source": travel_source,
+                "wake_ok": wake_ok,
+                "depart_ok": depart_ok,
+                "arrive_ok": arrive_ok,
+                "wake_overdue": wake_overdue,
+                "depart_overdue": depart_overdue,
+                "arrive_overdue": arrive_overdue,
+            })
+    return rows
+
+
+def is_overdue(row: dict) -> bool:
+    return bool(row["wake_overdue"] or row["depart_overdue"] or row["arrive_overdue"])
+
+
+def feed_item(row: dict) -> dict:
+    """/admin/alerts/feed JSON 항목"""
+    s = row["schedule"]
+    arrival_target_dt: Optional[datetime] = row["arrival_target_dt"]
+    return {
+        "key": f"{s.id}:{row['name']}:{row['role']}",
+        "schedule_id": s.id,
+        "date": str(s.wedding_date),
+        "venue": s.venue,
+        "wedding_time": s.wedding_time.strftime("%H:%M") if s.wedding_time else None,
+        "arrival_target": arrival_target_dt.strftime("%H:%M") if arrival_target_dt else None,
+        "name": row["name"],
+        "role": row["role"],
+        "wake_overdue": row["wake_overdue"],
+        "depart_overdue": row["depart_overdue"],
+        "arrive_overdue": row["arrive_overdue"],
+        "travel_mins": row["travel_mins"],
+    }
+
+
+# ---------------- 증분 알림 상태 ----------------
+# - (schedule_id, 작가) -> 알림 행을 메모리에 유지
+# - 체크/스케줄 수정/업로드 핸들러가 invalidate()로 바뀐 스케줄만 표시
+# - 마감 시각 경과는 정렬된 마감 힙으로 처리(전체 재계산 없음)
+# - invalidate()는 프로세스 안에서만 전달됨 → 여러 워커/서버(PostgreSQL)나 읽기 복제본(지연 가능)을 쓰면
+#   ALERT_MAX_AGE_SECONDS마다 전체 재적재(다른 워커의 체크 반영)
+
+ALERT_MAX_AGE_SECONDS = float(os.getenv(
+    "ALERT_MAX_AGE_SECONDS", "0" if is_sqlite(DATABASE_URL) and not READ_DATABASE_URL else "15"
+))  # 0이면 invalidate()만으로 갱신
+
+DEADLINE_KINDS = (("wake", "wake_deadline"), ("depart", "depart_deadline"), ("arrive", "arrival_target_dt"))
+
+
+def _sort_key(row: dict):
+    s = row["schedule"]
+    return (s.wedding_date, s.wedding_time is not None, s.wedding_time or datetime.min.time(), s.id, row["role"] != "메인")
+
+
+class AlertState:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rows: dict[tuple[int, str], dict] = {}
+        self._keys_by_schedule: dict[int, set[tuple[int, str]]] = {}
+        self._overdue: set[tuple[int, str]] = set()
+        self._heap: list[tuple[datetime, int, tuple[int, str], str, dict]] = []
+        self._seq = itertools.count()
+        self._window: tuple[date, date] | None = None
+        self._dirty: set[int] = set()
+        self._stale = True
+        self._loaded_at = 0.0
+        self._listeners: list[Callable[[], None]] = []
+
+    def add_listener(self, fn: Callable[[], None]) -> None:
+        """invalidate() 때마다 호출(알림 스트림 깨우기용)"""
+        self._listeners.append(fn)
+
+    def invalidate(self, schedule_ids: Iterable[int] | None = None) -> None:
+        """바뀐 스케줄 표시. None이면 다음 조회 때 전체 재적재."""
+        with self._lock:
+            if schedule_ids is None:
+                self._stale = True
+            else:
+                self._dirty.update(i for i in schedule_ids if i is not None)
+        for fn in self._listeners:
+            try:
+                fn()
+            except Exception:
+                pass
+
+    def rows(self, session: Session, now: datetime) -> list[dict]:
+        """기간 내 전체 알림 행(/admin/alerts)"""
+        with self._lock:
+            self._sync(session, now)
+            return sorted(self._rows.values(), key=_sort_key)
+
+    def overdue_rows(self, session: Session, now: datetime) -> list[dict]:
+        """지연 행만(/admin/alerts/feed)"""
+        with self._lock:
+            self._sync(session, now)
+            return sorted((self._rows[k] for k in self._overdue), key=_sort_key)
+
+    # --- 내부 ---
+    def _sync(self, session: Session, now: datetime) -> None:
+        window = alert_window(now)
+        expired = ALERT_MAX_AGE_SECONDS > 0 and time.monotonic() - self._loaded_at > ALERT_MAX_AGE_SECONDS
+        if self._stale or window != self._window or expired:
+            self._reload(session, now, window)
+        elif self._dirty:
+            self._refresh(session, now)
+        self._advance(now)
+
+    def _reload(self, session: Session, now: datetime, window: tuple[date, date]) -> None:
+        self._rows.clear()
+        self._keys_by_schedule.clear()
+        self._overdue.clear()
+        self._heap.clear()
+        self._dirty.clear()
+        for row in evaluate_alerts(session, now, window[0], window[1]):
+            self._put(row, now)
+        self._window = window
+        self._stale = False
+        self._loaded_at = time.monotonic()
+
+    def _refresh(self, session: Session, now: datetime) -> None:
+        ids, self._dirty = self._dirty, set()
+        start, end = self._window
+
+        # 바뀐 스케줄과 같은 (날짜, 웨딩홀) 묶음은 함께 재계산(묶음 출발/도착 상태)
+        changed = session.exec(select(Schedule).where(Schedule.id.in_(ids))).all()
+        groups = {(s.wedding_date, s.venue) for s in changed if start <= s.wedding_date <= end}
+        for sid in ids:
+            for key in self._keys_by_schedule.get(sid, ()):
+                old = self._rows[key]["schedule"]
+                groups.add((old.wedding_date, old.venue))
+
+        group_schedules: list[Schedule] = []
+        if groups:
+            dates = {d for d, _ in groups}
+            venues = {v for _, v in groups}
+            candidates = session.exec(
+                select(Schedule).where(Schedule.wedding_date.in_(dates) & Schedule.venue.in_(venues))
+            ).all()
+            group_schedules = [s for s in candidates if (s.wedding_date, s.venue) in groups]
+
+        for sid in ids | {s.id for s in group_schedules}:
+            for key in self._keys_by_schedule.pop(sid, set()):
+                self._rows.pop(key, None)
+                self._overdue.discard(key)
+        for row in evaluate_alerts(session, now, schedules=group_schedules):
+            self._put(row, now)
+
+    def _put(self, row: dict, now: datetime) -> None:
+        key = (row["schedule"].id, row["name"])
+        self._rows[key] = row
+        self._keys_by_schedule.setdefault(key[0], set()).add(key)
+        if is_overdue(row):
+            self._overdue.add(key)
+        # 아직 지나지 않은 마감만 힙에 등록
+        for kind, field in DEADLINE_KINDS:
+            deadline = row[field]
+            if deadline is not None and deadline > now and not row[f"{kind}_ok"]:
+                heapq.heappush(self._heap, (deadline, next(self._seq), key, kind, row))
+
+    def _advance(self, now: datetime) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key, kind, row = heapq.heappop(self._heap)
+            # 그 사이 재계산된 행이면 무시
+            if self._rows.get(key) is not row:
+                continue
+            row[f"{kind}_overdue"] = not row[f"{kind}_ok"]
+            if is_overdue(row):
+                self._overdue.add(key)
+
+
+alert_state = AlertState()
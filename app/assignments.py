@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from .models import Photographer, Schedule, ScheduleAssignment
+
+# 스케줄 담당 작가(메인/서브) 연결
+# - 스케줄의 main_name/sub_name은 엑셀/수정 화면에 적힌 이름 그대로(가져오기 비교용)
+# - 누가 담당인지는 작가 id(main_photographer_id/sub_photographer_id, 체크는 photographer_id)
+#   → 작가 이름을 바꿔도 작가 1행만 수정, 화면에는 작가의 현재 이름 표시
+# - ScheduleAssignment: (작가, 날짜) 인덱스로 "내 스케줄"을 1번에 찾는 연결 테이블
+#   스케줄을 저장하는 곳(가져오기/수정)에서 replace_assignments로 같이 갱신
+
+ROLES = (("main", "main_name", "main_photographer_id"), ("sub", "sub_name", "sub_photographer_id"))
+
+Link = tuple[int, date, Optional[int], Optional[int]]  # (스케줄 id, 날짜, 메인 작가 id, 서브 작가 id)
+
+
+def photographer_ids(session: Session, names: Iterable[Optional[str]]) -> dict[str, int]:
+    """이름 -> 작가 id(조회 1번)"""
+    names = {n for n in names if n}
+    if not names:
+        return {}
+    return dict(session.exec(select(Photographer.name, Photographer.id).where(Photographer.name.in_(names))).all())
+
+
+def photographer_names(session: Session, ids: Optional[Iterable[Optional[int]]] = None) -> dict[int, str]:
+    """작가 id -> 현재 이름(ids가 None이면 전체)"""
+    q = select(Photographer.id, Photographer.name)
+    if ids is not None:
+        ids = {i for i in ids if i is not None}
+        if not ids:
+            return {}
+        q = q.where(Photographer.id.in_(ids))
+    return dict(session.exec(q).all())
+
+
+def resolve_ids(row: dict, ids: dict[str, int]) -> dict:
+    """스케줄 행(dict)의 메인/서브 이름 -> {"main_photographer_id": .., "sub_photographer_id": ..}"""
+    return {id_attr: ids.get(row.get(name_attr)) for _, name_attr, id_attr in ROLES}
+
+
+def assignment_values(schedule_id: int, wedding_date: date, main_id: Optional[int], sub_id: Optional[int]) -> list[dict]:
+    """연결 행(메인/서브가 같은 작가면 1행)"""
+    values = []
+    for role, pid in (("main", main_id), ("sub", sub_id)):
+        if pid is not None and all(v["photographer_id"] != pid for v in values):
+            values.append({"schedule_id": schedule_id, "photographer_id": pid, "role": role, "wedding_date": wedding_date})
+    return values
+
+
+def replace_assignments(session: Session, links: list[Link]) -> None:
+    """스케줄별 연결을 다시 씀(삭제 1번 + insert 1번). 커밋은 호출한 쪽에서"""
+    if not links:
+        return
+    session.execute(delete(ScheduleAssignment).where(ScheduleAssignment.schedule_id.in_([l[0] for l in links])))
+    values = [v for link in links for v in assignment_values(*link)]
+    if values:
+        session.execute(insert(ScheduleAssignment), values)
+
+
+def unassign(session: Session, schedule_ids: list[int]) -> None:
+    """삭제하는 스케줄의 연결 삭제. 커밋은 호출한 쪽에서"""
+    session.execute(delete(ScheduleAssignment).where(ScheduleAssignment.schedule_id.in_(schedule_ids)))
+
+
+def link_of(s: Schedule) -> Link:
+    return (s.id, s.wedding_date, s.main_photographer_id, s.sub_photographer_id)
+
+
+def assign(session: Session, s: Schedule) -> None:
+    """스케줄 1개의 메인/서브 이름으로 작가 id를 다시 맞추고 연결 갱신(관리자 수정). 커밋은 호출한 쪽에서"""
+    ids = photographer_ids(session, (s.main_name, s.sub_name))
+    for _, name_attr, id_attr in ROLES:
+        setattr(s, id_attr, ids.get(getattr(s, name_attr)))
+    session.add(s)
+    session.flush()
+    replace_assignments(session, [link_of(s)])
+
+
+def link_unassigned(session: Session, names: Iterable[str]) -> int:
+    """이름만 있고 작가 id가 없는 스케줄(작가 계정보다 먼저 입력된 이름)을 새 작가에 연결. 연결한 스케줄 수"""
+    ids = photographer_ids(session, names)
+    if not ids:
+        return 0
+    names = list(ids)
+    schedules = session.exec(select(Schedule).where(
+        (Schedule.main_photographer_id.is_(None) & Schedule.main_name.in_(names))
+        | (Schedule.sub_photographer_id.is_(None) & Schedule.sub_name.in_(names))
+    )).all()
+    for s in schedules:
+        for _, name_attr, id_attr in ROLES:
+            if getattr(s, id_attr) is None:
+                setattr(s, id_attr, ids.get(getattr(s, name_attr)))
+        session.add(s)
+    replace_assignments(session, [link_of(s) for s in schedules])
+    session.commit()
+    return len(schedules)
+
+
+def assigned_schedules(photographer_id: int, start: date, end: Optional[date] = None):
+    """작가의 담당 스케줄 조회문(날짜 start~end) — (작가, 날짜) 인덱스 범위 1번 + 스케줄 기본키 조회"""
+    end = start if end is None else end
+    return (
+        select(Schedule)
+        .join(ScheduleAssignment, ScheduleAssignment.schedule_id == Schedule.id)
+        .where(
+            (ScheduleAssignment.photographer_id == photographer_id)
+            & (ScheduleAssignment.wedding_date >= start)
+            & (ScheduleAssignment.wedding_date <= end)
+        )
+    )
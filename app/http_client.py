@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+import urllib.parse
+from typing import Optional
+
+# Kakao Local / KakaoMobility 공용 HTTP 클라이언트
+# - 호스트별 keep-alive 연결 풀 (매 요청 TLS 핸드셰이크 제거)
+# - 호스트별 동시 요청 수 제한
+# - 429/5xx 는 지수 백오프로 재시도 (Retry-After 헤더 우선, 대기는 HTTP_MAX_RETRY_DELAY초까지)
+# - aget_json: 이벤트 루프를 막지 않는 async 버전
+
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "4"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))  # 초, 시도마다 2배
+HTTP_MAX_RETRY_DELAY = float(os.getenv("HTTP_MAX_RETRY_DELAY", "30"))  # 재시도 1번 대기 상한(초) — Retry-After: 3600 이어도 워커를 오래 잡지 않음
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status: int, url: str, body: bytes = b"") -> None:
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+        self.url = url
+        self.body = body
+
+
+class PooledHTTPClient:
+    def __init__(
+        self,
+        max_per_host: int = HTTP_MAX_PER_HOST,
+        retries: int = HTTP_RETRIES,
+        backoff: float = HTTP_BACKOFF,
+        timeout: float = 10,
+        max_retry_delay: float = HTTP_MAX_RETRY_DELAY,
+    ) -> None:
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_retry_delay = max_retry_delay
+        self.timeout = timeout
+        self._idle: dict[tuple[str, str, int], queue.LifoQueue] = {}
+        self._limits: dict[tuple[str, str, int], threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    # --- 연결 풀 ---
+    def _host_state(self, key: tuple[str, str, int]):
+        with self._lock:
+            if key not in self._idle:
+                self._idle[key] = queue.LifoQueue()
+                self._limits[key] = threading.BoundedSemaphore(self.max_per_host)
+            return self._idle[key], self._limits[key]
+
+    def _new_conn(self, key: tuple[str, str, int], timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._idle.values())
+        for idle in pools:
+            while True:
+                try:
+                    idle.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    # --- 요청 ---
+    def get_json(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None) -> dict:
+        timeout = self.timeout if timeout is None else timeout
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "https"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        idle, limit = self._host_state(key)
+        attempt = 0
+        while True:
+            with limit:
+                status, resp_headers, body = self._request(key, idle, path, headers or {}, timeout)
+            if status < 400:
+                return json.loads(body.decode("utf-8"))
+            if status not in RETRY_STATUSES or attempt >= self.retries:
+                raise HTTPStatusError(status, url, body)
+            time.sleep(self._retry_delay(attempt, resp_headers.get("Retry-After")))
+            attempt += 1
+
+    async def aget_json(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None) -> dict:
+        return await asyncio.to_thread(self.get_json, url, headers, timeout)
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        delay = self.backoff * (2 ** attempt)
+        if retry_after:
+            try:
+                delay = max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return min(delay, self.max_retry_delay)
+
+    def _request(self, key, idle: queue.LifoQueue, path: str, headers: dict, timeout: float):
+        try:
+            conn = idle.get_nowait()
+            reused = True
+        except queue.Empty:
+            conn = self._new_conn(key, timeout)
+            reused = False
+        try:
+            conn.timeout = timeout
+            if reused and conn.sock is not None:
+                # 이미 열린 소켓은 연결할 때의 timeout을 그대로 씀 → 이번 요청 값으로 바꿈
+                conn.sock.settimeout(timeout)
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.CannotSendRequest):
+            conn.close()
+            if not reused:
+                raise
+            # 서버가 닫은 keep-alive 연결: 새 연결로 1번 더
+            conn = self._new_conn(key, timeout)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            idle.put(conn)
+        return resp.status, resp.headers, body
+
+
+http_client = PooledHTTPClient()
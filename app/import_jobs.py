@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import os
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlmodel import Session
+
+from .db import engine
+
+# 엑셀 가져오기 백그라운드 작업
+# - 업로드 요청은 파일만 저장하고 작업 id를 바로 반환
+# - 작업은 워커 1개가 순서대로 처리(SQLite 쓰기 잠금 경합 없음, 여러 업로드는 대기열로)
+# - 진행 상황(읽은 행/추가/중복 제외/오류)은 /admin/imports/{id} 로 조회
+# - 미리보기(preview): 파싱 + 중복 비교만 하고 저장하지 않음. 파싱된 행은 작업 id(토큰)로 보관했다가
+#   확정하면 다시 파싱하지 않고 그대로 저장
+# - 스케줄 엑셀은 이미 끝까지 가져온 파일과 바이트가 같으면 건너뜀(force면 다시 가져옴)
+
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "1"))
+IMPORT_JOB_HISTORY = int(os.getenv("IMPORT_JOB_HISTORY", "50"))  # 메모리에 남겨둘 완료 작업 수
+IMPORT_PREVIEW_TTL_MINUTES = int(os.getenv("IMPORT_PREVIEW_TTL_MINUTES", "30"))  # 미리보기 토큰 유효시간
+PREVIEW_SAMPLE = 50  # 진행 상황 응답에 넣을 미리보기 행 수
+
+KINDS = ("schedules", "photographers", "preview")
+
+
+@dataclass
+class ImportJob:
+    id: str
+    kind: str  # schedules / photographers / preview
+    filename: str
+    mode: str = ""
+    force: bool = False  # 같은 파일이어도 다시 가져오기
+    status: str = "queued"  # queued / running / done / failed
+    parsed: int = 0  # 읽은 행
+    inserted: int = 0  # 추가
+    updated: int = 0  # 수정(작가)
+    skipped: int = 0  # 변경 없음/중복 제외
+    identical: bool = False  # 이미 가져온 파일과 같음(스케줄: 건너뜀, 미리보기: 안내만)
+    errors: list[str] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    preview: Optional[dict] = None  # 미리보기 요약(건수 + 일부 행)
+    source: Optional[str] = None  # 미리보기에서 확정한 작업이면 미리보기 작업 id
+    digest: Optional[str] = field(default=None, repr=False)  # 업로드 파일 sha256
+    rows: Optional[list] = field(default=None, repr=False)  # 미리보기: 파싱된 행(확정 시 사용)
+    diff: Optional[dict] = field(default=None, repr=False)  # 미리보기: 전체 비교 결과
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def progress(self, parsed: int, inserted: int, updated: int = 0) -> None:
+        """청크 하나 저장할 때마다 호출"""
+        self.parsed += parsed
+        self.inserted += inserted
+        self.updated += updated
+        self.skipped += parsed - inserted - updated
+
+    @property
+    def preview_expired(self) -> bool:
+        if self.finished_at is None:
+            return False
+        return datetime.now() - self.finished_at > timedelta(minutes=IMPORT_PREVIEW_TTL_MINUTES)
+
+    def to_dict(self) -> dict:
+        d = {f.name: getattr(self, f.name) for f in fields(self) if f.name not in ("rows", "diff", "digest")}
+        d["errors"] = list(self.errors)
+        for k in ("created_at", "started_at", "finished_at"):
+            d[k] = d[k].isoformat(timespec="seconds") if d[k] else None
+        d["finished"] = self.finished
+        return d
+
+
+class ImportJobQueue:
+    def __init__(self, workers: int = IMPORT_JOB_WORKERS, history: int = IMPORT_JOB_HISTORY) -> None:
+        self.history = history
+        self._jobs: OrderedDict[str, ImportJob] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import-job")
+
+    def submit(self, kind: str, path: str, filename: str, mode: str = "", force: bool = False) -> ImportJob:
+        """임시 저장된 업로드 파일을 대기열에 넣음(파일은 작업이 끝나면 삭제)"""
+        if kind not in KINDS:
+            raise ValueError(kind)
+        job = ImportJob(id=uuid.uuid4().hex[:12], kind=kind, filename=filename, mode=mode, force=force)
+        self._enqueue(job, path)
+        return job
+
+    def commit_preview(self, token: str) -> Optional[ImportJob]:
+        """미리보기 토큰의 파싱된 행을 저장 작업으로(다시 파싱하지 않음). 토큰이 없거나 만료면 None"""
+        with self._lock:
+            preview = self._jobs.get(token)
+            if preview is None or preview.kind != "preview" or preview.status != "done" or preview.rows is None:
+                return None
+            if preview.preview_expired:
+                preview.rows = preview.diff = None
+                return None
+            rows, preview.rows, preview.diff = preview.rows, None, None  # 토큰은 1번만 사용
+        job = ImportJob(id=uuid.uuid4().hex[:12], kind="schedules", filename=preview.filename, source=token)
+        job.rows = rows
+        job.digest = preview.digest
+        self._enqueue(job, None)
+        return job
+
+    def _enqueue(self, job: ImportJob, path: Optional[str]) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        self._pool.submit(self._run, job, path)
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def recent(self, kind: Optional[str] = None, limit: int = 10) -> list[ImportJob]:
+        with self._lock:
+            jobs = [j for j in reversed(self._jobs.values()) if kind is None or j.kind == kind]
+        return jobs[:limit]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(1 for j in self._jobs.values() if not j.finished)
+
+    def _trim(self) -> None:
+        # 오래된 '완료' 작업부터 정리(진행 중인 작업은 남김), 만료된 미리보기 행은 메모리에서 해제
+        done = [k for k, j in self._jobs.items() if j.finished]
+        for k in done[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[k]
+        for j in self._jobs.values():
+            if j.rows is not None and j.kind == "preview" and j.preview_expired:
+                j.rows = j.diff = None
+
+    def _run(self, job: ImportJob, path: Optional[str]) -> None:
+        from .accounts import import_photographers_file
+        from .alerts import alert_state
+        from .schedule_import import (
+            diff_schedule_rows, import_parsed_rows, import_schedules_file, jsonable_row, jsonable_update,
+            parse_schedules_file, record_workbook, workbook_digest, workbook_imported,
+        )
+
+        job.status = "running"
+        job.started_at = datetime.now()
+        try:
+            with Session(engine) as session:
+                if path and job.kind in ("preview", "schedules"):
+                    job.digest = workbook_digest(path)
+                    job.identical = workbook_imported(session, job.digest) is not None
+                if job.kind == "preview":
+                    rows, duplicates = parse_schedules_file(path)
+                    diff = diff_schedule_rows(session, rows)
+                    diff["duplicate_file"] = duplicates + diff["duplicate_file"]
+                    job.parsed = len(rows) + len(duplicates)
+                    job.skipped = len(diff["duplicate_db"]) + len(diff["duplicate_file"])
+                    job.rows, job.diff = rows, diff
+                    job.preview = {
+                        "insert": len(diff["insert"]),
+                        "update": len(diff["update"]),
+                        "duplicate_db": len(diff["duplicate_db"]),
+                        "duplicate_file": len(diff["duplicate_file"]),
+                        "new_photographers": diff["new_photographers"],
+                        "sample_insert": [jsonable_row(r) for r in diff["insert"][:PREVIEW_SAMPLE]],
+                        "sample_update": [jsonable_update(u) for u in diff["update"][:PREVIEW_SAMPLE]],
+                        "sample_duplicate": [jsonable_row(r) for r in diff["duplicate_db"][:PREVIEW_SAMPLE]],
+                    }
+                elif job.kind == "schedules" and job.rows is not None:
+                    rows, job.rows = job.rows, None
+                    import_parsed_rows(session, rows, progress=job.progress)
+                elif job.kind == "schedules" and job.identical and not job.force:
+                    pass  # 바이트가 같은 파일: 파싱/저장 없이 완료
+                elif job.kind == "schedules":
+                    import_schedules_file(session, path, job.mode, progress=job.progress)
+                else:
+                    imported, updated = import_photographers_file(session, path)
+                    job.inserted, job.updated = imported, updated
+                    job.parsed = imported + updated
+                if job.kind == "schedules" and job.digest and not (job.identical and not job.force):
+                    record_workbook(session, job.digest, job.filename, job.parsed, job.inserted, job.updated)
+            job.status = "done"
+        except Exception as e:
+            job.errors.append(f"{type(e).__name__}: {e}")
+            job.status = "failed"
+            traceback.print_exc()
+        finally:
+            job.finished_at = datetime.now()
+            if path:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            if job.kind != "preview":
+                # 일부 청크만 저장됐어도 알림은 다시 계산
+                alert_state.invalidate()
+            with self._lock:
+                self._trim()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+import_jobs = ImportJobQueue()
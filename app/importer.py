@@ -1,7 +1,8 @@
 from __future__ import annotations
 import re
-from datetime import datetime, date, time
-from typing import Optional, Tuple, List
+from itertools import chain
+from datetime import datetime, date, time, timedelta
+from typing import Iterator, Optional, Tuple, List
 import pandas as pd
 
 SEPARATORS = ["·", "/", ",", "&", "및", " and "]
@@ -75,6 +76,270 @@ def parse_time(value) -> Optional[time]:
     except Exception:
         return None
 
+# 줄바꿈 구분(str.splitlines()와 같은 문자 집합)
+_LINE_BREAKS = r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]"
+# datetime.strptime(s, "%H:%M")와 같은 허용 범위
+_HHMM = r"^(2[0-3]|[0-1]\d|\d):([0-5]\d|\d)\Z"
+_YMD_KR = r"(\d{2})년\s*(\d{1,2})월\s*(\d{1,2})일"
+
+
+def _parse_time_hhmm(s) -> Optional[time]:
+    s = (s or "").strip()
+    if not s:
+        return None
+    try:
+        return datetime.strptime(s, "%H:%M").time()
+    except Exception:
+        return None
+
+
+def _compute_shoot_and_arrival(wedding_time, shoot_start):
+    """촬영시작 비어있으면 예식-1시간, 도착목표는 촬영시작-30분"""
+    if shoot_start is None and wedding_time is not None:
+        shoot_start = (datetime.combine(date.today(), wedding_time) - timedelta(hours=1)).time()
+    arrival_target = None
+    if shoot_start is not None:
+        arrival_target = (datetime.combine(date.today(), shoot_start) - timedelta(minutes=30)).time()
+    return shoot_start, arrival_target
+
+
+def _cell_str(v) -> str:
+    """셀 값 -> 문자열(두 경로 공용). 정수값 실수는 정수로: "123.0" -> "123"
+
+    빈 칸이 섞인 숫자 열은 pandas가 float(123.0)로, 스트리밍(openpyxl)은 int(123)로 읽음
+    → 같은 워크북이면 경로와 상관없이 같은 홀/커플/작가 이름(가져오기 키/내용 해시)
+    """
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v)
+
+
+def _str_col(col: pd.Series) -> pd.Series:
+    return col.map(_cell_str)
+
+
+def _column(df: pd.DataFrame, i: int) -> pd.Series:
+    """i번째 열(없으면 전부 NaN)"""
+    if len(df.columns) > i:
+        return df.iloc[:, i]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def _strip_or_none(col: pd.Series) -> pd.Series:
+    """(str(v).strip() if not NaN else "") or None 을 열 단위로"""
+    out = pd.Series([None] * len(col), index=col.index, dtype=object)
+    mask = col.notna()
+    if mask.any():
+        vals = _str_col(col[mask]).str.strip()
+        out[mask] = vals.where(vals != "", None)
+    return out
+
+
+def _hhmm_to_time(col: pd.Series) -> pd.Series:
+    """문자열 열 -> datetime.time (형식 불일치/NaN은 None)"""
+    out = pd.Series([None] * len(col), index=col.index, dtype=object)
+    parts = col.str.extract(_HHMM)
+    ok = parts[0].notna()
+    if ok.any():
+        hh = parts.loc[ok, 0].astype(int).to_numpy()
+        mm = parts.loc[ok, 1].astype(int).to_numpy()
+        out[ok] = [time(h, m) for h, m in zip(hh, mm)]
+    return out
+
+
+def _cell_to_time(v) -> Optional[time]:
+    """엑셀 셀(time/datetime/문자열) -> datetime.time"""
+    if v is None or pd.isna(v):
+        return None
+    # pandas가 time/datetime로 읽어올 수 있음
+    if hasattr(v, "hour") and hasattr(v, "minute"):
+        try:
+            return v.time() if hasattr(v, "time") else v
+        except Exception:
+            return None
+    return _parse_time_hhmm(str(v))
+
+
+def _join_rows(columns: dict) -> List[dict]:
+    keys = list(columns)
+    return [dict(zip(keys, vals)) for vals in zip(*(columns[k] for k in keys))]
+
+
+def _detect_date_rows(c0: pd.Series) -> pd.Series:
+    """첫 열의 "26년 02월 08일 (일)" 날짜 행 -> date (아니면 NaT)"""
+    ymd = c0.astype(str).str.extract(_YMD_KR)
+    parts = pd.DataFrame({
+        "year": pd.to_numeric(ymd[0], errors="coerce") + 2000,
+        "month": pd.to_numeric(ymd[1], errors="coerce"),
+        "day": pd.to_numeric(ymd[2], errors="coerce"),
+    })
+    # 잘못된 날짜(2월 30일 등)는 NaT → 날짜 행 아님
+    return pd.to_datetime(parts, errors="coerce")
+
+
+def _parse_date_block(df_raw: pd.DataFrame, marker: pd.Series) -> List[dict]:
+    """날짜 블록 포맷: 날짜 행 아래 웨딩홀/시간/메인/서브/촬영시간"""
+    is_date = marker.notna()
+    current_date = marker.ffill()
+
+    c0 = _column(df_raw, 0)
+    time_cell = _column(df_raw, 1)
+    main_cell = _column(df_raw, 2)
+    sub_cell = _column(df_raw, 3)
+    shoot_cell = _column(df_raw, 4)  # 촬영시간(선택)
+
+    # 헤더 스킵(병합/줄바꿈 때문에 공백이 섞일 수 있어 contains로 처리)
+    is_header = c0.str.contains("웨딩홀", regex=False, na=False).astype(bool)
+    keep = (~is_date) & (~is_header) & current_date.notna() & c0.notna()
+    venue_raw = _str_col(c0[keep]).str.strip()
+    keep_idx = venue_raw.index[venue_raw != ""]
+    if len(keep_idx) == 0:
+        return []
+    venue_raw = venue_raw[keep_idx]
+
+    venue_name = venue_raw.str.split("\n").str[0].str.strip()
+    venue_addr = venue_raw.str.replace("\n", " ", regex=False).str.extract(r"\((.+)\)")[0].str.strip()
+
+    # 시간 칸: 첫 줄 = 예식시간, 나머지 줄 = 신랑/신부
+    t = time_cell[keep_idx]
+    t_lines = _str_col(t[t.notna()]).str.split(_LINE_BREAKS, n=1, regex=True)
+    first = t_lines.str[0].str.strip().reindex(keep_idx)
+    wedding_time = _hhmm_to_time(first)
+
+    rest = t_lines.str[1].dropna()
+    couple = pd.Series([None] * len(keep_idx), index=keep_idx, dtype=object)
+    if len(rest):
+        lines = rest.str.split(_LINE_BREAKS, regex=True).explode().str.strip()
+        lines = lines[lines != ""]
+        if len(lines):
+            joined = lines.groupby(level=0).agg(" ".join)
+            couple[joined.index] = joined
+
+    main_name = _strip_or_none(main_cell[keep_idx])
+    sub_name = _strip_or_none(sub_cell[keep_idx])
+    raw_photographers = (main_name.fillna("") + " " + sub_name.fillna("")).str.strip()
+
+    shoot = shoot_cell[keep_idx]
+    shoot_start = pd.Series([None] * len(keep_idx), index=keep_idx, dtype=object)
+    has_shoot = shoot.notna()
+    if has_shoot.any():
+        shoot_start[has_shoot] = [_cell_to_time(v) for v in shoot[has_shoot]]
+
+    shoot_arrival = [_compute_shoot_and_arrival(w, sh) for w, sh in zip(wedding_time, shoot_start)]
+
+    return _join_rows({
+        "wedding_date": [d.date() for d in current_date[keep_idx]],
+        "wedding_time": wedding_time.tolist(),
+        "shoot_start_time": [x[0] for x in shoot_arrival],
+        "arrival_target_time": [x[1] for x in shoot_arrival],
+        "venue": venue_name.tolist(),
+        "venue_address": venue_addr.where(venue_addr.notna(), None).tolist(),
+        "couple": couple.tolist(),
+        "main_name": main_name.tolist(),
+        "sub_name": sub_name.tolist(),
+        "raw_photographers": raw_photographers.tolist(),
+    })
+
+
+def _cell_to_date(v) -> Optional[date]:
+    if hasattr(v, "date"):
+        try:
+            return v.date()
+        except Exception:
+            pass
+    try:
+        return pd.to_datetime(v).date()
+    except Exception:
+        return None
+
+
+def _cell_to_wedding_time(v) -> Optional[time]:
+    if hasattr(v, "time"):
+        try:
+            return v.time()
+        except Exception:
+            pass
+    if v is not None and not pd.isna(v):
+        return _parse_time_hhmm(str(v))
+    return None
+
+
+def _parse_columns(df: pd.DataFrame) -> List[dict]:
+    """기존 표준 포맷(열 기반: G=예식일, H=예식시간, J=웨딩홀, C=커플, F=촬영자)"""
+    wedding_date = _column(df, 6)  # G
+    wedding_time = _column(df, 7)  # H
+    couple = _column(df, 2)        # C
+    photographers_raw = _column(df, 5)  # F
+    venue = _column(df, 9)         # J
+
+    keep = venue.notna() & wedding_date.notna()
+    if not keep.any():
+        return []
+    wedding_date = wedding_date[keep]
+
+    # 날짜: 엑셀 날짜 열이면 한 번에 변환, 섞여 있으면 셀 단위
+    if pd.api.types.is_datetime64_any_dtype(wedding_date):
+        wdate = pd.Series(wedding_date.dt.date, index=wedding_date.index, dtype=object)
+    else:
+        wdate = wedding_date.map(_cell_to_date)
+    keep_idx = wdate.index[wdate.notna()]
+    if len(keep_idx) == 0:
+        return []
+    wdate = wdate[keep_idx]
+
+    wt = wedding_time[keep_idx]
+    if pd.api.types.is_datetime64_any_dtype(wt):
+        wtime = pd.Series([None] * len(wt), index=keep_idx, dtype=object)
+        has = wt.notna()
+        wtime[has] = wt[has].dt.time
+    else:
+        wtime = wt.map(_cell_to_wedding_time)
+
+    venue_name = _str_col(venue[keep_idx]).str.strip()
+    couple_str = _strip_or_none(couple[keep_idx])
+
+    raw = photographers_raw[keep_idx]
+    raw = _str_col(raw.astype(object).where(raw.notna(), "")).str.strip()
+    names = raw.str.findall(r"[^\s,]+")
+    # 이름이 2개인 행이 하나도 없으면 str[1]이 float(NaN) 열 → object로 바꿔야 None으로 채워짐
+    main_name = names.str[0].astype(object)
+    sub_name = names.str[1].astype(object)
+
+    shoot_arrival = [_compute_shoot_and_arrival(w, None) for w in wtime]
+
+    return _join_rows({
+        "wedding_date": wdate.tolist(),
+        "wedding_time": wtime.tolist(),
+        "shoot_start_time": [x[0] for x in shoot_arrival],
+        "arrival_target_time": [x[1] for x in shoot_arrival],
+        "venue": venue_name.tolist(),
+        "couple": couple_str.tolist(),
+        "main_name": main_name.where(main_name.notna(), None).tolist(),
+        "sub_name": sub_name.where(sub_name.notna(), None).tolist(),
+        "raw_photographers": raw.tolist(),
+    })
+
+
+def _promote_header(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """header=None으로 읽은 프레임의 첫 행을 헤더로(pd.read_excel(header=0)과 같은 결과)"""
+    if len(df_raw) == 0:
+        return pd.DataFrame(columns=range(len(df_raw.columns)))
+    names, seen = [], {}
+    for i, v in enumerate(df_raw.iloc[0]):
+        name = f"Unnamed: {i}" if pd.isna(v) else str(v)
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+        seen.setdefault(base, 0)
+        seen[name] = 0
+        names.append(name)
+    df = df_raw.iloc[1:].reset_index(drop=True)
+    df.columns = names
+    # 헤더 문자열이 빠졌으니 열 타입(날짜/숫자) 다시 추론
+    return df.infer_objects()
+
+
 def load_schedules_from_excel(file_path: str) -> List[dict]:
     """엑셀에서 스케줄 리스트를 로드합니다.
 
@@ -87,201 +352,172 @@ def load_schedules_from_excel(file_path: str) -> List[dict]:
     규칙
     - 촬영시간(촬영시작시간)이 비어있으면: 예식시간 - 1시간
     - 도착목표시간은: 촬영시작시간 - 30분
+
+    셀 단위 반복 대신 열 단위(pandas 문자열/날짜 연산)로 처리합니다.
+    시트가 여러 개면(월별 시트 등) 모든 시트를 순서대로 읽습니다(스케줄 행이 없는 시트는 건너뜀).
     """
-    import pandas as pd
-    from datetime import datetime, date, timedelta
-    import re
+    # 워크북은 한 번만 열고 시트마다 1번 읽음(header=None으로 첫 줄 날짜 유지)
+    with pd.ExcelFile(file_path) as xls:
+        return [r for sh in xls.sheet_names for r in _parse_sheet(xls.parse(sh, header=None))]
 
-    def parse_ymd_kr(s: str) -> date | None:
-        if s is None:
-            return None
-        s = str(s)
-        m = re.search(r"(\d{2})년\s*(\d{1,2})월\s*(\d{1,2})일", s)
-        if not m:
-            return None
-        yyyy = 2000 + int(m.group(1))
-        mm = int(m.group(2))
-        dd = int(m.group(3))
-        try:
-            return date(yyyy, mm, dd)
-        except Exception:
-            return None
 
-    def parse_time_hhmm(s: str):
-        s = (s or "").strip()
-        if not s:
-            return None
-        # excel time objects can come as datetime.time in pandas; handle outside
-        try:
-            return datetime.strptime(s, "%H:%M").time()
-        except Exception:
-            return None
+def schedule_sheet_names(file_path: str) -> List[str]:
+    """워크북 시트 이름(순서대로)"""
+    with pd.ExcelFile(file_path) as xls:
+        return list(xls.sheet_names)
+
+
+def load_schedule_sheets(file_path: str, sheets: List[str]) -> List[List[dict]]:
+    """지정한 시트들만 읽어 시트별 스케줄 리스트로(병렬 파싱용, 프로세스마다 워크북은 1번만 엶)"""
+    with pd.ExcelFile(file_path) as xls:
+        return [_parse_sheet(xls.parse(sh, header=None)) for sh in sheets]
+
+
+def _parse_sheet(df_raw: pd.DataFrame) -> List[dict]:
+    """header=None으로 읽은 시트 하나 -> 스케줄 리스트(포맷 자동 판별)"""
+    if len(df_raw.columns) >= 2:
+        # 첫 20행 안에 날짜 패턴이 있으면 날짜 블록 포맷으로 간주
+        marker = _detect_date_rows(df_raw.iloc[:, 0])
+        if marker.iloc[:20].notna().any():
+            return _parse_date_block(df_raw, marker)
+
+    # ------------- 기존 포맷(열 기반): 첫 행을 헤더로 -------------
+    return _parse_columns(_promote_header(df_raw))
 
-    def compute_shoot_and_arrival(wedding_time, shoot_start):
-        if shoot_start is None and wedding_time is not None:
-            shoot_start = (datetime.combine(date.today(), wedding_time) - timedelta(hours=1)).time()
-        arrival_target = None
-        if shoot_start is not None:
-            arrival_target = (datetime.combine(date.today(), shoot_start) - timedelta(minutes=30)).time()
-        return shoot_start, arrival_target
 
-    # ------------- 먼저 날짜 블록 포맷을 시도 (header=None으로 첫 줄 날짜 유지) -------------
+def _ymd_kr(v) -> Optional[date]:
+    m = re.search(_YMD_KR, str(v)) if v is not None else None
+    if not m:
+        return None
     try:
-        df_raw = pd.read_excel(file_path, header=None)
+        return date(2000 + int(m.group(1)), int(m.group(2)), int(m.group(3)))
     except Exception:
-        df_raw = None
+        return None
 
-    rows: List[dict] = []
 
-    if df_raw is not None and len(df_raw.columns) >= 2:
-        # 첫 20행 안에 날짜 패턴이 있으면 날짜 블록 포맷으로 간주
-        has_date = False
-        for i in range(min(20, len(df_raw))):
-            d = parse_ymd_kr(df_raw.iloc[i, 0])
-            if d:
-                has_date = True
-                break
+def _blank(v) -> bool:
+    return v is None or (isinstance(v, float) and pd.isna(v))
 
-        if has_date:
-            current_date = None
-            for i in range(len(df_raw)):
-                c0 = df_raw.iloc[i, 0] if len(df_raw.columns) > 0 else None
-
-                d = parse_ymd_kr(c0)
-                if d:
-                    current_date = d
-                    continue
-
-                # 헤더 스킵(병합/줄바꿈 때문에 공백이 섞일 수 있어 contains로 처리)
-                if isinstance(c0, str) and "웨딩홀" in c0:
-                    continue
-
-                if current_date is None:
-                    continue
-
-                venue_cell = df_raw.iloc[i, 0] if len(df_raw.columns) > 0 else None
-                time_cell  = df_raw.iloc[i, 1] if len(df_raw.columns) > 1 else None
-                main_cell  = df_raw.iloc[i, 2] if len(df_raw.columns) > 2 else None
-                sub_cell   = df_raw.iloc[i, 3] if len(df_raw.columns) > 3 else None
-                shoot_cell = df_raw.iloc[i, 4] if len(df_raw.columns) > 4 else None  # 촬영시간(선택)
-
-                if pd.isna(venue_cell) and pd.isna(time_cell) and pd.isna(main_cell) and pd.isna(sub_cell):
-                    continue
-                if pd.isna(venue_cell):
-                    continue
-
-                venue_raw = str(venue_cell).strip()
-                if not venue_raw:
-                    continue
-
-                venue_name = venue_raw.split("\n")[0].strip()
-                venue_addr = None
-                maddr = re.search(r"\((.+)\)", venue_raw.replace("\n", " "))
-                if maddr:
-                    venue_addr = maddr.group(1).strip()
-
-                wedding_time = None
-                couple = None
-                if not pd.isna(time_cell):
-                    parts = str(time_cell).splitlines()
-                    if parts:
-                        wedding_time = parse_time_hhmm(parts[0].strip())
-                        if len(parts) > 1:
-                            couple = " ".join([p.strip() for p in parts[1:] if p.strip()]) or None
-
-                main_name = (str(main_cell).strip() if not pd.isna(main_cell) else "") or None
-                sub_name  = (str(sub_cell).strip() if not pd.isna(sub_cell) else "") or None
-
-                # 촬영시작시간: 엑셀에서 time 객체로 들어올 수 있음
-                shoot_start = None
-                if shoot_cell is not None and not pd.isna(shoot_cell):
-                    # pandas가 time/datetime로 읽어올 수 있음
-                    if hasattr(shoot_cell, "hour") and hasattr(shoot_cell, "minute"):
-                        try:
-                            shoot_start = shoot_cell
-                            # datetime.time인 경우 그대로 OK
-                            if hasattr(shoot_start, "time"):
-                                shoot_start = shoot_start.time()
-                        except Exception:
-                            shoot_start = None
-                    else:
-                        shoot_start = parse_time_hhmm(str(shoot_cell))
-
-                shoot_start, arrival_target = compute_shoot_and_arrival(wedding_time, shoot_start)
-
-                raw_photographers = " ".join([x for x in [main_name, sub_name] if x]) if (main_name or sub_name) else ""
-                rows.append({
-                    "wedding_date": current_date,
-                    "wedding_time": wedding_time,
-                    "shoot_start_time": shoot_start,
-                    "arrival_target_time": arrival_target,
-                    "venue": venue_name,
-                    "venue_address": venue_addr,
-                    "couple": couple,
-                    "main_name": main_name,
-                    "sub_name": sub_name,
-                    "raw_photographers": raw_photographers,
-                })
-            return rows
-
-    # ------------- 기존 포맷(열 기반) -------------
-    df = pd.read_excel(file_path)
-    for _, row in df.iterrows():
-        wedding_date = row.iloc[6] if len(row) > 6 else None  # G
-        wedding_time = row.iloc[7] if len(row) > 7 else None  # H
-        couple = row.iloc[2] if len(row) > 2 else None        # C
-        photographers_raw = row.iloc[5] if len(row) > 5 else None  # F
-        venue = row.iloc[9] if len(row) > 9 else None         # J
-
-        if pd.isna(venue) or pd.isna(wedding_date):
-            continue
 
-        wdate = None
-        if hasattr(wedding_date, "date"):
-            try:
-                wdate = wedding_date.date()
-            except Exception:
-                wdate = None
-        if not wdate:
-            try:
-                wdate = pd.to_datetime(wedding_date).date()
-            except Exception:
-                wdate = None
-        if not wdate:
-            continue
+def _block_row(cells: tuple, current_date: date) -> Optional[dict]:
+    """날짜 블록 포맷 한 행 -> 스케줄 dict (스킵 대상이면 None)"""
+    venue_cell, time_cell, main_cell, sub_cell, shoot_cell = (tuple(cells) + (None,) * 5)[:5]
+    if _blank(venue_cell):
+        return None
+    venue_raw = _cell_str(venue_cell).strip()
+    if not venue_raw:
+        return None
 
-        wtime = None
-        if hasattr(wedding_time, "time"):
-            try:
-                wtime = wedding_time.time()
-            except Exception:
-                wtime = None
-        if wtime is None and wedding_time is not None and not pd.isna(wedding_time):
-            wtime = parse_time_hhmm(str(wedding_time))
+    venue_name = venue_raw.split("\n")[0].strip()
+    maddr = re.search(r"\((.+)\)", venue_raw.replace("\n", " "))
+    venue_addr = maddr.group(1).strip() if maddr else None
+
+    wedding_time = None
+    couple = None
+    if not _blank(time_cell):
+        parts = _cell_str(time_cell).splitlines()
+        if parts:
+            wedding_time = _parse_time_hhmm(parts[0].strip())
+            couple = " ".join(p.strip() for p in parts[1:] if p.strip()) or None
+
+    main_name = (_cell_str(main_cell).strip() if not _blank(main_cell) else "") or None
+    sub_name = (_cell_str(sub_cell).strip() if not _blank(sub_cell) else "") or None
+    shoot_start, arrival_target = _compute_shoot_and_arrival(wedding_time, _cell_to_time(shoot_cell))
+
+    return {
+        "wedding_date": current_date,
+        "wedding_time": wedding_time,
+        "shoot_start_time": shoot_start,
+        "arrival_target_time": arrival_target,
+        "venue": venue_name,
+        "venue_address": venue_addr,
+        "couple": couple,
+        "main_name": main_name,
+        "sub_name": sub_name,
+        "raw_photographers": " ".join(x for x in (main_name, sub_name) if x),
+    }
 
-        venue_name = str(venue).strip()
-        couple_str = None if pd.isna(couple) else str(couple).strip()
 
-        raw = "" if photographers_raw is None or pd.isna(photographers_raw) else str(photographers_raw).strip()
-        names = [x for x in re.split(r"[\s,]+", raw) if x]
-        main_name = names[0] if len(names) >= 1 else None
-        sub_name = names[1] if len(names) >= 2 else None
+def _column_row(cells: tuple) -> Optional[dict]:
+    """열 기반 포맷 한 행 -> 스케줄 dict (스킵 대상이면 None)"""
+    cells = tuple(cells) + (None,) * 10
+    couple, photographers_raw, wedding_date, wedding_time, venue = cells[2], cells[5], cells[6], cells[7], cells[9]
+    if _blank(venue) or _blank(wedding_date):
+        return None
+    wdate = _cell_to_date(wedding_date)
+    if not wdate:
+        return None
+    wtime = _cell_to_wedding_time(wedding_time)
+
+    raw = "" if _blank(photographers_raw) else _cell_str(photographers_raw).strip()
+    names = [x for x in re.split(r"[\s,]+", raw) if x]
+    couple_str = None if _blank(couple) else _cell_str(couple).strip()
+    shoot_start, arrival_target = _compute_shoot_and_arrival(wtime, None)
+
+    return {
+        "wedding_date": wdate,
+        "wedding_time": wtime,
+        "shoot_start_time": shoot_start,
+        "arrival_target_time": arrival_target,
+        "venue": _cell_str(venue).strip(),
+        "couple": couple_str or None,
+        "main_name": names[0] if len(names) >= 1 else None,
+        "sub_name": names[1] if len(names) >= 2 else None,
+        "raw_photographers": raw,
+    }
 
-        shoot_start, arrival_target = compute_shoot_and_arrival(wtime, None)
 
-        rows.append({
-            "wedding_date": wdate,
-            "wedding_time": wtime,
-            "shoot_start_time": shoot_start,
-            "arrival_target_time": arrival_target,
-            "venue": venue_name,
-            "couple": couple_str or None,
-            "main_name": main_name,
-            "sub_name": sub_name,
-            "raw_photographers": raw,
-        })
+def iter_schedules_from_excel(file_path: str) -> Iterator[dict]:
+    """대용량 워크북용 스트리밍 로더(.xlsx).
 
-    return rows
+    openpyxl read_only 모드로 시트를 순서대로 한 행씩 읽어 스케줄 dict를 yield 합니다.
+    포맷/규칙은 load_schedules_from_excel과 같고, 메모리는 파일 크기와 무관하게 일정합니다.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            yield from _iter_sheet_rows(ws)
+    finally:
+        wb.close()
+
+
+def _iter_sheet_rows(ws) -> Iterator[dict]:
+    """시트 하나(read_only) -> 스케줄 dict (포맷은 시트마다 판별)"""
+    rows = (r for r in ws.iter_rows(values_only=True) if any(not _blank(v) for v in r))
+
+    # 첫 20행(빈 행 제외)만 버퍼링해서 포맷 판별
+    head = []
+    for r in rows:
+        head.append(r)
+        if len(head) >= 20:
+            break
+    width = max((len(r) for r in head), default=0)
+
+    if width >= 2 and any(_ymd_kr(r[0]) for r in head if r):
+        current_date = None
+        for r in chain(head, rows):
+            c0 = r[0] if r else None
+            d = _ymd_kr(c0)
+            if d:
+                current_date = d
+                continue
+            # 헤더 스킵
+            if isinstance(c0, str) and "웨딩홀" in c0:
+                continue
+            if current_date is None:
+                continue
+            row = _block_row(r, current_date)
+            if row:
+                yield row
+        return
+
+    # 기존 포맷(열 기반): 첫 행은 헤더
+    for r in chain(head[1:], rows):
+        row = _column_row(r)
+        if row:
+            yield row
 
 
 def load_photographers_from_excel(file_path: str) -> List[dict]:
@@ -298,21 +534,25 @@ def load_photographers_from_excel(file_path: str) -> List[dict]:
     from datetime import date, datetime
     import re
 
-    xls = pd.ExcelFile(file_path)
+    # 워크북은 한 번만 열고, 시트마다 최대 1번 파싱(헤더 판별은 파싱된 프레임으로)
     df = None
-    # 우선: '이름' 컬럼이 있는 시트 찾기
-    for sh in xls.sheet_names:
-        try:
-            tmp = pd.read_excel(file_path, sheet_name=sh, header=0)
-        except Exception:
-            continue
-        cols = [str(c).strip() for c in tmp.columns]
-        if any(c == "이름" for c in cols):
-            df = tmp
-            break
-    if df is None:
-        # fallback: 첫 시트
-        df = pd.read_excel(file_path, sheet_name=xls.sheet_names[0], header=0)
+    first = None
+    with pd.ExcelFile(file_path) as xls:
+        # 우선: '이름' 컬럼이 있는 시트 찾기
+        for sh in xls.sheet_names:
+            try:
+                tmp = _promote_header(xls.parse(sh, header=None))
+            except Exception:
+                continue
+            if first is None and sh == xls.sheet_names[0]:
+                first = tmp
+            cols = [str(c).strip() for c in tmp.columns]
+            if any(c == "이름" for c in cols):
+                df = tmp
+                break
+        if df is None:
+            # fallback: 첫 시트
+            df = first if first is not None else _promote_header(xls.parse(xls.sheet_names[0], header=None))
 
     df.columns = [str(c).strip() for c in df.columns]
 
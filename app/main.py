@@ -2,21 +2,32 @@ from __future__ import annotations
 
 from zoneinfo import ZoneInfo
 from fastapi import FastAPI, Request, Depends, Form, UploadFile, File
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 from datetime import date, timedelta
 
+import asyncio
 import os
+import shutil
 import tempfile
 import uuid
 import time
 
-from .db import init_db, get_session
-from .models import Photographer, Schedule, Checkin, RouteEstimate, Venue, WeddingHall
+from .db import init_db, get_read_session, get_session
+from .models import Photographer, Schedule, Checkin, RouteEstimate, ScheduleAssignment, Venue, WeddingHall
 from .auth import hash_password, verify_password, set_session, clear_session, get_user_id_from_request
-from .importer import load_schedules_from_excel, load_photographers_from_excel
+from .alerts import alert_state, feed_item
+from .alert_stream import alert_broadcaster
+from .route_worker import route_worker
+from . import offload
+from .import_jobs import import_jobs
+from .schedule_import import jsonable_row, jsonable_update
+from .accounts import create_photographers
+from .assignments import assign, assigned_schedules, photographer_names, unassign
 from .auth import hash_password
 from .db import get_session
 from .models import Photographer
@@ -45,6 +56,7 @@ def reset_admin_password():
 
 # 업로드(도착사진) 임시 저장 폴더: 운영에서는 환경변수로 바꿀 수 있음
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join(os.path.dirname(__file__), "uploads"))
+UPLOAD_COPY_BYTES = 1024 * 1024  # 업로드 파일은 1MB씩 디스크로 복사
 
 def cleanup_uploads(ttl_hours: int = 6) -> None:
     """UPLOAD_DIR 내 사진을 ttl_hours 지난 것부터 자동 삭제"""
@@ -72,6 +84,31 @@ app.mount("/uploads", StaticFiles(directory=os.path.join(os.path.dirname(__file_
 def on_startup():
     init_db()
 
+@app.on_event("startup")
+async def start_alert_stream():
+    alert_broadcaster.start()
+
+@app.on_event("startup")
+async def start_route_prefetch():
+    # 다가오는 스케줄 이동시간 미리 계산(백그라운드)
+    app.state.route_prefetch = asyncio.create_task(route_worker.prefetch_loop())
+
+@app.on_event("shutdown")
+async def stop_alert_stream():
+    await alert_broadcaster.stop()
+
+@app.on_event("shutdown")
+def stop_route_worker():
+    task = getattr(app.state, "route_prefetch", None)
+    if task:
+        task.cancel()
+    route_worker.shutdown()
+
+@app.on_event("shutdown")
+def stop_import_pool():
+    import_jobs.shutdown()
+    offload.shutdown()
+
 def get_current_user(request: Request, session: Session) -> Photographer | None:
     uid = get_user_id_from_request(request)
     if not uid:
@@ -125,15 +162,9 @@ def propagate_hall_address(session: Session, hall_name: str, address: str) -> in
             session.add(s)
             updated += 1
     if updated:
-        # clear route estimates for affected schedules so they are recalculated
-        try:
-            for s in schedules:
-                routes = session.exec(select(RouteEstimate).where(RouteEstimate.schedule_id == s.id)).all()
-                for r in routes:
-                    session.delete(r)
-        except Exception:
-            pass
+        # 이동시간은 (작가 주소, 웨딩홀 주소) 키라서 주소가 바뀌면 자동으로 새 키로 조회됨
         session.commit()
+        alert_state.invalidate([s.id for s in schedules])
     return updated
 
 def require_login(user: Photographer | None):
@@ -160,67 +191,24 @@ def ensure_admin(session: Session):
         session.commit()
 
 
-def get_or_create_checkin(session: Session, schedule_id: int, photographer_name: str) -> Checkin:
+def get_or_create_checkin(session: Session, schedule_id: int, user: Photographer) -> Checkin:
     chk = session.exec(select(Checkin).where(
-        (Checkin.schedule_id == schedule_id) & (Checkin.photographer_name == photographer_name)
+        (Checkin.schedule_id == schedule_id) & (Checkin.photographer_id == user.id)
     )).first()
     if chk:
         return chk
-    chk = Checkin(schedule_id=schedule_id, photographer_name=photographer_name)
+    chk = Checkin(schedule_id=schedule_id, photographer_id=user.id, photographer_name=user.name)
     session.add(chk)
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError:
+        # 같은 체크를 동시에 누름(uq_checkin_schedule_photographer_id) → 먼저 만든 행 사용
+        session.rollback()
+        return session.exec(select(Checkin).where(
+            (Checkin.schedule_id == schedule_id) & (Checkin.photographer_id == user.id)
+        )).one()
     session.refresh(chk)
     return chk
-def get_cached_route_minutes(session: Session, schedule: Schedule, photographer_name: str, photographer_address: str) -> int | None:
-    # 1) 캐시(표) 확인
-    cached = session.exec(
-        select(RouteEstimate).where(
-            (RouteEstimate.schedule_id == schedule.id) & (RouteEstimate.photographer_name == photographer_name)
-        )
-    ).first()
-    if cached:
-        return cached.minutes
-
-    # 2) 스케줄에 수동 기본값이 있으면 그걸 사용 (계산 실패 대비)
-    if schedule.travel_minutes_default is not None:
-        return schedule.travel_minutes_default
-
-    # 3) 주소가 둘 다 있으면 온라인으로 계산(프로토타입)
-    if photographer_address and schedule.venue_address:
-        try:
-            mins = estimate_travel_minutes(photographer_address, schedule.venue_address)
-        except Exception:
-            mins = None
-        if mins is not None:
-            session.add(RouteEstimate(schedule_id=schedule.id, photographer_name=photographer_name, minutes=mins, provider="osrm"))
-            session.commit()
-            return mins
-
-    return None
-
-def compute_deadlines(schedule: Schedule, travel_minutes: int | None) -> dict:
-    # 기준 도착목표시간: arrival_target_time 있으면 우선, 없으면 예식시간 - 2시간
-    from datetime import datetime, timedelta
-    if schedule.wedding_time is None:
-        return {"arrival_target_dt": None, "wake_deadline": None, "depart_deadline": None}
-
-    base_time = schedule.arrival_target_time or (datetime.combine(schedule.wedding_date, schedule.wedding_time) - timedelta(hours=2)).time()
-    arrival_target_dt = datetime.combine(schedule.wedding_date, base_time)
-
-    wake_deadline = arrival_target_dt - timedelta(hours=2)
-
-    # 출발마감: 이동시간이 있으면 arrival_target - travel, 없으면 arrival_target - 60분
-    if travel_minutes is None:
-        depart_deadline = arrival_target_dt - timedelta(minutes=60)
-    else:
-        depart_deadline = arrival_target_dt - timedelta(minutes=travel_minutes)
-
-    return {
-        "arrival_target_dt": arrival_target_dt,
-        "wake_deadline": wake_deadline,
-        "depart_deadline": depart_deadline,
-    }
-
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -275,21 +263,17 @@ def check_wake(
     # ✅ 하루에 한 번만: 같은 날짜의 내 모든 스케줄에 '기상'을 한 번에 찍기
     from datetime import datetime
     day = s0.wedding_date
-    my_schedules = session.exec(
-        select(Schedule).where(
-            (Schedule.wedding_date == day)
-            & ((Schedule.main_name == user.name) | (Schedule.sub_name == user.name))
-        )
-    ).all()
+    my_schedules = session.exec(assigned_schedules(user.id, day)).all()
 
     now = datetime.now()
     for s in my_schedules:
-        chk = get_or_create_checkin(session, s.id, user.name)
+        chk = get_or_create_checkin(session, s.id, user)
         if chk.wake_time is None:
             chk.wake_time = now
             chk.updated_at = datetime.utcnow()
             session.add(chk)
     session.commit()
+    alert_state.invalidate([s.id for s in my_schedules])
     return RedirectResponse("/my", status_code=302)
 
 @app.post("/check/depart")
@@ -313,15 +297,11 @@ def check_depart(
     day = s0.wedding_date
 
     my_same_venue_schedules = session.exec(
-        select(Schedule).where(
-            (Schedule.wedding_date == day)
-            & (Schedule.venue == s0.venue)
-            & ((Schedule.main_name == user.name) | (Schedule.sub_name == user.name))
-        )
+        assigned_schedules(user.id, day).where(Schedule.venue == s0.venue)
     ).all()
 
     for s in my_same_venue_schedules:
-        chk = get_or_create_checkin(session, s.id, user.name)
+        chk = get_or_create_checkin(session, s.id, user)
         # 하루 기상은 v3.6에서 일괄 처리되지만, 혹시 비어있으면 안전하게 채움
         if chk.wake_time is None:
             chk.wake_time = now
@@ -331,11 +311,12 @@ def check_depart(
             session.add(chk)
 
     session.commit()
+    alert_state.invalidate([s.id for s in my_same_venue_schedules])
     return RedirectResponse("/my", status_code=302)
 
 
 @app.post("/check/arrive")
-async def check_arrive(
+def check_arrive(
     request: Request,
     session: Session = Depends(get_session),
     schedule_id: int = Form(...),
@@ -363,9 +344,9 @@ async def check_arrive(
     safe_name = f"{schedule_id}_{user.id}_{uuid.uuid4().hex}{ext}"
     save_path = os.path.join(upload_root, safe_name)
 
-    contents = await photo.read()
+    # 동기 핸들러(스레드풀)에서 복사 — 이벤트 루프를 막지 않음
     with open(save_path, "wb") as f:
-        f.write(contents)
+        shutil.copyfileobj(photo.file, f, UPLOAD_COPY_BYTES)
 
     from datetime import datetime
     now_local = datetime.now()
@@ -375,15 +356,11 @@ async def check_arrive(
     venue_key = (s0.venue or "").strip()
 
     my_same_venue_schedules = session.exec(
-        select(Schedule).where(
-            (Schedule.wedding_date == day)
-            & (Schedule.venue == s0.venue)
-            & ((Schedule.main_name == user.name) | (Schedule.sub_name == user.name))
-        )
+        assigned_schedules(user.id, day).where(Schedule.venue == s0.venue)
     ).all()
 
     for s in my_same_venue_schedules:
-        chk = get_or_create_checkin(session, s.id, user.name)
+        chk = get_or_create_checkin(session, s.id, user)
         # 기상/출발이 비어 있으면 기본값으로 채움(흐름 보호)
         if chk.wake_time is None:
             chk.wake_time = now_local
@@ -397,37 +374,9 @@ async def check_arrive(
         session.add(chk)
 
     session.commit()
+    alert_state.invalidate([s.id for s in my_same_venue_schedules])
     return RedirectResponse("/my", status_code=302)
 
-    ext = os.path.splitext(photo.filename)[1].lower()
-    if ext not in [".jpg", ".jpeg", ".png", ".webp"]:
-        return RedirectResponse("/my", status_code=302)
-
-    chk = get_or_create_checkin(session, schedule_id, user.name)
-    from datetime import datetime
-    if chk.wake_time is None:
-        chk.wake_time = datetime.now()
-    if chk.depart_time is None:
-        chk.depart_time = datetime.now()
-
-    upload_root = os.path.join(os.path.dirname(__file__), "uploads")
-    os.makedirs(upload_root, exist_ok=True)
-    safe_name = f"{schedule_id}_{user.id}_{uuid.uuid4().hex}{ext}"
-    save_path = os.path.join(upload_root, safe_name)
-
-    contents = await photo.read()
-    with open(save_path, "wb") as f:
-        f.write(contents)
-
-    chk.arrive_time = chk.arrive_time or datetime.now()
-    chk.arrive_photo_path = f"/uploads/{safe_name}"
-    chk.updated_at = datetime.utcnow()
-    session.add(chk)
-    session.commit()
-
-    return RedirectResponse("/my", status_code=302)
-
-
 
 @app.get("/my", response_class=HTMLResponse)
 def my_schedule(request: Request, session: Session = Depends(get_session)):
@@ -440,10 +389,7 @@ def my_schedule(request: Request, session: Session = Depends(get_session)):
     today = date.today()
     start, end = week_range(today)
 
-    q = select(Schedule).where(
-        (Schedule.wedding_date >= start) & (Schedule.wedding_date <= end) &
-        ((Schedule.main_name == user.name) | (Schedule.sub_name == user.name))
-    ).order_by(Schedule.wedding_date, Schedule.wedding_time)
+    q = assigned_schedules(user.id, start, end).order_by(Schedule.wedding_date, Schedule.wedding_time)
 
     schedules = session.exec(q).all()
 
@@ -451,7 +397,7 @@ def my_schedule(request: Request, session: Session = Depends(get_session)):
     schedule_ids = [s.id for s in schedules]
     if schedule_ids:
         chks = session.exec(select(Checkin).where(
-            (Checkin.photographer_name == user.name) & (Checkin.schedule_id.in_(schedule_ids))
+            (Checkin.photographer_id == user.id) & (Checkin.schedule_id.in_(schedule_ids))
         )).all()
     else:
         chks = []
@@ -513,89 +459,15 @@ def admin_home(request: Request, session: Session = Depends(get_session)):
     return templates.TemplateResponse("admin_home.html", {"request": request, "user": user})
 
 @app.get("/admin/alerts", response_class=HTMLResponse)
-def admin_alerts(request: Request, session: Session = Depends(get_session)):
+def admin_alerts(request: Request, session: Session = Depends(get_read_session)):
     user = get_current_user(request, session)
     if not user or not user.is_admin:
         return RedirectResponse("/login", status_code=302)
 
-    from datetime import datetime, timedelta, date
+    from datetime import datetime
     now = datetime.now()
     # 오늘~7일 내 스케줄 모니터링
-    start = date.fromordinal(now.date().toordinal() - 0)
-    end = date.fromordinal(now.date().toordinal() + 7)
-
-    schedules = session.exec(
-        select(Schedule).where((Schedule.wedding_date >= start) & (Schedule.wedding_date <= end))
-        .order_by(Schedule.wedding_date, Schedule.wedding_time)
-    ).all()
-
-    rows = []
-    for s in schedules:
-        for role, name in [("메인", s.main_name), ("서브", s.sub_name)]:
-            if not name:
-                continue
-            p = session.exec(select(Photographer).where(Photographer.name == name)).first()
-            p_addr = (p.address or "") if p else ""
-            travel_mins = get_cached_route_minutes(session, s, name, p_addr)
-
-            deadlines = compute_deadlines(s, travel_mins)
-            arrival_target_dt = deadlines["arrival_target_dt"]
-            wake_deadline = deadlines["wake_deadline"]
-            depart_deadline = deadlines["depart_deadline"]
-
-            chk = session.exec(select(Checkin).where((Checkin.schedule_id == s.id) & (Checkin.photographer_name == name))).first()
-
-            # 상태 판단
-            wake_ok = bool(chk and chk.wake_time)
-            depart_ok = bool(chk and chk.depart_time)
-            arrive_ok = bool(chk and chk.arrive_time)
-
-            # 같은 날+같은 장소 묶음 도착/출발 처리된 경우도 도착/출발 OK로 간주
-            if not arrive_ok:
-                other_arr = session.exec(
-                    select(Checkin, Schedule).join(Schedule, Schedule.id == Checkin.schedule_id).where(
-                        (Checkin.photographer_name == name)
-                        & (Schedule.wedding_date == s.wedding_date)
-                        & (Schedule.venue == s.venue)
-                        & (Checkin.arrive_time.is_not(None))
-                    )
-                ).first()
-                if other_arr:
-                    arrive_ok = True
-
-            if not depart_ok:
-                other_dep = session.exec(
-                    select(Checkin, Schedule).join(Schedule, Schedule.id == Checkin.schedule_id).where(
-                        (Checkin.photographer_name == name)
-                        & (Schedule.wedding_date == s.wedding_date)
-                        & (Schedule.venue == s.venue)
-                        & (Checkin.depart_time.is_not(None))
-                    )
-                ).first()
-                if other_dep:
-                    depart_ok = True
-
-            # 알림 플래그 (지금 시각 기준)
-            wake_overdue = (wake_deadline is not None) and (now >= wake_deadline) and (not wake_ok)
-            depart_overdue = (depart_deadline is not None) and (now >= depart_deadline) and (not depart_ok)
-            arrive_overdue = (arrival_target_dt is not None) and (now >= arrival_target_dt) and (not arrive_ok)
-
-            rows.append({
-                "schedule": s,
-                "role": role,
-                "name": name,
-                "venue_address": s.venue_address,
-                "arrival_target_dt": arrival_target_dt,
-                "wake_deadline": wake_deadline,
-                "depart_deadline": depart_deadline,
-                "travel_mins": travel_mins,
-                "wake_ok": wake_ok,
-                "depart_ok": depart_ok,
-                "arrive_ok": arrive_ok,
-                "wake_overdue": wake_overdue,
-                "depart_overdue": depart_overdue,
-                "arrive_overdue": arrive_overdue,
-            })
+    rows = alert_state.rows(session, now)
 
     # 알림만 보기 (쿼리 ?only=1)
     only = request.query_params.get("only") == "1"
@@ -607,90 +479,50 @@ def admin_alerts(request: Request, session: Session = Depends(get_session)):
 
 
 @app.get("/admin/alerts/feed")
-def admin_alerts_feed(request: Request, session: Session = Depends(get_session)):
+def admin_alerts_feed(request: Request, session: Session = Depends(get_read_session)):
     user = get_current_user(request, session)
     if not user or not user.is_admin:
         return {"ok": False}
 
-    from datetime import datetime, date
+    from datetime import datetime
     now = datetime.now()
-    start = now.date()
-    end = date.fromordinal(now.date().toordinal() + 7)
+    alerts = [feed_item(r) for r in alert_state.overdue_rows(session, now)]
 
-    schedules = session.exec(
-        select(Schedule).where((Schedule.wedding_date >= start) & (Schedule.wedding_date <= end))
-        .order_by(Schedule.wedding_date, Schedule.wedding_time)
-    ).all()
+    return {"ok": True, "now": now.isoformat(), "count": len(alerts), "alerts": alerts}
 
-    alerts = []
-    for s in schedules:
-        for role, name in [("메인", s.main_name), ("서브", s.sub_name)]:
-            if not name:
-                continue
-            p = session.exec(select(Photographer).where(Photographer.name == name)).first()
-            p_addr = (p.address or "") if p else ""
-            travel_mins = get_cached_route_minutes(session, s, name, p_addr)
-            d = compute_deadlines(s, travel_mins)
-
-            arrival_target_dt = d["arrival_target_dt"]
-            wake_deadline = d["wake_deadline"]
-            depart_deadline = d["depart_deadline"]
-
-            chk = session.exec(select(Checkin).where((Checkin.schedule_id == s.id) & (Checkin.photographer_name == name))).first()
-            wake_ok = bool(chk and chk.wake_time)
-            depart_ok = bool(chk and chk.depart_time)
-            arrive_ok = bool(chk and chk.arrive_time)
-
-            # grouped by same day+venue
-            if not arrive_ok:
-                other_arr = session.exec(
-                    select(Checkin, Schedule).join(Schedule, Schedule.id == Checkin.schedule_id).where(
-                        (Checkin.photographer_name == name)
-                        & (Schedule.wedding_date == s.wedding_date)
-                        & (Schedule.venue == s.venue)
-                        & (Checkin.arrive_time.is_not(None))
-                    )
-                ).first()
-                if other_arr:
-                    arrive_ok = True
-
-            if not depart_ok:
-                other_dep = session.exec(
-                    select(Checkin, Schedule).join(Schedule, Schedule.id == Checkin.schedule_id).where(
-                        (Checkin.photographer_name == name)
-                        & (Schedule.wedding_date == s.wedding_date)
-                        & (Schedule.venue == s.venue)
-                        & (Checkin.depart_time.is_not(None))
-                    )
-                ).first()
-                if other_dep:
-                    depart_ok = True
-
-            wake_overdue = (wake_deadline is not None) and (now >= wake_deadline) and (not wake_ok)
-            depart_overdue = (depart_deadline is not None) and (now >= depart_deadline) and (not depart_ok)
-            arrive_overdue = (arrival_target_dt is not None) and (now >= arrival_target_dt) and (not arrive_ok)
-
-            if wake_overdue or depart_overdue or arrive_overdue:
-                key = f"{s.id}:{name}:{role}"
-                alerts.append({
-                    "key": key,
-                    "schedule_id": s.id,
-                    "date": str(s.wedding_date),
-                    "venue": s.venue,
-                    "wedding_time": s.wedding_time.strftime("%H:%M") if s.wedding_time else None,
-                    "arrival_target": arrival_target_dt.strftime("%H:%M") if arrival_target_dt else None,
-                    "name": name,
-                    "role": role,
-                    "wake_overdue": wake_overdue,
-                    "depart_overdue": depart_overdue,
-                    "arrive_overdue": arrive_overdue,
-                    "travel_mins": travel_mins,
-                })
 
-    return {"ok": True, "now": now.isoformat(), "count": len(alerts), "alerts": alerts}
+@app.post("/admin/routes/prewarm")
+def admin_routes_prewarm(
+    request: Request,
+    session: Session = Depends(get_session),
+    days: int = Form(7),
+):
+    # 앞으로 N일 스케줄 이동시간을 (작가 주소, 웨딩홀 주소) 쌍 단위로 미리 계산
+    user = get_current_user(request, session)
+    if not user or not user.is_admin:
+        return RedirectResponse("/login", status_code=302)
+    # 길찾기 호출은 백그라운드 워커에서(요청 스레드/DB 연결을 잡고 기다리지 않음), 결과는 알림 화면에 반영
+    days = max(0, min(days, 60))
+    started = route_worker.prewarm(days)
+    return RedirectResponse(f"/admin/alerts?prewarm={'started' if started else 'running'}&days={days}", status_code=302)
+
+
+@app.get("/admin/alerts/stream")
+def admin_alerts_stream(request: Request, session: Session = Depends(get_session)):
+    # SSE: 지연 변경분만 푸시 (실패 시 브라우저는 /admin/alerts/feed 폴링으로 대체)
+    user = get_current_user(request, session)
+    if not user or not user.is_admin:
+        return {"ok": False}
+    # 스트림이 열려 있는 동안 DB 연결을 잡고 있지 않도록 먼저 반환
+    session.close()
+    return StreamingResponse(
+        alert_broadcaster.subscribe(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.get("/admin/photos", response_class=HTMLResponse)
-def admin_photos(request: Request, session: Session = Depends(get_session)):
+def admin_photos(request: Request, session: Session = Depends(get_read_session)):
     user = get_current_user(request, session)
     if not user or not user.is_admin:
         return RedirectResponse("/login", status_code=302)
@@ -698,8 +530,9 @@ def admin_photos(request: Request, session: Session = Depends(get_session)):
     # 도착 사진이 있는 체크인만
     q = select(Checkin, Schedule).join(Schedule, Schedule.id == Checkin.schedule_id).where(Checkin.arrive_photo_path.is_not(None)).order_by(Schedule.wedding_date.desc())
     items = session.exec(q).all()
+    names = photographer_names(session, (chk.photographer_id for chk, _ in items))
 
-    return templates.TemplateResponse("admin_photos.html", {"request": request, "user": user, "items": items})
+    return templates.TemplateResponse("admin_photos.html", {"request": request, "user": user, "items": items, "names": names})
 
 
 @app.get("/admin/photographers", response_class=HTMLResponse)
@@ -782,6 +615,7 @@ async def admin_wedding_halls_edit_save(
             s.venue = hall.name
             session.add(s)
         session.commit()
+        alert_state.invalidate([s.id for s in schedules])
 
     if hall.address:
         propagate_hall_address(session, hall.name, hall.address)
@@ -811,67 +645,14 @@ async def admin_photographers_import(
     session: Session = Depends(get_session),
     file: UploadFile = File(...),
 ):
-    import uuid
     user = get_current_user(request, session)
     if not user or not user.is_admin:
         return RedirectResponse("/login", status_code=302)
 
-    os.makedirs("uploads", exist_ok=True)
-    tmp_path = os.path.join("uploads", f"photographers_{uuid.uuid4().hex}_{file.filename}")
-    content = await file.read()
-    with open(tmp_path, "wb") as f:
-        f.write(content)
-
-    rows = load_photographers_from_excel(tmp_path)
-    imported = 0
-    updated = 0
-
-    for r in rows:
-        name = r.get("name")
-        if not name:
-            continue
-        p = session.exec(select(Photographer).where(Photographer.name == name)).first()
-        if p:
-            # update
-            p.phone = r.get("phone") or p.phone
-            p.address = r.get("address") or p.address
-            p.region = r.get("region") or p.region
-            if r.get("has_car") is not None:
-                p.has_car = r.get("has_car")
-            if r.get("start_date") is not None:
-                p.start_date = r.get("start_date")
-            p.gender = r.get("gender") or p.gender
-            p.role = r.get("role") or p.role
-            updated += 1
-        else:
-            # create (default password 1234)
-            base_username = name.strip()
-            username = base_username
-            suffix = 1
-            while session.exec(select(Photographer).where(Photographer.username == username)).first():
-                suffix += 1
-                username = f"{base_username}{suffix}"
-
-            p = Photographer(
-                name=name.strip(),
-                username=username,
-                password_hash=hash_password("1234"),
-                phone=r.get("phone"),
-                address=r.get("address"),
-                region=r.get("region"),
-                has_car=r.get("has_car"),
-                start_date=r.get("start_date"),
-                status="활성",
-                memo=None,
-                gender=r.get("gender"),
-                role=r.get("role"),
-                is_admin=False,
-            )
-            session.add(p)
-            imported += 1
-
-    session.commit()
-    return RedirectResponse(f"/admin/photographers?imported={imported}&updated={updated}", status_code=302)
+    # 파싱/저장은 백그라운드 작업으로(진행 상황: /admin/imports/{id})
+    tmp_path = await save_upload_to_temp(file)
+    job = import_jobs.submit("photographers", tmp_path, file.filename or "")
+    return RedirectResponse(f"/admin/photographers?job={job.id}", status_code=302)
 
 
 @app.post("/admin/photographers/create")
@@ -903,18 +684,9 @@ def admin_create_photographer(
         except Exception:
             sd = None
 
-    # username 기본: 이름(중복이면 숫자 붙임)
-    base_username = name.strip()
-    username = base_username
-    suffix = 1
-    while session.exec(select(Photographer).where(Photographer.username == username)).first():
-        suffix += 1
-        username = f"{base_username}{suffix}"
-
+    # username은 create_photographers에서 배정(기본: 이름, 중복이면 숫자 붙임)
     p = Photographer(
         name=name.strip(),
-        username=username,
-        password_hash=hash_password(password),
         phone=phone or None,
         gender=gender or None,
         role=role or None,
@@ -926,8 +698,8 @@ def admin_create_photographer(
         memo=memo or None,
         is_admin=False,
     )
-    session.add(p)
-    session.commit()
+    create_photographers(session, [p], password=password)
+    alert_state.invalidate()
     return RedirectResponse("/admin/photographers", status_code=302)
 
 @app.get("/admin/photographers/{pid}/edit", response_class=HTMLResponse)
@@ -965,8 +737,6 @@ def admin_edit_photographer_save(
     if not p or p.is_admin:
         return RedirectResponse("/admin/photographers", status_code=302)
 
-    old_name = p.name
-
     p.name = name.strip()
     p.phone = phone.strip() or None
     p.address = address.strip() or None
@@ -994,20 +764,12 @@ def admin_edit_photographer_save(
     if new_password and new_password.strip():
         p.password_hash = hash_password(new_password.strip())
 
+    # 스케줄/체크는 작가 id로 연결 → 이름을 바꿔도 작가 1행만 수정
     session.add(p)
     session.commit()
 
-    # 이름 변경 시 스케줄(main/sub)도 같이 변경
-    if old_name != p.name:
-        mains = session.exec(select(Schedule).where(Schedule.main_name == old_name)).all()
-        for s in mains:
-            s.main_name = p.name
-            session.add(s)
-        subs = session.exec(select(Schedule).where(Schedule.sub_name == old_name)).all()
-        for s in subs:
-            s.sub_name = p.name
-            session.add(s)
-        session.commit()
+    # 이름/주소가 바뀌면 이동시간·알림 상태가 달라짐
+    alert_state.invalidate()
 
     return RedirectResponse("/admin/photographers", status_code=302)
 
@@ -1023,13 +785,13 @@ def admin_delete_photographer(pid: int, request: Request, session: Session = Dep
         return RedirectResponse("/admin/photographers", status_code=302)
 
     # 안전장치: 스케줄에 연결된 작가면 삭제 막기(원하면 강제 삭제로 바꿀 수 있음)
-    used = session.exec(select(Schedule).where((Schedule.main_name == p.name) | (Schedule.sub_name == p.name))).first()
+    used = session.exec(select(ScheduleAssignment.id).where(ScheduleAssignment.photographer_id == p.id)).first()
     if used:
         # 간단히 목록으로 되돌리기(추후 에러 메시지 페이지로 개선 가능)
         return RedirectResponse("/admin/photographers", status_code=302)
 
     # 체크인도 삭제
-    chks = session.exec(select(Checkin).where(Checkin.photographer_name == p.name)).all()
+    chks = session.exec(select(Checkin).where(Checkin.photographer_id == p.id)).all()
     for c in chks:
         session.delete(c)
 
@@ -1038,57 +800,14 @@ def admin_delete_photographer(pid: int, request: Request, session: Session = Dep
     return RedirectResponse("/admin/photographers", status_code=302)
 
 
-
-    old_name = p.name
-
-    p.name = name.strip()
-    p.phone = phone or None
-    p.address = address or None
-    p.region = region or None
-    p.has_car = True if has_car == "보유" else (False if has_car == "미보유" else None)
-
-    sd = None
-    if start_date:
-        try:
-            from datetime import date
-            sd = date.fromisoformat(start_date)
-        except Exception:
-            sd = None
-    p.start_date = sd
-    p.status = status
-    p.memo = memo or None
-
-    # 비번 변경(선택)
-    if new_password and new_password.strip():
-        p.password_hash = hash_password(new_password.strip())
-
-    session.add(p)
-    session.commit()
-
-    # 중요: 이름이 바뀌면 스케줄의 main/sub 문자열도 같이 변경
-    if old_name != p.name:
-        # main_name 변경
-        mains = session.exec(select(Schedule).where(Schedule.main_name == old_name)).all()
-        for s in mains:
-            s.main_name = p.name
-            session.add(s)
-        subs = session.exec(select(Schedule).where(Schedule.sub_name == old_name)).all()
-        for s in subs:
-            s.sub_name = p.name
-            session.add(s)
-        session.commit()
-
-    return RedirectResponse("/admin/photographers", status_code=302)
-
-
-
 @app.get("/admin/schedules", response_class=HTMLResponse)
-def admin_schedules(request: Request, session: Session = Depends(get_session)):
+def admin_schedules(request: Request, session: Session = Depends(get_read_session)):
     user = get_current_user(request, session)
     if not user or not user.is_admin:
         return RedirectResponse("/login", status_code=302)
     schedules = session.exec(select(Schedule).order_by(Schedule.wedding_date.desc(), Schedule.wedding_time)).all()
-    return templates.TemplateResponse("admin_schedules.html", {"request": request, "user": user, "schedules": schedules})
+    names = photographer_names(session)
+    return templates.TemplateResponse("admin_schedules.html", {"request": request, "user": user, "schedules": schedules, "names": names})
 
 
 @app.post("/admin/schedules/bulk_delete")
@@ -1134,7 +853,9 @@ async def admin_schedules_bulk_delete(
         if s:
             session.delete(s)
 
+    unassign(session, ids)
     session.commit()
+    alert_state.invalidate(ids)
     return RedirectResponse("/admin/schedules", status_code=302)
 
 @app.get("/admin/schedules/{sid}/edit", response_class=HTMLResponse)
@@ -1146,7 +867,8 @@ def admin_edit_schedule_page(sid: int, request: Request, session: Session = Depe
     if not s:
         return RedirectResponse("/admin/schedules", status_code=302)
     venues = session.exec(select(Venue).order_by(Venue.name)).all()
-    return templates.TemplateResponse("admin_schedule_edit.html", {"request": request, "user": user, "s": s, "venues": venues, "error": None})
+    names = photographer_names(session, (s.main_photographer_id, s.sub_photographer_id))
+    return templates.TemplateResponse("admin_schedule_edit.html", {"request": request, "user": user, "s": s, "venues": venues, "names": names, "error": None})
 
 @app.post("/admin/schedules/{sid}/edit")
 def admin_edit_schedule_save(
@@ -1175,9 +897,10 @@ def admin_edit_schedule_save(
 
     def render_error(msg: str):
         venues = session.exec(select(Venue).order_by(Venue.name)).all()
+        names = photographer_names(session, (s.main_photographer_id, s.sub_photographer_id))
         return templates.TemplateResponse(
             "admin_schedule_edit.html",
-            {"request": request, "user": user, "s": s, "venues": venues, "error": msg},
+            {"request": request, "user": user, "s": s, "venues": venues, "names": names, "error": msg},
             status_code=400,
         )
 
@@ -1227,22 +950,29 @@ def admin_edit_schedule_save(
     s.main_name = main_name.strip() or None
     s.sub_name = sub_name.strip() or None
     s.raw_photographers = " ".join([x for x in [s.main_name, s.sub_name] if x])
-
-    # 웨딩홀 주소는 1회 입력 후 재사용: 입력이 비어있으면 Venue 테이블에서 찾아 채움
-    v = session.exec(select(Venue).where(Venue.name == s.venue)).first()
-    if s.venue_address:
-        if v:
-            v.address = s.venue_address
-            v.updated_at = datetime.utcnow()
+    try:
+        assign(session, s)
+
+        # 웨딩홀 주소는 1회 입력 후 재사용: 입력이 비어있으면 Venue 테이블에서 찾아 채움
+        v = session.exec(select(Venue).where(Venue.name == s.venue)).first()
+        if s.venue_address:
+            if v:
+                v.address = s.venue_address
+                v.updated_at = datetime.utcnow()
+            else:
+                v = Venue(name=s.venue, address=s.venue_address)
+            session.add(v)
         else:
-            v = Venue(name=s.venue, address=s.venue_address)
-        session.add(v)
-    else:
-        if v and v.address:
-            s.venue_address = v.address
+            if v and v.address:
+                s.venue_address = v.address
 
-    session.add(s)
-    session.commit()
+        session.add(s)
+        session.commit()
+    except IntegrityError:
+        # 날짜/시간/홀/커플/메인/서브가 다른 스케줄과 같음(uq_schedule_import_key) → 저장 안 함
+        session.rollback()
+        return render_error("같은 스케줄이 이미 있습니다(날짜/시간/웨딩홀/커플/작가가 같은 스케줄).")
+    alert_state.invalidate([sid])
 
     return RedirectResponse(f"/admin/schedules?updated={sid}", status_code=302)
 
@@ -1263,72 +993,96 @@ def admin_delete_schedule(sid: int, request: Request, session: Session = Depends
     for c in chks:
         session.delete(c)
 
+    unassign(session, [sid])
     session.delete(s)
     session.commit()
+    alert_state.invalidate([sid])
     return RedirectResponse("/admin/schedules", status_code=302)
 
 
 
+def _copy_upload(src, suffix: str) -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        shutil.copyfileobj(src, tmp, UPLOAD_COPY_BYTES)
+        return tmp.name
+
+
+async def save_upload_to_temp(file: UploadFile) -> str:
+    """업로드를 1MB씩 임시파일에 기록(파일 전체를 메모리에 올리지 않음, 이벤트 루프 밖에서)"""
+    return await run_in_threadpool(_copy_upload, file.file, os.path.splitext(file.filename or "")[1])
+
+
 @app.post("/admin/schedules/import")
 async def admin_import_schedules(
     request: Request,
     session: Session = Depends(get_session),
     file: UploadFile = File(...),
+    mode: str = Form(""),
+    dry_run: str = Form(""),
+    force: str = Form(""),
 ):
     user = get_current_user(request, session)
     if not user or not user.is_admin:
         return RedirectResponse("/login", status_code=302)
 
-    # 업로드 파일 임시 저장
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-        contents = await file.read()
-        tmp.write(contents)
-        tmp_path = tmp.name
-
-    rows = load_schedules_from_excel(tmp_path)
-    os.unlink(tmp_path)
-
-    # 작가 자동 생성(스케줄에 나온 이름 기반) — 비번 1234
-    for r in rows:
-        for nm in [r.get("main_name"), r.get("sub_name")]:
-            if not nm:
-                continue
-            existing = session.exec(select(Photographer).where(Photographer.name == nm)).first()
-            if not existing:
-                # username 기본 = 이름
-                username = nm
-                suffix = 1
-                while session.exec(select(Photographer).where(Photographer.username == username)).first():
-                    suffix += 1
-                    username = f"{nm}{suffix}"
-                p = Photographer(
-                    name=nm,
-                    username=username,
-                    password_hash=hash_password("1234"),
-                    status="활성",
-                    is_admin=False,
-                )
-                session.add(p)
-    session.commit()
+    # 업로드 파일 임시 저장(청크 단위) → 파싱/저장은 백그라운드 작업으로(진행 상황: /admin/imports/{id})
+    # 미리보기(dry_run): 저장하지 않고 추가/수정/중복/자동 생성 작가만 계산, 작업 id가 확정용 토큰
+    # 이미 가져온 파일과 같으면 건너뜀(force: '같은 파일도 다시' 선택)
+    tmp_path = await save_upload_to_temp(file)
+    job = import_jobs.submit("preview" if dry_run else "schedules", tmp_path, file.filename or "", mode, bool(force))
+    return RedirectResponse(f"/admin/schedules?job={job.id}", status_code=302)
 
-    # 스케줄 insert(중복 방지: 날짜+시간+홀+커플+메인+서브)
-    inserted = 0
-    for r in rows:
-        exists = session.exec(
-            select(Schedule).where(
-                (Schedule.wedding_date == r["wedding_date"]) &
-                (Schedule.wedding_time == r["wedding_time"]) &
-                (Schedule.venue == r["venue"]) &
-                (Schedule.couple == r["couple"]) &
-                (Schedule.main_name == r["main_name"]) &
-                (Schedule.sub_name == r["sub_name"])
-            )
-        ).first()
-        if exists:
-            continue
-        s = Schedule(**r)
-        session.add(s)
-        inserted += 1
-    session.commit()
 
-    return RedirectResponse(f"/admin/schedules?imported={inserted}", status_code=302)
+@app.post("/admin/schedules/import/commit")
+def admin_import_schedules_commit(
+    request: Request,
+    session: Session = Depends(get_session),
+    token: str = Form(...),
+):
+    user = get_current_user(request, session)
+    if not user or not user.is_admin:
+        return RedirectResponse("/login", status_code=302)
+
+    # 미리보기에서 파싱해 둔 행을 그대로 저장(엑셀 다시 읽지 않음)
+    job = import_jobs.commit_preview(token)
+    if not job:
+        return RedirectResponse("/admin/schedules?preview_expired=1", status_code=302)
+    return RedirectResponse(f"/admin/schedules?job={job.id}", status_code=302)
+
+
+@app.get("/admin/imports")
+def admin_import_jobs(request: Request, session: Session = Depends(get_session), kind: str | None = None):
+    user = get_current_user(request, session)
+    if not user or not user.is_admin:
+        return {"ok": False}
+    return {"ok": True, "jobs": [j.to_dict() for j in import_jobs.recent(kind)]}
+
+
+@app.get("/admin/imports/{job_id}")
+def admin_import_job(job_id: str, request: Request, session: Session = Depends(get_session)):
+    user = get_current_user(request, session)
+    if not user or not user.is_admin:
+        return {"ok": False}
+    job = import_jobs.get(job_id)
+    if not job:
+        return {"ok": False, "error": "not_found"}
+    return {"ok": True, "job": job.to_dict()}
+
+
+@app.get("/admin/imports/{job_id}/diff")
+def admin_import_job_diff(job_id: str, request: Request, session: Session = Depends(get_session)):
+    user = get_current_user(request, session)
+    if not user or not user.is_admin:
+        return {"ok": False}
+    job = import_jobs.get(job_id)
+    diff = job.diff if job else None
+    if diff is None:
+        return {"ok": False, "error": "not_found"}
+    return {
+        "ok": True,
+        "insert": [jsonable_row(r) for r in diff["insert"]],
+        "update": [jsonable_update(u) for u in diff["update"]],
+        "duplicate_db": [jsonable_row(r) for r in diff["duplicate_db"]],
+        "duplicate_file": [jsonable_row(r) for r in diff["duplicate_file"]],
+        "new_photographers": diff["new_photographers"],
+    }
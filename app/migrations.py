@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import Column, Index, Table, bindparam, delete, exists, func, insert, inspect, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from .assignments import assignment_values
+from .models import Checkin, Photographer, SchemaMigration, Schedule, ScheduleAssignment
+
+# DB 스키마 마이그레이션("rm app.db" 대신)
+# - 버전 순서대로 1번씩 실행, 실행한 버전은 schemamigration 테이블에 기록
+# - 앱 시작 시(init_db, MIGRATE_ON_STARTUP=1 기본) 또는 CLI: python -m app.migrations [status|upgrade]
+#   여러 워커/서버로 띄우면 MIGRATE_ON_STARTUP=0 으로 두고 배포 전에 CLI로 1번 실행 권장
+# - 마이그레이션은 여러 번 실행해도 결과가 같게(이미 있는 컬럼/인덱스는 건너뜀, 백필은 빈 값만 채움)
+# - 백필은 id 구간(MIGRATION_BATCH_SIZE)마다 짧은 트랜잭션 → 실행 중에도 체크인 쓰기가 오래 막히지 않음
+
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "1") == "1"
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+MIGRATION_BATCH_PAUSE = float(os.getenv("MIGRATION_BATCH_PAUSE", "0.01"))  # 배치 사이 쉬는 시간(초)
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    fn: Callable[[Engine], None]
+
+
+MIGRATIONS: list[Migration] = []
+
+
+def migration(version: int, name: str):
+    """마이그레이션 등록(버전은 겹치지 않게 1씩 증가)"""
+    def deco(fn: Callable[[Engine], None]) -> Callable[[Engine], None]:
+        if any(m.version == version for m in MIGRATIONS):
+            raise ValueError(f"duplicate migration version {version}")
+        MIGRATIONS.append(Migration(version, name, fn))
+        return fn
+    return deco
+
+
+# ---------------- 작업 도구 ----------------
+
+def has_column(engine: Engine, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(engine).get_columns(table))
+
+
+def add_column(engine: Engine, column: Column) -> bool:
+    """모델 컬럼이 테이블에 없으면 ALTER TABLE ADD COLUMN(nullable 이거나 server_default가 있어야 함). 추가했으면 True"""
+    table = column.table.name
+    if has_column(engine, table, column.name):
+        return False
+    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"ALTER TABLE {engine.dialect.identifier_preparer.quote(table)} ADD COLUMN {ddl}")
+    return True
+
+
+def create_index(engine: Engine, index: Index) -> None:
+    with engine.begin() as conn:
+        conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def drop_index(engine: Engine, name: str) -> None:
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {engine.dialect.identifier_preparer.quote(name)}")
+
+
+def _id_ranges(engine: Engine, table: Table, batch_size: int) -> Iterable[tuple[int, int]]:
+    with engine.connect() as conn:
+        lo, hi = conn.execute(select(func.min(table.c.id), func.max(table.c.id))).one()
+    if lo is None:
+        return
+    for start in range(lo, hi + 1, batch_size):
+        yield start, start + batch_size
+
+
+def backfill(engine: Engine, table: Table, values: dict, where=None, batch_size: Optional[int] = None) -> int:
+    """UPDATE table SET values [WHERE where]를 id 구간마다 나눠 실행(값은 SQL 식/서브쿼리 가능). 바뀐 행 수"""
+    batch_size = batch_size or MIGRATION_BATCH_SIZE
+    total = 0
+    for start, stop in _id_ranges(engine, table, batch_size):
+        stmt = update(table).where((table.c.id >= start) & (table.c.id < stop))
+        if where is not None:
+            stmt = stmt.where(where)
+        with engine.begin() as conn:
+            total += conn.execute(stmt.values(values)).rowcount or 0
+        time.sleep(MIGRATION_BATCH_PAUSE)
+    return total
+
+
+def backfill_rows(
+    engine: Engine,
+    table: Table,
+    columns: list[str],
+    where,
+    fn: Callable[[dict], Optional[dict]],
+    batch_size: Optional[int] = None,
+) -> int:
+    """where에 맞는 행을 id 구간마다 읽어 fn(행) -> 바꿀 값(dict, 없으면 None)을 한 번에 update. 바뀐 행 수"""
+    batch_size = batch_size or MIGRATION_BATCH_SIZE
+    total = 0
+    cols = [table.c.id, *(table.c[c] for c in columns)]
+    for start, stop in _id_ranges(engine, table, batch_size):
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(*cols).where((table.c.id >= start) & (table.c.id < stop)).where(where)
+            ).mappings().all()
+            values = []
+            for r in rows:
+                changed = fn(dict(r))
+                if changed:
+                    values.append({"_id": r["id"], **changed})
+            if values:
+                keys = [k for k in values[0] if k != "_id"]
+                stmt = update(table).where(table.c.id == bindparam("_id")).values({k: bindparam(k) for k in keys})
+                conn.execute(stmt, values)
+                total += len(values)
+        time.sleep(MIGRATION_BATCH_PAUSE)
+    return total
+
+
+# ---------------- 실행 ----------------
+
+def applied_versions(engine: Engine) -> set[int]:
+    SchemaMigration.__table__.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        return set(conn.execute(select(SchemaMigration.version)).scalars())
+
+
+def pending(engine: Engine) -> list[Migration]:
+    done = applied_versions(engine)
+    return [m for m in sorted(MIGRATIONS, key=lambda m: m.version) if m.version not in done]
+
+
+def upgrade(engine: Engine, target: Optional[int] = None, log: Callable[[str], None] = print) -> list[Migration]:
+    """밀린 마이그레이션을 버전 순서대로 실행. 실행한 목록 반환"""
+    ran = []
+    for m in pending(engine):
+        if target is not None and m.version > target:
+            break
+        t = time.perf_counter()
+        m.fn(engine)
+        with engine.begin() as conn:
+            try:
+                conn.execute(insert(SchemaMigration).values(version=m.version, name=m.name, applied_at=datetime.utcnow()))
+            except IntegrityError:
+                pass  # 다른 워커가 먼저 기록
+        log(f"migration {m.version:04d} {m.name} ({time.perf_counter() - t:.2f}s)")
+        ran.append(m)
+    return ran
+
+
+# ---------------- 마이그레이션 목록 ----------------
+
+@migration(1, "v3.x 컬럼 추가(rm app.db 대신)")
+def _legacy_columns(engine: Engine) -> None:
+    # v3.4 / v3.9 / v3.12 / v3.13 / v3.16 에서 추가된 nullable 컬럼(새 테이블은 create_all이 만듦)
+    columns = {
+        Schedule: (
+            "shoot_start_time", "venue_address", "couple", "arrival_target_time",
+            "travel_minutes_default", "sub_name", "raw_photographers",
+        ),
+        Photographer: ("phone", "gender", "role", "address", "region", "has_car", "start_date", "memo"),
+        Checkin: ("wake_time", "depart_time", "arrive_time", "arrive_photo_path"),
+    }
+    for model, names in columns.items():
+        for name in names:
+            add_column(engine, model.__table__.c[name])
+
+
+@migration(2, "빈 도착목표 시간 채우기(예식시간 - 2시간)")
+def _fill_arrival(engine: Engine) -> None:
+    # v3.16 이전 스케줄: 도착목표 = 예식시간 - 2시간
+    # 알림(compute_deadlines)이 빈 도착목표에 쓰는 기본값과 같음 → 기상/출발 마감은 마이그레이션 전후로 같음
+    # 촬영시작은 비워 둠(채우면 수정 화면에서 촬영시작 - 30분으로 도착목표가 바뀜)
+    t = Schedule.__table__
+
+    def fill(r: dict) -> Optional[dict]:
+        arrival = datetime.combine(datetime(2000, 1, 1), r["wedding_time"]) - timedelta(hours=2)
+        return {"arrival_target_time": arrival.time()}
+
+    backfill_rows(
+        engine, t, ["wedding_time"],
+        t.c.wedding_time.is_not(None) & t.c.arrival_target_time.is_(None),
+        fill,
+    )
+
+
+@migration(3, "중복 체크 합치기 + (스케줄, 작가) 유니크 인덱스")
+def _dedupe_checkins(engine: Engine) -> None:
+    # 유니크 인덱스 이전에 같은 (스케줄, 작가) 체크가 여러 개 생긴 경우: 가장 먼저 만든 행에 합치고 나머지 삭제
+    t = Checkin.__table__
+    with engine.connect() as conn:
+        groups = conn.execute(
+            select(t.c.schedule_id, t.c.photographer_name)
+            .group_by(t.c.schedule_id, t.c.photographer_name)
+            .having(func.count() > 1)
+        ).all()
+    for sid, name in groups:
+        with engine.begin() as conn:
+            # 이 시점에 있는 컬럼만 조회(모델에 나중 버전 컬럼이 있어도 실행되게)
+            cols = [t.c[c] for c in ("id", "wake_time", "depart_time", "arrive_time", "arrive_photo_path", "updated_at")]
+            rows = conn.execute(
+                select(*cols).where((t.c.schedule_id == sid) & (t.c.photographer_name == name)).order_by(t.c.id)
+            ).mappings().all()
+            keep, rest = rows[0], rows[1:]
+            merged = {}
+            for col in ("wake_time", "depart_time", "arrive_time"):
+                times = [r[col] for r in rows if r[col] is not None]
+                merged[col] = min(times) if times else None
+            merged["arrive_photo_path"] = next((r["arrive_photo_path"] for r in rows if r["arrive_photo_path"]), None)
+            merged["updated_at"] = max(r["updated_at"] for r in rows)
+            conn.execute(update(t).where(t.c.id == keep["id"]).values(merged))
+            conn.execute(delete(t).where(t.c.id.in_([r["id"] for r in rest])))
+    # 0004에서 (스케줄, 작가 id) 인덱스로 바뀜 → 모델에 없는 인덱스라 DDL로 직접
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_checkin_schedule_photographer ON checkin (schedule_id, photographer_name)"
+        )
+
+
+@migration(4, "작가 id 연결(이름 → id) + 담당 연결 테이블")
+def _photographer_ids(engine: Engine) -> None:
+    # 스케줄 메인/서브 이름, 체크 작가 이름 → 작가 id(이름이 같은 작가가 없으면 NULL로 남김)
+    # 이름으로 못 찾은 체크는 스케줄 담당 자리로 한 번 더(_fill_checkin_slots)
+    s, c, p = Schedule.__table__, Checkin.__table__, Photographer.__table__
+    for column in (s.c.main_photographer_id, s.c.sub_photographer_id, c.c.photographer_id):
+        add_column(engine, column)
+
+    def by_name(name_col):
+        return select(p.c.id).where(p.c.name == name_col).scalar_subquery()
+
+    backfill(
+        engine, s,
+        {
+            "main_photographer_id": func.coalesce(s.c.main_photographer_id, by_name(s.c.main_name)),
+            "sub_photographer_id": func.coalesce(s.c.sub_photographer_id, by_name(s.c.sub_name)),
+        },
+        (s.c.main_photographer_id.is_(None) & s.c.main_name.is_not(None))
+        | (s.c.sub_photographer_id.is_(None) & s.c.sub_name.is_not(None)),
+    )
+    backfill(engine, c, {"photographer_id": by_name(c.c.photographer_name)}, c.c.photographer_id.is_(None))
+    _fill_checkin_slots(engine)
+
+    # 연결 테이블: 아직 연결이 없는 스케줄만 id 구간마다 채움
+    a = ScheduleAssignment.__table__
+    a.create(engine, checkfirst=True)
+    for start, stop in _id_ranges(engine, s, MIGRATION_BATCH_SIZE):
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(s.c.id, s.c.wedding_date, s.c.main_photographer_id, s.c.sub_photographer_id)
+                .where((s.c.id >= start) & (s.c.id < stop))
+                .where(~exists().where(a.c.schedule_id == s.c.id))
+            ).all()
+            values = [v for r in rows for v in assignment_values(*r)]
+            if values:
+                conn.execute(insert(a), values)
+        time.sleep(MIGRATION_BATCH_PAUSE)
+
+    # 이름 기준 인덱스 → 연결 테이블/작가 id 인덱스(init_db가 모델 인덱스 생성)
+    for name in ("ix_schedule_main_date_venue", "ix_schedule_sub_date_venue", "uq_checkin_schedule_photographer"):
+        drop_index(engine, name)
+    for index in (*a.indexes, *(i for i in c.indexes if i.name == "uq_checkin_schedule_photographer_id")):
+        create_index(engine, index)
+
+
+def _fill_checkin_slots(engine: Engine) -> None:
+    # 이름으로 못 찾은 체크(체크 뒤 작가 이름이 바뀜 등): 스케줄 메인/서브 중 다른 체크가 안 쓴 자리가 1개뿐이고
+    # 그 스케줄에 못 찾은 체크도 1개뿐이면 그 작가 id로. 그 밖에는 NULL로 둠(빈 값만 채우므로 다시 실행해도 같음)
+    s, c = Schedule.__table__, Checkin.__table__
+    for start, stop in _id_ranges(engine, c, MIGRATION_BATCH_SIZE):
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(c.c.id, c.c.schedule_id, s.c.main_photographer_id, s.c.sub_photographer_id)
+                .join(s, s.c.id == c.c.schedule_id)
+                .where((c.c.id >= start) & (c.c.id < stop) & c.c.photographer_id.is_(None))
+            ).all()
+            if not rows:
+                continue
+            used: dict[int, set] = defaultdict(set)
+            unresolved: dict[int, int] = defaultdict(int)
+            for sid, pid in conn.execute(
+                select(c.c.schedule_id, c.c.photographer_id).where(c.c.schedule_id.in_({r.schedule_id for r in rows}))
+            ):
+                if pid is None:
+                    unresolved[sid] += 1
+                else:
+                    used[sid].add(pid)
+            values = []
+            for r in rows:
+                free = {r.main_photographer_id, r.sub_photographer_id} - {None} - used[r.schedule_id]
+                if unresolved[r.schedule_id] == 1 and len(free) == 1:
+                    values.append({"_id": r.id, "pid": free.pop()})
+            if values:
+                conn.execute(update(c).where(c.c.id == bindparam("_id")).values(photographer_id=bindparam("pid")), values)
+        time.sleep(MIGRATION_BATCH_PAUSE)
+
+
+_INT_FLOAT = re.compile(r"(?<![^\s,])(-?\d+)\.0(?![^\s,])")  # 공백/쉼표로 나뉜 "123.0"
+
+
+def _int_value(v: str) -> str:
+    m = _INT_FLOAT.fullmatch(v)
+    return m.group(1) if m else v
+
+
+def _int_tokens(v: str) -> str:
+    return _INT_FLOAT.sub(r"\1", v)
+
+
+def rewrite_values(engine: Engine, table: Table, fields: dict[str, Callable[[str], str]]) -> int:
+    """"%.0%"가 들어간 행만 읽어 fields의 함수로 바꿔 씀(id 구간마다 읽기, 행마다 짧은 트랜잭션)
+
+    바꾼 값이 유니크 제약에 걸리는 행은 그대로 둠. 바뀐 행 수
+    """
+    cols = [table.c[c] for c in fields]
+    total = 0
+    for start, stop in _id_ranges(engine, table, MIGRATION_BATCH_SIZE):
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(table.c.id, *cols)
+                .where((table.c.id >= start) & (table.c.id < stop))
+                .where(or_(*(c.like("%.0%") for c in cols)))
+            ).mappings().all()
+        for r in rows:
+            changed = {c: fn(r[c]) for c, fn in fields.items() if r[c] and fn(r[c]) != r[c]}
+            if not changed:
+                continue
+            try:
+                with engine.begin() as conn:
+                    conn.execute(update(table).where(table.c.id == r["id"]).values(changed))
+                total += 1
+            except IntegrityError:
+                pass
+        time.sleep(MIGRATION_BATCH_PAUSE)
+    return total
+
+
+@migration(5, '숫자 셀 이름 "123.0" → "123"(v3.41 가져오기와 같은 값)')
+def _int_cell_strings(engine: Engine) -> None:
+    # v3.41 이전 기본 가져오기는 빈 칸이 섞인 숫자 열(홀/커플/작가)을 "123.0"으로 저장 → 지금은 "123"
+    # 그대로 두면 같은 파일을 다시 가져올 때 가져오기 키가 달라 같은 스케줄이 새로 추가됨
+    # 바꾼 키의 스케줄이 이미 있으면(이미 "123"으로 다시 가져온 중복) 그 행은 그대로 둠
+    # 작가 이름도 같이 바꿈(id 연결은 그대로, 같은 이름의 작가가 이미 있으면 그대로 둠)
+    rewrite_values(engine, Schedule.__table__, {
+        "venue": _int_value, "couple": _int_value, "main_name": _int_value, "sub_name": _int_value,
+        "raw_photographers": _int_tokens,
+    })
+    rewrite_values(engine, Photographer.__table__, {"name": _int_value})
+    rewrite_values(engine, Checkin.__table__, {"photographer_name": _int_value})
+
+
+# ---------------- CLI ----------------
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from sqlmodel import SQLModel
+
+    from .db import engine
+
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description="DB 스키마 마이그레이션")
+    sub = parser.add_subparsers(dest="cmd")
+    sub.add_parser("status", help="적용/대기 중인 마이그레이션")
+    up = sub.add_parser("upgrade", help="밀린 마이그레이션 실행")
+    up.add_argument("--to", type=int, default=None, help="이 버전까지만")
+    args = parser.parse_args(argv)
+
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    if args.cmd == "upgrade":
+        SQLModel.metadata.create_all(engine)
+        ran = upgrade(engine, args.to)
+        print(f"{len(ran)}개 실행" if ran else "최신 상태")
+        return
+    done = applied_versions(engine)
+    for m in sorted(MIGRATIONS, key=lambda m: m.version):
+        print(f"{'적용' if m.version in done else '대기'}  {m.version:04d} {m.name}")
+
+
+if __name__ == "__main__":
+    main()
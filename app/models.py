@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Optional
 from datetime import date, time, datetime
+from sqlalchemy import Index, String, UniqueConstraint, cast, func
 from sqlmodel import SQLModel, Field, Relationship
 
 class Photographer(SQLModel, table=True):
@@ -42,14 +43,32 @@ class Schedule(SQLModel, table=True):
     travel_minutes_default: Optional[int] = None  # 이동시간(분) - 수동/기본값
     main_name: Optional[str] = Field(index=True)
     sub_name: Optional[str] = Field(default=None, index=True)
+    # 담당 작가(이름은 엑셀/수정 화면에 적힌 그대로, 작가 이름을 바꿔도 id로 연결 유지)
+    main_photographer_id: Optional[int] = Field(default=None, foreign_key="photographer.id")
+    sub_photographer_id: Optional[int] = Field(default=None, foreign_key="photographer.id")
 
     raw_photographers: Optional[str] = None  # F열 원본
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+# 엑셀 가져오기 중복 키(날짜+시간+홀+커플+메인+서브) — 동시 업로드 경합 방지
+# NULL끼리도 같은 값으로 보도록 COALESCE(가져오기 중복 판정과 동일)
+# 시간은 문자열로 바꿔서 비교(PostgreSQL은 time 열과 ''를 COALESCE할 수 없음)
+Index(
+    "uq_schedule_import_key",
+    Schedule.wedding_date,
+    func.coalesce(cast(Schedule.wedding_time, String), ""),
+    Schedule.venue,
+    func.coalesce(Schedule.couple, ""),
+    func.coalesce(Schedule.main_name, ""),
+    func.coalesce(Schedule.sub_name, ""),
+    unique=True,
+)
+
 class Checkin(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     schedule_id: int = Field(index=True, foreign_key="schedule.id")
-    photographer_name: str = Field(index=True)
+    photographer_name: str = Field(index=True)  # 체크 당시 이름(표시용)
+    photographer_id: Optional[int] = Field(default=None, foreign_key="photographer.id")
 
     wake_time: Optional[datetime] = None
     depart_time: Optional[datetime] = None
@@ -60,6 +79,24 @@ class Checkin(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+
+class ScheduleAssignment(SQLModel, table=True):
+    """스케줄 담당 작가 연결(스케줄당 메인/서브 최대 2행) — 작가별 스케줄 조회용(app/assignments.py)"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    schedule_id: int = Field(foreign_key="schedule.id")
+    photographer_id: int = Field(foreign_key="photographer.id")
+    role: str  # main / sub
+    wedding_date: date  # 스케줄 날짜 사본(작가 + 날짜 범위를 인덱스 1번으로)
+
+# 자주 쓰는 조회별 복합 인덱스
+# - /my, 기상/출발/도착: 내 스케줄 + 날짜(범위) → (작가, 날짜) 범위 1번
+# - 출발/도착 같은 홀 묶음, 알림 묶음 재계산: (날짜, 홀)
+Index("ix_assignment_photographer_date", ScheduleAssignment.photographer_id, ScheduleAssignment.wedding_date)
+Index("uq_assignment_schedule_photographer", ScheduleAssignment.schedule_id, ScheduleAssignment.photographer_id, unique=True)
+Index("ix_schedule_date_venue", Schedule.wedding_date, Schedule.venue)
+# 스케줄+작가당 체크 1개(get_or_create_checkin 조회, 동시 생성 방지)
+Index("uq_checkin_schedule_photographer_id", Checkin.schedule_id, Checkin.photographer_id, unique=True)
+
 class Venue(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True, unique=True)
@@ -67,6 +104,7 @@ class Venue(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+# (레거시) 스케줄별 이동시간 캐시 — 이동시간은 TravelTime(주소 쌍 기준)을 사용
 class RouteEstimate(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     schedule_id: int = Field(index=True, foreign_key="schedule.id")
@@ -77,3 +115,41 @@ class RouteEstimate(SQLModel, table=True):
     note: Optional[str] = None
     computed_at: datetime = Field(default_factory=datetime.utcnow)
 
+
+class GeocodeCache(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    address: str = Field(index=True, unique=True)  # normalize_address() 결과
+    lat: Optional[float] = None  # 검색 결과 없음이면 None (짧은 TTL로 재시도)
+    lon: Optional[float] = None
+    provider: str = "kakao"
+    fetched_at: datetime = Field(default_factory=datetime.utcnow)
+
+class TravelTime(SQLModel, table=True):
+    """출발지/도착지 주소 쌍별 이동시간(스케줄과 무관하게 재사용)"""
+    __table_args__ = (UniqueConstraint("origin", "destination", "bucket", name="uq_traveltime_pair_bucket"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    origin: str = Field(index=True)  # normalize_address(작가 주소)
+    destination: str = Field(index=True)  # normalize_address(웨딩홀 주소)
+    bucket: str = Field(default="")  # 출발 시간대 구분(""=시간대 무관)
+
+    minutes: int
+    provider: str = "kakao"
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
+
+class ImportedWorkbook(SQLModel, table=True):
+    """끝까지 가져온 스케줄 엑셀(sha256) — 같은 파일을 다시 올리면 파싱 없이 건너뜀"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    sha256: str = Field(index=True, unique=True)
+    filename: Optional[str] = None
+    rows: int = 0  # 읽은 행
+    inserted: int = 0
+    updated: int = 0
+    imported_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SchemaMigration(SQLModel, table=True):
+    """적용한 DB 마이그레이션 버전(app/migrations.py)"""
+    version: int = Field(primary_key=True)
+    name: str
+    applied_at: datetime = Field(default_factory=datetime.utcnow)
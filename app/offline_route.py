@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from .models import GeocodeCache, TravelTime
+
+# 오프라인 이동시간 추정(네트워크 없음)
+# - 직선거리(haversine) × 보정 계수: 분 = 기본분 + 거리(km) × 분/km
+# - 보정 계수는 지금까지 저장된 TravelTime(+ GeocodeCache 좌표)로 최소제곱 적합
+# - 하루치 (출발지, 도착지) 전체를 NumPy로 한 번에 계산
+# - Kakao 키가 없거나 응답이 늦을 때 '우선 추정값'으로 사용
+
+EARTH_RADIUS_KM = 6371.0088
+OFFLINE_MIN_SAMPLES = int(os.getenv("OFFLINE_MIN_SAMPLES", "5"))
+OFFLINE_REFIT_SECONDS = int(os.getenv("OFFLINE_REFIT_SECONDS", "3600"))
+
+Coord = Tuple[float, float]
+
+
+@dataclass(frozen=True)
+class OfflineModel:
+    base_minutes: float = 10.0  # 출발/주차 등 고정 시간
+    minutes_per_km: float = 2.0  # 도로 우회 포함 (직선 30km/h 상당)
+    samples: int = 0
+
+    def matrix(self, origins: np.ndarray, dests: np.ndarray) -> np.ndarray:
+        """(n,2) × (m,2) 위경도 -> (n,m) 분"""
+        km = haversine_km_matrix(origins, dests)
+        return np.maximum(1, np.rint(self.base_minutes + self.minutes_per_km * km)).astype(int)
+
+    def pairwise(self, origins: np.ndarray, dests: np.ndarray) -> np.ndarray:
+        """같은 길이 (n,2), (n,2) -> (n,) 분"""
+        km = haversine_km(origins, dests)
+        return np.maximum(1, np.rint(self.base_minutes + self.minutes_per_km * km)).astype(int)
+
+
+def haversine_km(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    lat1, lon1 = np.radians(a[..., 0]), np.radians(a[..., 1])
+    lat2, lon2 = np.radians(b[..., 0]), np.radians(b[..., 1])
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def haversine_km_matrix(origins: np.ndarray, dests: np.ndarray) -> np.ndarray:
+    return haversine_km(origins[:, None, :], dests[None, :, :])
+
+
+def fit_offline_model(session: Session) -> OfflineModel:
+    """저장된 이동시간(주소 쌍 + 좌표)로 기본분/분당km 적합. 표본이 적으면 기본값."""
+    o = aliased(GeocodeCache)
+    d = aliased(GeocodeCache)
+    rows = session.exec(
+        select(TravelTime.minutes, o.lat, o.lon, d.lat, d.lon)
+        .join(o, o.address == TravelTime.origin)
+        .join(d, d.address == TravelTime.destination)
+        .where(o.lat.is_not(None) & d.lat.is_not(None) & (TravelTime.provider != "offline"))
+    ).all()
+    if len(rows) < OFFLINE_MIN_SAMPLES:
+        return OfflineModel()
+
+    data = np.asarray(rows, dtype=float)
+    km = haversine_km(data[:, 1:3], data[:, 3:5])
+    A = np.column_stack([np.ones_like(km), km])
+    (base, per_km), *_ = np.linalg.lstsq(A, data[:, 0], rcond=None)
+    if not np.isfinite(per_km) or per_km <= 0:
+        return OfflineModel(samples=len(rows))
+    return OfflineModel(base_minutes=float(max(0.0, base)), minutes_per_km=float(per_km), samples=len(rows))
+
+
+class _ModelCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._model: Optional[OfflineModel] = None
+        self._fitted_at = 0.0
+
+    def get(self, session: Session) -> OfflineModel:
+        with self._lock:
+            if self._model is None or time.monotonic() - self._fitted_at > OFFLINE_REFIT_SECONDS:
+                try:
+                    self._model = fit_offline_model(session)
+                except Exception:
+                    self._model = self._model or OfflineModel()
+                self._fitted_at = time.monotonic()
+            return self._model
+
+
+offline_model = _ModelCache()
+
+
+def load_coords(session: Session, addresses: Iterable[str]) -> dict[str, Coord]:
+    """GeocodeCache에 있는 좌표만 (만료 여부 무관) — 네트워크 호출 없음"""
+    addresses = set(addresses)
+    if not addresses:
+        return {}
+    rows = session.exec(
+        select(GeocodeCache.address, GeocodeCache.lat, GeocodeCache.lon)
+        .where(GeocodeCache.address.in_(addresses) & GeocodeCache.lat.is_not(None) & GeocodeCache.lon.is_not(None))
+    ).all()
+    return {addr: (lat, lon) for addr, lat, lon in rows}
+
+
+def estimate_offline(session: Session, pairs: Iterable[Tuple[str, str]]) -> dict[Tuple[str, str], int]:
+    """주소 쌍들 오프라인 추정(한 번의 벡터 계산). 좌표가 없는 쌍은 제외."""
+    pairs = list(set(pairs))
+    if not pairs:
+        return {}
+    coords = load_coords(session, {a for p in pairs for a in p})
+    known = [p for p in pairs if p[0] in coords and p[1] in coords]
+    if not known:
+        return {}
+    origins = np.array([coords[o] for o, _ in known], dtype=float)
+    dests = np.array([coords[d] for _, d in known], dtype=float)
+    minutes = offline_model.get(session).pairwise(origins, dests)
+    return {p: int(m) for p, m in zip(known, minutes)}
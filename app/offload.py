@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Optional, TypeVar
+
+# 무거운 작업(엑셀 파싱)을 이벤트 루프/요청 스레드 밖에서 실행
+# - 가져오기 저장은 백그라운드 작업 워커(app/import_jobs.py)에서
+# - run_in_process: 엑셀 파싱은 프로세스 풀에서(GIL을 잡지 않아 체크인 응답 지연 없음)
+# - run_each_in_process: 시트별 파싱처럼 나눠지는 작업은 프로세스 여러 개에 동시에
+
+IMPORT_PROCESSES = int(os.getenv("IMPORT_PROCESSES", str(min(4, os.cpu_count() or 1))))  # 0이면 파싱도 스레드에서
+
+T = TypeVar("T")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: 실행 중인 스레드(알림/길찾기 워커)를 fork로 복제하지 않음
+            _pool = ProcessPoolExecutor(max_workers=IMPORT_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def run_in_process(fn: Callable[..., T], *args) -> T:
+    """(워커 스레드에서 호출) fn을 프로세스 풀에서 실행하고 결과를 기다림. fn/인자/결과는 pickle 가능해야 함"""
+    if IMPORT_PROCESSES <= 0:
+        return fn(*args)
+    return _process_pool().submit(fn, *args).result()
+
+
+def run_each_in_process(fn: Callable[..., T], arg_list: Iterable[tuple]) -> list[T]:
+    """(워커 스레드에서 호출) fn(*args)를 인자 묶음마다 프로세스 풀에서 동시에 실행. 결과는 인자 순서대로"""
+    arg_list = list(arg_list)
+    if IMPORT_PROCESSES <= 0 or len(arg_list) <= 1:
+        return [run_in_process(fn, *args) for args in arg_list]
+    pool = _process_pool()
+    futures = [pool.submit(fn, *args) for args in arg_list]
+    try:
+        return [f.result() for f in futures]
+    finally:
+        for f in futures:
+            f.cancel()
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
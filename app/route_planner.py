@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from sqlmodel import Session, select
+
+from .models import Photographer, Schedule
+from .route_utils import geocode_cached, route_minutes_kakaomobility
+from .travel_times import Pair, load_travel_table, pick_travel_time, route_key, save_travel_time, storage_bucket
+
+Job = tuple[Pair, str]  # (주소 쌍, 출발 시간대)
+
+# 날짜 범위 이동시간 일괄 계산(route matrix)
+# - 같은 날 같은 작가가 같은 웨딩홀 스케줄을 여러 개 찍으면 출발지/도착지가 같음
+# - (작가 주소, 웨딩홀 주소, 출발 시간대)를 모아 중복 제거 → 이동시간 표(TravelTime)에 없는 것만 1번씩 계산
+# - 스케줄별 값은 표에서 파생되므로 해당 쌍의 모든 스케줄에 바로 반영
+
+ROUTE_PLAN_WORKERS = int(os.getenv("ROUTE_PLAN_WORKERS", "4"))
+
+
+def plan_routes(session: Session, start: date, end: date) -> dict:
+    """start~end 스케줄 중 이동시간이 없는 (작가 주소, 웨딩홀 주소, 출발 시간대)를 일괄 계산.
+
+    반환: {"targets": 대상 스케줄 수, "pairs": 고유 (쌍, 시간대) 수, "computed": 계산 성공 수, "saved": 저장 수}
+    """
+    from .alerts import alert_state, compute_deadlines
+
+    schedules = session.exec(
+        select(Schedule).where(
+            (Schedule.wedding_date >= start) & (Schedule.wedding_date <= end)
+            & Schedule.travel_minutes_default.is_(None)
+            & Schedule.venue_address.is_not(None)
+        )
+    ).all()
+    stats = {"targets": 0, "pairs": 0, "computed": 0, "saved": 0}
+    if not schedules:
+        return stats
+
+    ids = {i for s in schedules for i in (s.main_photographer_id, s.sub_photographer_id) if i}
+    photographers = session.exec(select(Photographer).where(Photographer.id.in_(ids))).all() if ids else []
+    address_by_id = {p.id: p.address for p in photographers}
+
+    # (출발지, 도착지) -> [스케줄]
+    wanted: dict[Pair, list[Schedule]] = {}
+    for s in schedules:
+        for pid in (s.main_photographer_id, s.sub_photographer_id):
+            pair = route_key(address_by_id.get(pid), s.venue_address) if pid else None
+            if pair:
+                wanted.setdefault(pair, []).append(s)
+    table = load_travel_table(session, wanted)
+
+    # (출발지, 도착지, 출발 시간대) -> (대표 출발 시각, 스케줄 id) — 표에 없는 시간대만
+    # 출발 시각이 지난 시간대는 현재 교통으로만 계산 가능 → 시간대 무관("") 값으로
+    now = datetime.now()
+    targets: dict[Job, tuple[datetime | None, set[int]]] = {}
+    for pair, items in wanted.items():
+        for s in items:
+            arrival_target = compute_deadlines(s, None)["arrival_target_dt"]
+            row, missing, departure = pick_travel_time(table.get(pair, {}), arrival_target)
+            if missing is None and (row is not None or arrival_target is not None):
+                continue
+            bucket = storage_bucket(missing or "", departure, now)
+            if bucket in table.get(pair, {}):
+                continue
+            job = (pair, bucket)
+            targets.setdefault(job, (departure, set()))[1].add(s.id)
+    stats["targets"] = sum(len(ids) for _, ids in targets.values())
+    stats["pairs"] = len(targets)
+    if not targets:
+        return stats
+
+    # 1) 주소 지오코딩(고유 주소마다 1번, GeocodeCache 경유)
+    coords = {}
+    for addr in {a for (pair, _) in targets for a in pair}:
+        try:
+            coords[addr] = geocode_cached(session, addr)
+        except Exception:
+            coords[addr] = None
+
+    # 2) 고유 (쌍, 시간대) 길찾기(네트워크만, 병렬) — 시간대가 있으면 그 출발 시각으로 요청
+    jobs = [j for j in targets if coords.get(j[0][0]) and coords.get(j[0][1])]
+
+    def route(job: Job) -> int | None:
+        (origin, dest), bucket = job
+        o, d = coords[origin], coords[dest]
+        departure = targets[job][0] if bucket else None
+        try:
+            return route_minutes_kakaomobility(o[0], o[1], d[0], d[1], departure_time=departure)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=ROUTE_PLAN_WORKERS, thread_name_prefix="route-plan") as pool:
+        minutes = dict(zip(jobs, pool.map(route, jobs)))
+
+    # 3) 표에 저장 → 해당 쌍의 스케줄 알림 갱신
+    touched: set[int] = set()
+    for job, mins in minutes.items():
+        if mins is None:
+            continue
+        stats["computed"] += 1
+        save_travel_time(session, job[0], mins, bucket=job[1])
+        stats["saved"] += 1
+        touched |= targets[job][1]
+    if touched:
+        alert_state.invalidate(touched)
+    return stats
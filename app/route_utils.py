@@ -1,9 +1,15 @@
-import json
 import os
+import re
 import urllib.parse
-import urllib.request
+from datetime import datetime, timedelta
 from typing import Optional, Tuple
 
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from .http_client import http_client
+from .models import GeocodeCache
+
 # ✅ Kakao 버전 (운영용으로 가장 현실적인 구성)
 # - 지오코딩: Kakao Local (주소 검색)
 # - 경로/시간: KakaoMobility 길찾기 (자동차 길찾기)
@@ -14,17 +20,24 @@ from typing import Optional, Tuple
 # 참고 문서:
 # - Kakao Local 주소 검색: Authorization: KakaoAK {REST_API_KEY}
 # - KakaoMobility 자동차 길찾기: GET https://apis-navi.kakaomobility.com/v1/directions
+# - KakaoMobility 미래 운행 정보 길찾기: GET .../v1/future/directions (departure_time=YYYYMMDDHHMM)
 #
 # ⚠️ 주의
 # - 키는 소스에 하드코딩하지 말고 .env / 환경변수로 관리하세요.
 # - 이 구현은 프로토타입(서버사이드 호출)용입니다.
 
 KAKAO_REST_API_KEY = os.getenv("KAKAO_REST_API_KEY", "").strip()
+# 테스트용 로컬 스텁 서버로 바꿀 수 있도록 엔드포인트도 환경변수로
+KAKAO_LOCAL_URL = os.getenv("KAKAO_LOCAL_URL", "https://dapi.kakao.com").rstrip("/")
+KAKAO_NAVI_URL = os.getenv("KAKAO_NAVI_URL", "https://apis-navi.kakaomobility.com").rstrip("/")
+
+# 지오코딩 캐시(GeocodeCache) 유효기간
+GEOCODE_TTL_DAYS = int(os.getenv("GEOCODE_TTL_DAYS", "90"))
+GEOCODE_NEGATIVE_TTL_HOURS = int(os.getenv("GEOCODE_NEGATIVE_TTL_HOURS", "6"))  # 검색 결과 없음
 
 def _http_get_json(url: str, headers: dict, timeout: int = 10) -> dict:
-    req = urllib.request.Request(url, headers=headers, method="GET")
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    # keep-alive 연결 풀 재사용 (app/http_client.py)
+    return http_client.get_json(url, headers=headers, timeout=timeout)
 
 def geocode_kakao(address: str) -> Optional[Tuple[float, float]]:
     """주소 -> (lat, lon)"""
@@ -33,7 +46,7 @@ def geocode_kakao(address: str) -> Optional[Tuple[float, float]]:
         return None
 
     q = urllib.parse.quote(address)
-    url = f"https://dapi.kakao.com/v2/local/search/address.json?query={q}&size=1"
+    url = f"{KAKAO_LOCAL_URL}/v2/local/search/address.json?query={q}&size=1"
     headers = {
         "Authorization": f"KakaoAK {KAKAO_REST_API_KEY}",
         "Accept": "application/json",
@@ -52,8 +65,17 @@ def geocode_kakao(address: str) -> Optional[Tuple[float, float]]:
     except Exception:
         return None
 
-def route_minutes_kakaomobility(origin_lat: float, origin_lon: float, dest_lat: float, dest_lon: float) -> Optional[int]:
-    """(lat,lon) -> minutes"""
+def route_minutes_kakaomobility(
+    origin_lat: float,
+    origin_lon: float,
+    dest_lat: float,
+    dest_lon: float,
+    departure_time: Optional[datetime] = None,
+) -> Optional[int]:
+    """(lat,lon) -> minutes
+
+    departure_time이 미래면 미래 운행 정보 길찾기(/v1/future/directions)로 해당 시각 교통 반영
+    """
     if not KAKAO_REST_API_KEY:
         return None
 
@@ -69,7 +91,11 @@ def route_minutes_kakaomobility(origin_lat: float, origin_lon: float, dest_lat:
         "alternatives": "false",
         "road_details": "false",
     }
-    url = "https://apis-navi.kakaomobility.com/v1/directions?" + urllib.parse.urlencode(params)
+    if departure_time is not None and departure_time > datetime.now():
+        params["departure_time"] = departure_time.strftime("%Y%m%d%H%M")
+        url = f"{KAKAO_NAVI_URL}/v1/future/directions?" + urllib.parse.urlencode(params)
+    else:
+        url = f"{KAKAO_NAVI_URL}/v1/directions?" + urllib.parse.urlencode(params)
 
     headers = {
         "Authorization": f"KakaoAK {KAKAO_REST_API_KEY}",
@@ -93,10 +119,57 @@ def route_minutes_kakaomobility(origin_lat: float, origin_lon: float, dest_lat:
     except Exception:
         return None
 
-def estimate_travel_minutes(origin_address: str, dest_address: str) -> Optional[int]:
-    """주소 -> 이동시간(분). 키가 없거나 실패하면 None."""
-    o = geocode_kakao(origin_address)
-    d = geocode_kakao(dest_address)
+def normalize_address(address: str) -> str:
+    """캐시 키: 앞뒤 공백 제거 + 연속 공백 1칸"""
+    return re.sub(r"\s+", " ", (address or "").strip())
+
+def geocode_cached(session: Session, address: str) -> Optional[Tuple[float, float]]:
+    """GeocodeCache 먼저 확인, 없거나 만료됐을 때만 Kakao 호출"""
+    key = normalize_address(address)
+    if not key:
+        return None
+
+    row = session.exec(select(GeocodeCache).where(GeocodeCache.address == key)).first()
+    if row is not None:
+        has_coords = row.lat is not None and row.lon is not None
+        ttl = timedelta(days=GEOCODE_TTL_DAYS) if has_coords else timedelta(hours=GEOCODE_NEGATIVE_TTL_HOURS)
+        if datetime.utcnow() - row.fetched_at < ttl:
+            return (row.lat, row.lon) if has_coords else None
+
+    if not KAKAO_REST_API_KEY:
+        # 키가 없으면 만료된 좌표라도 사용
+        return (row.lat, row.lon) if row is not None and row.lat is not None and row.lon is not None else None
+
+    coords = geocode_kakao(key)
+    if row is None:
+        row = GeocodeCache(address=key)
+    row.lat, row.lon = coords if coords else (None, None)
+    row.provider = "kakao"
+    row.fetched_at = datetime.utcnow()
+    session.add(row)
+    try:
+        session.commit()
+    except IntegrityError:
+        # 다른 워커가 같은 주소를 먼저 저장
+        session.rollback()
+    return coords
+
+def estimate_travel_minutes(
+    origin_address: str,
+    dest_address: str,
+    session: Optional[Session] = None,
+    departure_time: Optional[datetime] = None,
+) -> Optional[int]:
+    """주소 -> 이동시간(분). 키가 없거나 실패하면 None.
+
+    session을 넘기면 지오코딩은 GeocodeCache를 거침(캐시 적중 시 길찾기 1회만 호출)
+    """
+    if session is not None:
+        o = geocode_cached(session, origin_address)
+        d = geocode_cached(session, dest_address)
+    else:
+        o = geocode_kakao(origin_address)
+        d = geocode_kakao(dest_address)
     if not o or not d:
         return None
-    return route_minutes_kakaomobility(o[0], o[1], d[0], d[1])
+    return route_minutes_kakaomobility(o[0], o[1], d[0], d[1], departure_time=departure_time)
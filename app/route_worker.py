@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from sqlmodel import Session
+
+from .db import engine
+from .route_planner import plan_routes
+from .route_utils import estimate_travel_minutes
+from .travel_times import Pair, load_travel_table, save_travel_time, storage_bucket
+
+# 이동시간 계산 워커
+# - 알림 화면은 네트워크를 기다리지 않음: 캐시에 없으면 작업만 넣고 "계산중" 표시
+# - 워커(스레드 풀, 개수 제한)가 Kakao 호출 후 TravelTime 저장 → alert_state 갱신
+# - 다가오는 스케줄은 주기적으로 미리 계산(관리자 '미리 계산'과 함께 전용 스레드 1개에서 —
+#   알림 화면의 계산 작업/요청 스레드풀을 차지하지 않음)
+# - 실패한 작업은 ROUTE_RETRY_AFTER초 동안 다시 넣지 않음(지난 실패 기록은 정리)
+
+ROUTE_WORKERS = int(os.getenv("ROUTE_WORKERS", "2"))
+ROUTE_MAX_PENDING = int(os.getenv("ROUTE_MAX_PENDING", "500"))
+ROUTE_PREFETCH_DAYS = int(os.getenv("ROUTE_PREFETCH_DAYS", "7"))
+ROUTE_PREFETCH_INTERVAL = int(os.getenv("ROUTE_PREFETCH_INTERVAL", "600"))  # 초
+ROUTE_RETRY_AFTER = int(os.getenv("ROUTE_RETRY_AFTER", "1800"))  # 실패 후 재시도 대기(초)
+
+Job = tuple[Pair, str]  # (주소 쌍, 출발 시간대)
+
+
+class RouteWorker:
+    def __init__(self, max_workers: int = ROUTE_WORKERS, max_pending: int = ROUTE_MAX_PENDING) -> None:
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="route")
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="route-prefetch")
+        # (출발지, 도착지, 시간대) -> 결과를 기다리는 스케줄 id
+        self._pending: dict[Job, set[int]] = {}
+        self._failed: dict[Job, float] = {}
+        self._prewarming = False
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        pair: Pair,
+        schedule_id: int | None = None,
+        bucket: str = "",
+        departure: datetime | None = None,
+    ) -> bool:
+        """계산 작업 등록. 이미 대기 중이거나 큐가 가득 차거나 최근 실패했으면 False."""
+        job = (pair, bucket)
+        with self._lock:
+            waiting = self._pending.get(job)
+            if waiting is not None:
+                if schedule_id is not None:
+                    waiting.add(schedule_id)
+                return False
+            if len(self._pending) >= self.max_pending:
+                return False
+            failed_at = self._failed.get(job)
+            if failed_at is not None:
+                if time.monotonic() - failed_at < ROUTE_RETRY_AFTER:
+                    return False
+                del self._failed[job]
+            self._pending[job] = {schedule_id} if schedule_id is not None else set()
+        self._executor.submit(self._run, job, departure)
+        return True
+
+    def is_pending(self, pair: Pair, bucket: str = "") -> bool:
+        with self._lock:
+            return (pair, bucket) in self._pending
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self, job: Job, departure: datetime | None) -> None:
+        from .alerts import alert_state
+
+        try:
+            mins = compute_travel_time(job[0], job[1], departure)
+        except Exception:
+            mins = None
+        with self._lock:
+            waiting = self._pending.pop(job, set())
+            if mins is None:
+                now = time.monotonic()
+                self._prune_failed(now)
+                self._failed[job] = now
+            else:
+                self._failed.pop(job, None)
+        # 성공/실패 모두 "계산중" 표시를 풀기 위해 갱신
+        alert_state.invalidate(waiting)
+
+    def _prune_failed(self, now: float) -> None:
+        # 재시도 대기가 끝난 실패 기록 삭제(_lock 안에서 호출) → 최근 ROUTE_RETRY_AFTER초 실패만 남음
+        expired = [job for job, failed_at in self._failed.items() if now - failed_at >= ROUTE_RETRY_AFTER]
+        for job in expired:
+            del self._failed[job]
+
+    def failed_count(self) -> int:
+        with self._lock:
+            return len(self._failed)
+
+    def prefetch_upcoming(self, days: int = ROUTE_PREFETCH_DAYS) -> int:
+        """오늘~days일 스케줄 이동시간 미리 계산(고유 주소 쌍 단위, route_planner)"""
+        start = date.today()
+        with Session(engine) as session:
+            return plan_routes(session, start, start + timedelta(days=days))["saved"]
+
+    def prewarm(self, days: int) -> bool:
+        """관리자 '미리 계산': prefetch_upcoming을 미리 계산 전용 스레드에서 실행(요청은 기다리지 않음). 이미 실행 중이면 False"""
+        with self._lock:
+            if self._prewarming:
+                return False
+            self._prewarming = True
+        self._prefetch_executor.submit(self._run_prewarm, days)
+        return True
+
+    def _run_prewarm(self, days: int) -> None:
+        try:
+            self.prefetch_upcoming(days)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._prewarming = False
+
+    async def prefetch_loop(self, interval: int = ROUTE_PREFETCH_INTERVAL) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(self._prefetch_executor, self.prefetch_upcoming)
+            except Exception:
+                pass
+            await asyncio.sleep(interval)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def compute_travel_time(pair: Pair, bucket: str = "", departure: datetime | None = None) -> int | None:
+    """주소 쌍(+출발 시간대) 이동시간 계산 후 TravelTime 저장. 워커 스레드에서 실행.
+
+    출발 시각이 이미 지났으면 현재 교통 기준 값이므로 시간대 무관("")으로 저장
+    """
+    bucket = storage_bucket(bucket, departure)
+    with Session(engine) as session:
+        cached = load_travel_table(session, [pair]).get(pair, {}).get(bucket)
+        if cached:
+            return cached.minutes
+        mins = estimate_travel_minutes(pair[0], pair[1], session=session, departure_time=departure if bucket else None)
+        if mins is None:
+            return None
+        save_travel_time(session, pair, mins, bucket=bucket)
+    return mins
+
+
+route_worker = RouteWorker()
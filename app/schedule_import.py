@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from .accounts import load_account_names, provision_from_schedules
+from .assignments import photographer_ids, replace_assignments, resolve_ids
+from .importer import iter_schedules_from_excel, load_schedule_sheets, schedule_sheet_names
+from .models import Checkin, ImportedWorkbook, RouteEstimate, Schedule
+from .offload import IMPORT_PROCESSES, run_each_in_process, run_in_process
+
+# 엑셀 스케줄 저장(다시 가져오기 = 바뀐 행만 반영)
+# - 같은 예식: 자연 키(날짜+홀+커플)로 기존 스케줄과 맞추고, 내용 해시가 다르면 그 행만 update
+#   (시간/작가가 바뀌어도 새 행을 만들지 않음, 수정된 스케줄의 이동시간 캐시/빠진 작가 체크 정리)
+# - 커플이 없는 행은 전체 키(날짜+시간+홀+커플+메인+서브, NULL끼리 같음 — uq_schedule_import_key)로 중복 제외
+# - 파일의 날짜 범위에 있는 기존 스케줄을 1번에 읽어 메모리에서 비교, 추가/수정은 각각 executemany 1번
+# - 메인/서브 이름은 작가 id로 바꿔 같이 저장(담당 연결 ScheduleAssignment도 갱신)
+# - 시트가 여러 개(월별 시트)면 시트별로 프로세스 풀에서 동시에 파싱 → 시트 순서대로 합치며 시트 간 중복 제거
+# - 대용량 .xlsx는 스트리밍(openpyxl read_only)으로 읽고 청크 단위로 저장(작가 자동 생성 확인은 새 이름이 나온 청크만)
+# - 이미 가져온 파일과 바이트가 같으면(sha256) 파싱하지 않고 건너뜀
+
+IMPORT_STREAM_MIN_MB = float(os.getenv("IMPORT_STREAM_MIN_MB", "20"))
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+
+ImportKey = tuple
+
+SCHEDULE_COLUMNS = [c.name for c in Schedule.__table__.columns if c.name != "id"]
+# 다시 가져올 때 비교/수정하는 필드(자연 키 외)
+CONTENT_FIELDS = (
+    "wedding_time", "shoot_start_time", "arrival_target_time", "venue_address",
+    "main_name", "sub_name", "raw_photographers",
+)
+
+
+def import_key(wedding_date, wedding_time, venue, couple, main_name, sub_name) -> ImportKey:
+    return (wedding_date, wedding_time or "", venue, couple or "", main_name or "", sub_name or "")
+
+
+def row_key(r: dict) -> ImportKey:
+    return import_key(r["wedding_date"], r.get("wedding_time"), r["venue"], r.get("couple"), r.get("main_name"), r.get("sub_name"))
+
+
+def natural_key(r: dict) -> tuple:
+    """다시 가져올 때 같은 예식으로 보는 키(날짜+홀+커플). 커플이 비어 있으면 None"""
+    if not r.get("couple"):
+        return None
+    return (r["wedding_date"], r["venue"], r["couple"])
+
+
+def content_fields(r: dict) -> tuple[str, ...]:
+    """비교/수정할 필드. 홀 주소는 파일에 있을 때만(열 기반 포맷에는 없음, 비어 있으면 기존 주소 유지)"""
+    return tuple(f for f in CONTENT_FIELDS if f != "venue_address" or r.get("venue_address"))
+
+
+def content_hash(r: dict, fields: tuple[str, ...]) -> str:
+    return hashlib.blake2b(repr(tuple(r.get(f) for f in fields)).encode(), digest_size=16).hexdigest()
+
+
+def load_existing_rows(session: Session, rows: list[dict]) -> list[dict]:
+    """rows의 날짜 범위에 있는 기존 스케줄(id + 키 + 비교 필드, 쿼리 1번, id 순)"""
+    dates = [r["wedding_date"] for r in rows]
+    if not dates:
+        return []
+    cols = [Schedule.id, Schedule.wedding_date, Schedule.venue, Schedule.couple, *(getattr(Schedule, f) for f in CONTENT_FIELDS)]
+    existing = session.exec(
+        select(*cols)
+        .where((Schedule.wedding_date >= min(dates)) & (Schedule.wedding_date <= max(dates)))
+        .order_by(Schedule.id)
+    ).all()
+    return [dict(t._mapping) for t in existing]
+
+
+def _match(r: dict, candidates: list[dict]) -> Optional[dict]:
+    """같은 자연 키의 기존 행 중 짝: 내용이 같은 행 > 전체 키가 같은 행 > 가장 먼저 만든 행"""
+    if not candidates:
+        return None
+    fields = content_fields(r)
+    h = content_hash(r, fields)
+    k = row_key(r)
+    return (
+        next((c for c in candidates if content_hash(c, fields) == h), None)
+        or next((c for c in candidates if row_key(c) == k), None)
+        or candidates[0]
+    )
+
+
+def plan_schedule_rows(rows: Iterable[dict], existing: list[dict], claimed: Optional[set[ImportKey]] = None) -> dict:
+    """파일 행을 기존 스케줄과 맞춰 봄(저장 안 함): insert / update / unchanged / duplicate_file
+
+    - 자연 키(날짜+홀+커플)가 같은 기존 스케줄이 있으면 내용 해시를 비교해 바뀐 행만 update
+    - 커플이 없는 행은 전체 키(날짜+시간+홀+커플+메인+서브)로만 중복 판정(추가만)
+    - claimed: 이번 가져오기에서 이미 맞춘 행의 전체 키(청크가 나뉘어도 같은 행을 두 번 쓰지 않음)
+    """
+    claimed = set() if claimed is None else claimed
+    taken = {row_key(e) for e in existing}
+    by_natural: dict[tuple, list[dict]] = defaultdict(list)
+    for e in existing:
+        nk = natural_key(e)
+        if nk is not None and row_key(e) not in claimed:
+            by_natural[nk].append(e)
+
+    seen: set[ImportKey] = set()
+    plan = {"insert": [], "update": [], "unchanged": [], "duplicate_file": []}
+    for r in rows:
+        k = row_key(r)
+        if k in seen:
+            plan["duplicate_file"].append(r)
+            continue
+        seen.add(k)
+        nk = natural_key(r)
+        match = _match(r, by_natural.get(nk)) if nk is not None else None
+        if match is not None:
+            by_natural[nk].remove(match)
+            claimed.add(row_key(match))
+            changed = {f: (match.get(f), r.get(f)) for f in content_fields(r) if match.get(f) != r.get(f)}
+            if not changed or (k != row_key(match) and k in taken):
+                # 내용이 같거나, 바꾸면 다른 기존 스케줄과 똑같아지는 경우
+                plan["unchanged"].append(r)
+            else:
+                plan["update"].append({"id": match["id"], "row": r, "changed": changed})
+                taken.add(k)
+                claimed.add(k)
+            continue
+        if k in taken:
+            plan["unchanged"].append(r)
+        else:
+            plan["insert"].append(r)
+            taken.add(k)
+        claimed.add(k)
+    return plan
+
+
+def _reassigned(u: dict) -> bool:
+    return "main_name" in u["changed"] or "sub_name" in u["changed"]
+
+
+def _reset_dependents(session: Session, updates: list[dict]) -> None:
+    """수정된 스케줄의 이동시간 캐시(RouteEstimate) 삭제, 담당에서 빠진 작가의 체크 삭제(도착 기록은 남김)"""
+    ids = [u["id"] for u in updates]
+    session.execute(delete(RouteEstimate).where(RouteEstimate.schedule_id.in_(ids)))
+    assigned = {u["id"]: {i for i in u["ids"].values() if i is not None} for u in updates if _reassigned(u)}
+    if not assigned:
+        return
+    checkins = session.exec(
+        select(Checkin.id, Checkin.schedule_id, Checkin.photographer_id)
+        .where(Checkin.schedule_id.in_(list(assigned)) & Checkin.arrive_time.is_(None))
+    ).all()
+    stale = [cid for cid, sid, pid in checkins if pid not in assigned[sid]]
+    if stale:
+        session.execute(delete(Checkin).where(Checkin.id.in_(stale)))
+
+
+def upsert_schedules(session: Session, rows: list[dict], claimed: Optional[set[ImportKey]] = None) -> tuple[int, int]:
+    """새 행은 한 번에 insert, 바뀐 행은 한 번에 update. (추가 수, 수정 수) 반환
+
+    다른 업로드와 겹쳐 유니크 인덱스에 걸리면 다시 읽어 1번 재시도
+    """
+    claimed = set() if claimed is None else claimed
+    for attempt in range(2):
+        trial = set(claimed)
+        plan = plan_schedule_rows(rows, load_existing_rows(session, rows), trial)
+        if not plan["insert"] and not plan["update"]:
+            claimed |= trial
+            return 0, 0
+        now = datetime.utcnow()
+        reassigned = [u for u in plan["update"] if _reassigned(u)]
+        ids = photographer_ids(session, (
+            nm for r in plan["insert"] + [u["row"] for u in reassigned] for nm in (r.get("main_name"), r.get("sub_name"))
+        ))
+        links = []
+        try:
+            if plan["insert"]:
+                values = [
+                    {**{c: r.get(c) for c in SCHEDULE_COLUMNS}, **resolve_ids(r, ids), "created_at": now}
+                    for r in plan["insert"]
+                ]
+                new_ids = session.execute(
+                    insert(Schedule).returning(Schedule.id, sort_by_parameter_order=True), values
+                ).scalars().all()
+                links += [
+                    (sid, v["wedding_date"], v["main_photographer_id"], v["sub_photographer_id"])
+                    for sid, v in zip(new_ids, values)
+                ]
+            if plan["update"]:
+                for u in reassigned:
+                    u["ids"] = resolve_ids(u["row"], ids)
+                session.execute(update(Schedule), [
+                    {"id": u["id"], **{f: new for f, (_, new) in u["changed"].items()}, **u.get("ids", {})}
+                    for u in plan["update"]
+                ])
+                links += [
+                    (u["id"], u["row"]["wedding_date"], u["ids"]["main_photographer_id"], u["ids"]["sub_photographer_id"])
+                    for u in reassigned
+                ]
+                _reset_dependents(session, plan["update"])
+            replace_assignments(session, links)
+            session.commit()
+            claimed |= trial
+            return len(plan["insert"]), len(plan["update"])
+        except IntegrityError:
+            session.rollback()
+            if attempt:
+                raise
+    return 0, 0
+
+
+def import_schedule_rows(
+    session: Session,
+    rows: list[dict],
+    claimed: Optional[set[ImportKey]] = None,
+    provisioned: Optional[set[str]] = None,
+) -> tuple[int, int]:
+    """스케줄 dict 묶음 저장(작가 자동 생성 + 추가/수정). (추가 수, 수정 수) 반환
+
+    provisioned: 이미 자동 생성을 확인한 작가 이름(청크마다 같은 set) → 이름마다 1번만 확인
+    """
+    provision_from_schedules(session, rows, provisioned)
+    return upsert_schedules(session, rows, claimed)
+
+
+Progress = Callable[[int, int, int], None]
+
+
+def import_schedules_file(
+    session: Session,
+    path: str,
+    mode: str = "",
+    progress: Optional[Progress] = None,
+) -> tuple[int, int]:
+    """엑셀 파일 -> 스케줄 저장(이벤트 루프 밖, 워커 스레드에서 호출). (추가 수, 수정 수) 반환
+
+    스트리밍: .xlsx 이면서 '대용량' 선택(mode="stream") 또는 IMPORT_STREAM_MIN_MB 이상
+    그 외에는 파싱을 프로세스 풀에서 하고 결과를 청크 단위로 저장
+    progress(읽은 행 수, 추가 수, 수정 수)는 청크마다 호출
+    """
+    streaming = path.lower().endswith((".xlsx", ".xlsm")) and (
+        mode == "stream" or os.path.getsize(path) >= IMPORT_STREAM_MIN_MB * 1024 * 1024
+    )
+    if streaming:
+        inserted = updated = 0
+        claimed: set[ImportKey] = set()
+        provisioned: set[str] = set()
+        rows = iter_schedules_from_excel(path)
+        while chunk := list(islice(rows, IMPORT_CHUNK_SIZE)):
+            n, u = import_schedule_rows(session, chunk, claimed, provisioned)
+            inserted += n
+            updated += u
+            if progress:
+                progress(len(chunk), n, u)
+        return inserted, updated
+
+    rows, duplicates = parse_schedules_file(path)
+    if duplicates and progress:
+        progress(len(duplicates), 0, 0)
+    return import_parsed_rows(session, rows, progress)
+
+
+def parse_schedules_file(path: str) -> tuple[list[dict], list[dict]]:
+    """엑셀 파일 -> (스케줄 dict 목록, 제외된 중복 행)
+
+    모든 시트를 프로세스 수만큼 연속된 묶음으로 나눠 동시에 파싱(묶음마다 워크북은 1번만 엶)
+    """
+    sheets = run_in_process(schedule_sheet_names, path)
+    n = max(1, min(IMPORT_PROCESSES, len(sheets)))
+    size = -(-len(sheets) // n) if sheets else 1
+    groups = [sheets[i:i + size] for i in range(0, len(sheets), size)]
+    parsed = run_each_in_process(load_schedule_sheets, [(path, g) for g in groups])
+    return merge_sheet_rows(rows for group in parsed for rows in group)
+
+
+def merge_sheet_rows(sheets: Iterable[list[dict]]) -> tuple[list[dict], list[dict]]:
+    """시트별 결과를 시트 순서대로 합치면서 전체 키 중복(시트 안/시트 간) 제거. (행, 중복 행)"""
+    seen: set[ImportKey] = set()
+    rows, duplicates = [], []
+    for sheet in sheets:
+        for r in sheet:
+            k = row_key(r)
+            if k in seen:
+                duplicates.append(r)
+                continue
+            seen.add(k)
+            rows.append(r)
+    return rows, duplicates
+
+
+def import_parsed_rows(
+    session: Session,
+    rows: list[dict],
+    progress: Optional[Progress] = None,
+) -> tuple[int, int]:
+    """이미 파싱된 행 저장: 작가 자동 생성 1번 + 청크 단위 추가/수정. (추가 수, 수정 수) 반환"""
+    provision_from_schedules(session, rows)
+    inserted = updated = 0
+    claimed: set[ImportKey] = set()
+    for i in range(0, len(rows), IMPORT_CHUNK_SIZE):
+        chunk = rows[i:i + IMPORT_CHUNK_SIZE]
+        n, u = upsert_schedules(session, chunk, claimed)
+        inserted += n
+        updated += u
+        if progress:
+            progress(len(chunk), n, u)
+    return inserted, updated
+
+
+def diff_schedule_rows(session: Session, rows: list[dict]) -> dict:
+    """미리보기(저장 안 함): 추가될 행 / 수정될 행 / 기존과 같음 / 파일 안 중복 / 자동 생성될 작가
+
+    기존 스케줄 조회 1번 + 작가 이름 조회 1번
+    """
+    plan = plan_schedule_rows(rows, load_existing_rows(session, rows))
+    names, _ = load_account_names(session)
+    new_photographers = list(dict.fromkeys(
+        nm for r in rows for nm in (r.get("main_name"), r.get("sub_name")) if nm and nm.strip() not in names
+    ))
+    return {
+        "insert": plan["insert"],
+        "update": plan["update"],
+        "duplicate_db": plan["unchanged"],
+        "duplicate_file": plan["duplicate_file"],
+        "new_photographers": new_photographers,
+    }
+
+
+def _jsonable(v):
+    return v.isoformat() if hasattr(v, "isoformat") else v
+
+
+def jsonable_row(r: dict) -> dict:
+    """스케줄 dict -> JSON(날짜/시간은 ISO 문자열)"""
+    return {k: _jsonable(v) for k, v in r.items()}
+
+
+def jsonable_update(u: dict) -> dict:
+    """수정될 행 -> JSON(id + 파일 행 + 바뀐 필드의 [기존, 새 값])"""
+    return {
+        "id": u["id"],
+        **jsonable_row(u["row"]),
+        "changed": {f: [_jsonable(old), _jsonable(new)] for f, (old, new) in u["changed"].items()},
+    }
+
+
+def workbook_digest(path: str) -> str:
+    """업로드 파일 sha256(1MB씩 읽음)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def workbook_imported(session: Session, digest: str) -> Optional[ImportedWorkbook]:
+    return session.exec(select(ImportedWorkbook).where(ImportedWorkbook.sha256 == digest)).first()
+
+
+def record_workbook(session: Session, digest: str, filename: str, rows: int, inserted: int, updated: int) -> None:
+    """가져오기를 끝까지 마친 파일 기록(같은 파일 재업로드 건너뛰기용)"""
+    wb = workbook_imported(session, digest) or ImportedWorkbook(sha256=digest)
+    wb.filename = filename
+    wb.rows = rows
+    wb.inserted = inserted
+    wb.updated = updated
+    wb.imported_at = datetime.utcnow()
+    session.add(wb)
+    session.commit()
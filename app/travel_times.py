@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from .models import TravelTime
+from .route_utils import normalize_address
+
+# 이동시간 표(TravelTime): (출발지 주소, 도착지 주소[, 시간대]) 단위로 저장
+# - 같은 작가가 같은 웨딩홀에 다시 가면 스케줄이 새로 생겨도 캐시 적중
+# - 스케줄별 이동시간은 (작가 주소, 웨딩홀 주소)로 이 표에서 찾아서 계산(route_key)
+# - 출발 시간대(bucket): 요일 구분 + 30분 단위 출발 시각(예: "sat-0730")
+#   토요일 7시 출발과 평일 14시 출발을 따로 저장하고, 실제 출발 마감과 가장 가까운 시간대를 사용
+# - 출발 시각이 이미 지났으면 길찾기는 현재 교통 기준 → 그 시간대가 아니라 시간대 무관("")으로 저장(storage_bucket)
+
+Pair = tuple[str, str]
+
+TRAVEL_BUCKET_MINUTES = int(os.getenv("TRAVEL_BUCKET_MINUTES", "30"))
+TRAVEL_BUCKET_TOLERANCE = int(os.getenv("TRAVEL_BUCKET_TOLERANCE", "90"))  # 이 범위 안의 시간대만 근접값으로 사용(분)
+DEFAULT_TRAVEL_MINUTES = 60  # 이동시간을 모를 때 출발 시각 추정용(compute_deadlines 기본값과 동일)
+
+_DAY_CLASS = {0: "wd", 1: "wd", 2: "wd", 3: "wd", 4: "wd", 5: "sat", 6: "sun"}
+
+
+def route_key(photographer_address: str | None, venue_address: str | None) -> Pair | None:
+    """(작가 주소, 웨딩홀 주소) -> 표 키. 주소가 하나라도 없으면 None."""
+    o = normalize_address(photographer_address or "")
+    d = normalize_address(venue_address or "")
+    if not o or not d:
+        return None
+    return o, d
+
+
+def save_travel_time(session: Session, pair: Pair, minutes: int, provider: str = "kakao", bucket: str = "") -> None:
+    """있으면 갱신, 없으면 추가 (commit 포함)"""
+    origin, dest = pair
+    row = session.exec(
+        select(TravelTime).where(
+            (TravelTime.origin == origin) & (TravelTime.destination == dest) & (TravelTime.bucket == bucket)
+        )
+    ).first()
+    if row is None:
+        row = TravelTime(origin=origin, destination=dest, bucket=bucket, minutes=minutes)
+    row.minutes = minutes
+    row.provider = provider
+    row.computed_at = datetime.utcnow()
+    session.add(row)
+    try:
+        session.commit()
+    except IntegrityError:
+        # 다른 워커가 같은 쌍을 먼저 저장
+        session.rollback()
+
+
+def departure_bucket(departure: datetime) -> str:
+    """출발 시각 -> 시간대 키 (요일 구분 + TRAVEL_BUCKET_MINUTES 단위 내림)"""
+    minute_of_day = departure.hour * 60 + departure.minute
+    slot = minute_of_day - minute_of_day % TRAVEL_BUCKET_MINUTES
+    return f"{_DAY_CLASS[departure.weekday()]}-{slot // 60:02d}{slot % 60:02d}"
+
+
+def storage_bucket(bucket: str, departure: datetime | None, now: datetime | None = None) -> str:
+    """계산 결과를 저장할 시간대 키. 출발 시각이 미래일 때만 그 시간대, 지났으면 ""(현재 교통으로 계산한 값)"""
+    if not bucket or departure is None or departure <= (now or datetime.now()):
+        return ""
+    return bucket
+
+
+def bucket_start(bucket: str, day: datetime) -> datetime:
+    """시간대 키의 대표 출발 시각(해당 날짜 기준)"""
+    hhmm = bucket.split("-", 1)[1]
+    return day.replace(hour=int(hhmm[:2]), minute=int(hhmm[2:]), second=0, microsecond=0)
+
+
+def load_travel_table(session: Session, pairs: Iterable[Pair]) -> dict[Pair, dict[str, TravelTime]]:
+    """여러 쌍의 모든 시간대를 한 번의 쿼리로 조회: 쌍 -> {bucket: TravelTime}"""
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    origins = {o for o, _ in pairs}
+    dests = {d for _, d in pairs}
+    rows = session.exec(
+        select(TravelTime).where(TravelTime.origin.in_(origins) & TravelTime.destination.in_(dests))
+    ).all()
+    table: dict[Pair, dict[str, TravelTime]] = {}
+    for r in rows:
+        pair = (r.origin, r.destination)
+        if pair in pairs:
+            table.setdefault(pair, {})[r.bucket] = r
+    return table
+
+
+def _nearest_bucket(buckets: dict[str, TravelTime], departure: datetime) -> TravelTime | None:
+    want = departure_bucket(departure)
+    if want in buckets:
+        return buckets[want]
+    day_class, hhmm = want.split("-", 1)
+    want_min = int(hhmm[:2]) * 60 + int(hhmm[2:])
+    best, best_diff = None, None
+    for key, row in buckets.items():
+        if not key or not key.startswith(day_class + "-"):
+            continue
+        k = key.split("-", 1)[1]
+        diff = abs(int(k[:2]) * 60 + int(k[2:]) - want_min)
+        if diff <= TRAVEL_BUCKET_TOLERANCE and (best_diff is None or diff < best_diff):
+            best, best_diff = row, diff
+    return best
+
+
+def pick_travel_time(
+    buckets: dict[str, TravelTime],
+    arrival_target: datetime | None,
+    default_minutes: int | None = None,
+) -> tuple[TravelTime | None, str | None, datetime | None]:
+    """도착목표 기준으로 쓸 이동시간 선택.
+
+    반환: (선택된 행 또는 None, 필요한 시간대 키, 그 시간대 출발 시각)
+    - 출발 시각 = 도착목표 - (시간대 무관 값 / 기본값 / 60분)으로 1차 추정 후,
+      찾은 값으로 한 번 더 보정해 실제 출발 마감과 가장 가까운 시간대 사용
+    - 필요한 시간대가 표에 없으면 키를 돌려줘서 계산 작업을 넣을 수 있게 함
+    """
+    generic = buckets.get("")
+    if arrival_target is None:
+        return generic, None, None
+
+    base = generic.minutes if generic else (default_minutes or DEFAULT_TRAVEL_MINUTES)
+    departure = arrival_target - timedelta(minutes=base)
+    chosen = _nearest_bucket(buckets, departure)
+    if chosen is not None:
+        departure = arrival_target - timedelta(minutes=chosen.minutes)
+        chosen = _nearest_bucket(buckets, departure) or chosen
+
+    want = departure_bucket(departure)
+    missing = None if want in buckets else want
+    return chosen or generic, missing, departure
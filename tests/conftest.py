@@ -0,0 +1,56 @@
+import os
+import tempfile
+
+import pytest
+
+# 테스트는 작업 폴더의 app.db/uploads를 건드리지 않도록 임시 폴더 사용(app 모듈 import 전에 설정)
+_TMP = tempfile.mkdtemp(prefix="wedding-schedule-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TMP, 'app.db')}")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_TMP, "uploads"))
+os.environ.setdefault("IMPORT_PROCESSES", "0")
+os.environ.setdefault("MIGRATE_ON_STARTUP", "0")
+os.environ.setdefault("MIGRATION_BATCH_PAUSE", "0")
+os.environ["KAKAO_REST_API_KEY"] = ""  # 실제 Kakao API는 호출하지 않음(스텁 서버 테스트는 모듈 값을 바꿔서)
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    """앱 1번 시작(startup: init_db, 알림 스트림, 이동시간 워커) 후 공유"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        client.get("/")  # 기본 관리자 계정(ensure_admin)
+        yield client
+
+
+@pytest.fixture
+def login(app_client):
+    """login(아이디, 비밀번호) -> 로그인한 TestClient(쿠키는 클라이언트마다 따로)"""
+    from fastapi.testclient import TestClient
+
+    def _login(username: str = "admin", password: str = "admin1234") -> TestClient:
+        client = TestClient(app_client.app)
+        resp = client.post("/login", data={"username": username, "password": password}, follow_redirects=False)
+        assert resp.status_code == 302, resp.text
+        return client
+
+    return _login
+
+
+@pytest.fixture
+def kakao_stub(monkeypatch):
+    """Kakao API 대신 로컬 스텁 서버(KAKAO_LOCAL_URL/KAKAO_NAVI_URL)"""
+    from app import route_utils
+    from app.http_client import http_client
+
+    from .kakao_stub import KakaoStub
+
+    stub = KakaoStub().start()
+    monkeypatch.setattr(route_utils, "KAKAO_REST_API_KEY", "test-key")
+    monkeypatch.setattr(route_utils, "KAKAO_LOCAL_URL", stub.url)
+    monkeypatch.setattr(route_utils, "KAKAO_NAVI_URL", stub.url)
+    yield stub
+    stub.stop()
+    http_client.close()
@@ -0,0 +1,91 @@
+import json
+import threading
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Kakao Local(지오코딩) / KakaoMobility(길찾기) 로컬 스텁 서버
+# - 주소 -> 주소 문자열로 정해지는 좌표, 길찾기 -> duration초
+# - hold: 길찾기 응답을 잡아두기(대기/중복 작업 확인), fail: 앞의 N번은 오류 응답(+ Retry-After)
+# - requests: (경로, 클라이언트 포트) — 포트가 같으면 keep-alive 연결 재사용
+
+
+class KakaoStub:
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, int]] = []
+        self.duration = 1800  # 길찾기 응답(초)
+        self.fail = 0  # 남은 오류 응답 수
+        self.fail_status = 503
+        self.retry_after: str | None = None
+        self.release = threading.Event()
+        self.release.set()
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def paths(self, prefix: str) -> list[str]:
+        with self._lock:
+            return [p for p, _ in self.requests if p.startswith(prefix)]
+
+    def directions(self) -> list[str]:
+        return self.paths("/v1/")
+
+    def hold(self) -> None:
+        self.release.clear()
+
+    def start(self) -> "KakaoStub":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            disable_nagle_algorithm = True  # 헤더/본문 두 번 쓰기에서 지연 ACK(약 40ms) 대기 없음
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict | None = None) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parts = urllib.parse.urlsplit(self.path)
+                with stub._lock:
+                    stub.requests.append((self.path, self.client_address[1]))
+                if parts.path == "/v2/local/search/address.json":
+                    query = urllib.parse.parse_qs(parts.query)["query"][0]
+                    h = zlib.crc32(query.encode("utf-8")) % 1000 / 10000
+                    return self._send(200, {"documents": [{"x": str(127.0 + h), "y": str(37.5 + h)}]})
+                if parts.path in ("/v1/directions", "/v1/future/directions"):
+                    stub.release.wait(10)
+                    with stub._lock:
+                        failing = stub.fail > 0
+                        if failing:
+                            stub.fail -= 1
+                    if failing:
+                        headers = {"Retry-After": stub.retry_after} if stub.retry_after is not None else {}
+                        return self._send(stub.fail_status, {"msg": "stub error"}, headers)
+                    return self._send(200, {"routes": [{"summary": {"duration": stub.duration}}]})
+                self._send(404, {})
+
+        return Handler
@@ -0,0 +1,213 @@
+# v3.39 이전(셀 단위 iloc/iterrows) 스케줄 파서 — 열 단위 파서(app/importer.py) 회귀 테스트 기준
+# 동작 비교용이므로 수정하지 말 것(첫 시트만 읽음)
+from __future__ import annotations
+
+from typing import List
+
+def load_schedules_from_excel(file_path: str) -> List[dict]:
+    """엑셀에서 스케줄 리스트를 로드합니다.
+
+    지원 포맷
+    1) 날짜 블록 포맷(예시 업로드 파일)
+       - 날짜 행: "26년 02월 08일 (일)" 같은 문자열이 첫 컬럼에 존재
+       - 그 아래 헤더: 웨딩홀 / 시간 / 촬영자(메인) / 촬영자(서브) / 촬영시간(선택)
+    2) 기존 표준 포맷(열 기반: G=예식일, H=예식시간, J=웨딩홀, C=커플, F=촬영자)
+
+    규칙
+    - 촬영시간(촬영시작시간)이 비어있으면: 예식시간 - 1시간
+    - 도착목표시간은: 촬영시작시간 - 30분
+    """
+    import pandas as pd
+    from datetime import datetime, date, timedelta
+    import re
+
+    def parse_ymd_kr(s: str) -> date | None:
+        if s is None:
+            return None
+        s = str(s)
+        m = re.search(r"(\d{2})년\s*(\d{1,2})월\s*(\d{1,2})일", s)
+        if not m:
+            return None
+        yyyy = 2000 + int(m.group(1))
+        mm = int(m.group(2))
+        dd = int(m.group(3))
+        try:
+            return date(yyyy, mm, dd)
+        except Exception:
+            return None
+
+    def parse_time_hhmm(s: str):
+        s = (s or "").strip()
+        if not s:
+            return None
+        # excel time objects can come as datetime.time in pandas; handle outside
+        try:
+            return datetime.strptime(s, "%H:%M").time()
+        except Exception:
+            return None
+
+    def compute_shoot_and_arrival(wedding_time, shoot_start):
+        if shoot_start is None and wedding_time is not None:
+            shoot_start = (datetime.combine(date.today(), wedding_time) - timedelta(hours=1)).time()
+        arrival_target = None
+        if shoot_start is not None:
+            arrival_target = (datetime.combine(date.today(), shoot_start) - timedelta(minutes=30)).time()
+        return shoot_start, arrival_target
+
+    # ------------- 먼저 날짜 블록 포맷을 시도 (header=None으로 첫 줄 날짜 유지) -------------
+    try:
+        df_raw = pd.read_excel(file_path, header=None)
+    except Exception:
+        df_raw = None
+
+    rows: List[dict] = []
+
+    if df_raw is not None and len(df_raw.columns) >= 2:
+        # 첫 20행 안에 날짜 패턴이 있으면 날짜 블록 포맷으로 간주
+        has_date = False
+        for i in range(min(20, len(df_raw))):
+            d = parse_ymd_kr(df_raw.iloc[i, 0])
+            if d:
+                has_date = True
+                break
+
+        if has_date:
+            current_date = None
+            for i in range(len(df_raw)):
+                c0 = df_raw.iloc[i, 0] if len(df_raw.columns) > 0 else None
+
+                d = parse_ymd_kr(c0)
+                if d:
+                    current_date = d
+                    continue
+
+                # 헤더 스킵(병합/줄바꿈 때문에 공백이 섞일 수 있어 contains로 처리)
+                if isinstance(c0, str) and "웨딩홀" in c0:
+                    continue
+
+                if current_date is None:
+                    continue
+
+                venue_cell = df_raw.iloc[i, 0] if len(df_raw.columns) > 0 else None
+                time_cell  = df_raw.iloc[i, 1] if len(df_raw.columns) > 1 else None
+                main_cell  = df_raw.iloc[i, 2] if len(df_raw.columns) > 2 else None
+                sub_cell   = df_raw.iloc[i, 3] if len(df_raw.columns) > 3 else None
+                shoot_cell = df_raw.iloc[i, 4] if len(df_raw.columns) > 4 else None  # 촬영시간(선택)
+
+                if pd.isna(venue_cell) and pd.isna(time_cell) and pd.isna(main_cell) and pd.isna(sub_cell):
+                    continue
+                if pd.isna(venue_cell):
+                    continue
+
+                venue_raw = str(venue_cell).strip()
+                if not venue_raw:
+                    continue
+
+                venue_name = venue_raw.split("\n")[0].strip()
+                venue_addr = None
+                maddr = re.search(r"\((.+)\)", venue_raw.replace("\n", " "))
+                if maddr:
+                    venue_addr = maddr.group(1).strip()
+
+                wedding_time = None
+                couple = None
+                if not pd.isna(time_cell):
+                    parts = str(time_cell).splitlines()
+                    if parts:
+                        wedding_time = parse_time_hhmm(parts[0].strip())
+                        if len(parts) > 1:
+                            couple = " ".join([p.strip() for p in parts[1:] if p.strip()]) or None
+
+                main_name = (str(main_cell).strip() if not pd.isna(main_cell) else "") or None
+                sub_name  = (str(sub_cell).strip() if not pd.isna(sub_cell) else "") or None
+
+                # 촬영시작시간: 엑셀에서 time 객체로 들어올 수 있음
+                shoot_start = None
+                if shoot_cell is not None and not pd.isna(shoot_cell):
+                    # pandas가 time/datetime로 읽어올 수 있음
+                    if hasattr(shoot_cell, "hour") and hasattr(shoot_cell, "minute"):
+                        try:
+                            shoot_start = shoot_cell
+                            # datetime.time인 경우 그대로 OK
+                            if hasattr(shoot_start, "time"):
+                                shoot_start = shoot_start.time()
+                        except Exception:
+                            shoot_start = None
+                    else:
+                        shoot_start = parse_time_hhmm(str(shoot_cell))
+
+                shoot_start, arrival_target = compute_shoot_and_arrival(wedding_time, shoot_start)
+
+                raw_photographers = " ".join([x for x in [main_name, sub_name] if x]) if (main_name or sub_name) else ""
+                rows.append({
+                    "wedding_date": current_date,
+                    "wedding_time": wedding_time,
+                    "shoot_start_time": shoot_start,
+                    "arrival_target_time": arrival_target,
+                    "venue": venue_name,
+                    "venue_address": venue_addr,
+                    "couple": couple,
+                    "main_name": main_name,
+                    "sub_name": sub_name,
+                    "raw_photographers": raw_photographers,
+                })
+            return rows
+
+    # ------------- 기존 포맷(열 기반) -------------
+    df = pd.read_excel(file_path)
+    for _, row in df.iterrows():
+        wedding_date = row.iloc[6] if len(row) > 6 else None  # G
+        wedding_time = row.iloc[7] if len(row) > 7 else None  # H
+        couple = row.iloc[2] if len(row) > 2 else None        # C
+        photographers_raw = row.iloc[5] if len(row) > 5 else None  # F
+        venue = row.iloc[9] if len(row) > 9 else None         # J
+
+        if pd.isna(venue) or pd.isna(wedding_date):
+            continue
+
+        wdate = None
+        if hasattr(wedding_date, "date"):
+            try:
+                wdate = wedding_date.date()
+            except Exception:
+                wdate = None
+        if not wdate:
+            try:
+                wdate = pd.to_datetime(wedding_date).date()
+            except Exception:
+                wdate = None
+        if not wdate:
+            continue
+
+        wtime = None
+        if hasattr(wedding_time, "time"):
+            try:
+                wtime = wedding_time.time()
+            except Exception:
+                wtime = None
+        if wtime is None and wedding_time is not None and not pd.isna(wedding_time):
+            wtime = parse_time_hhmm(str(wedding_time))
+
+        venue_name = str(venue).strip()
+        couple_str = None if pd.isna(couple) else str(couple).strip()
+
+        raw = "" if photographers_raw is None or pd.isna(photographers_raw) else str(photographers_raw).strip()
+        names = [x for x in re.split(r"[\s,]+", raw) if x]
+        main_name = names[0] if len(names) >= 1 else None
+        sub_name = names[1] if len(names) >= 2 else None
+
+        shoot_start, arrival_target = compute_shoot_and_arrival(wtime, None)
+
+        rows.append({
+            "wedding_date": wdate,
+            "wedding_time": wtime,
+            "shoot_start_time": shoot_start,
+            "arrival_target_time": arrival_target,
+            "venue": venue_name,
+            "couple": couple_str or None,
+            "main_name": main_name,
+            "sub_name": sub_name,
+            "raw_photographers": raw,
+        })
+
+    return rows
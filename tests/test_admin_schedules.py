@@ -0,0 +1,42 @@
+from datetime import date, time
+
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.models import Schedule
+
+
+def add_schedule(**values) -> int:
+    with Session(engine) as session:
+        s = Schedule(**values)
+        session.add(s)
+        session.commit()
+        return s.id
+
+
+def test_edit_to_duplicate_schedule_shows_error(login):
+    # 시간만 다른 두 스케줄 → 한 쪽을 다른 쪽 시간으로 바꾸면 uq_schedule_import_key 충돌
+    common = dict(wedding_date=date(2026, 6, 6), venue="중복홀", couple="홍길동/성춘향", main_name="중복작가")
+    add_schedule(wedding_time=time(11, 0), **common)
+    sid = add_schedule(wedding_time=time(13, 0), **common)
+
+    admin = login()
+    resp = admin.post(f"/admin/schedules/{sid}/edit", data={
+        "wedding_date": "2026-06-06", "wedding_time": "11:00", "venue": "중복홀",
+        "couple": "홍길동/성춘향", "main_name": "중복작가",
+    }, follow_redirects=False)
+    assert resp.status_code == 400
+    assert "같은 스케줄이 이미 있습니다" in resp.text
+
+    with Session(engine) as session:
+        assert session.get(Schedule, sid).wedding_time == time(13, 0)
+        assert len(session.exec(select(Schedule).where(Schedule.venue == "중복홀")).all()) == 2
+
+    # 겹치지 않는 수정은 그대로 저장
+    resp = admin.post(f"/admin/schedules/{sid}/edit", data={
+        "wedding_date": "2026-06-06", "wedding_time": "14:00", "venue": "중복홀",
+        "couple": "홍길동/성춘향", "main_name": "중복작가",
+    }, follow_redirects=False)
+    assert resp.status_code == 302
+    with Session(engine) as session:
+        assert session.get(Schedule, sid).wedding_time == time(14, 0)
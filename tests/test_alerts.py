@@ -0,0 +1,117 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+from sqlmodel import Session, SQLModel
+
+from app import alerts
+from app.db import make_engine
+from app.models import Checkin, GeocodeCache, Photographer, Schedule, TravelTime
+from app.travel_times import normalize_address
+
+# evaluate_alerts는 스케줄 수와 무관하게 고정된 몇 번의 일괄 쿼리(N+1 없음)
+
+NOW = datetime(2026, 5, 2, 6, 0)
+
+
+class NoRouteWorker:
+    """알림 평가가 넣는 이동시간 계산 작업은 버림(네트워크/전역 워커 사용 안 함)"""
+
+    def submit(self, *args, **kwargs) -> bool:
+        return False
+
+    def is_pending(self, *args, **kwargs) -> bool:
+        return False
+
+
+@pytest.fixture(autouse=True)
+def no_route_worker(monkeypatch):
+    monkeypatch.setattr(alerts, "route_worker", NoRouteWorker())
+
+
+def seeded_engine(path, n: int):
+    """작가 20명, 스케줄 n개(메인+서브), 절반은 체크, 이동시간 표/좌표는 일부만"""
+    eng = make_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(eng)
+    with eng.begin() as conn:
+        conn.execute(insert(Photographer), [
+            {"id": i, "name": f"작가{i}", "status": "활성", "username": f"p{i}", "password_hash": "x",
+             "is_admin": False, "address": f"서울 작가동 {i}"}
+            for i in range(1, 21)
+        ])
+        venues = [f"서울 웨딩로 {v}" for v in range(10)]
+        conn.execute(insert(GeocodeCache), [
+            {"address": normalize_address(a), "lat": 37.5 + k * 0.01, "lon": 127.0 + k * 0.01, "fetched_at": NOW}
+            for k, a in enumerate([f"서울 작가동 {i}" for i in range(1, 21)] + venues)
+        ])
+        conn.execute(insert(TravelTime), [
+            {"origin": normalize_address(f"서울 작가동 {i}"), "destination": normalize_address(venues[i % 10]),
+             "bucket": "", "minutes": 40, "computed_at": NOW}
+            for i in range(1, 21, 2)
+        ])
+        schedules, checkins = [], []
+        for k in range(n):
+            main_id, sub_id = k % 20 + 1, (k + 7) % 20 + 1
+            schedules.append({
+                "id": k + 1, "wedding_date": NOW.date() + timedelta(days=k % 7), "wedding_time": time(11 + k % 6, 0),
+                "venue": f"웨딩홀{k % 10}", "venue_address": venues[k % 10], "couple": f"커플{k}",
+                "main_name": f"작가{main_id}", "sub_name": f"작가{sub_id}",
+                "main_photographer_id": main_id, "sub_photographer_id": sub_id, "created_at": NOW,
+            })
+            if k % 2:
+                checkins.append({
+                    "schedule_id": k + 1, "photographer_id": main_id, "photographer_name": f"작가{main_id}",
+                    "wake_time": NOW, "depart_time": NOW, "created_at": NOW, "updated_at": NOW,
+                })
+        conn.execute(insert(Schedule), schedules)
+        conn.execute(insert(Checkin), checkins)
+    return eng
+
+
+def count_queries(eng) -> tuple[int, int]:
+    """(SQL 실행 수, 알림 행 수) — 오프라인 모델 적합(프로세스당 1번)이 섞이지 않게 1번 미리 실행 후 측정"""
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with Session(eng) as session:
+        alerts.evaluate_alerts(session, NOW)
+    event.listen(eng, "before_cursor_execute", on_execute)
+    try:
+        with Session(eng) as session:
+            rows = alerts.evaluate_alerts(session, NOW)
+    finally:
+        event.remove(eng, "before_cursor_execute", on_execute)
+    return len(statements), len(rows)
+
+
+def test_evaluate_alerts_query_count_constant(tmp_path):
+    counts = {}
+    for n in (10, 100, 1000):
+        eng = seeded_engine(tmp_path / f"{n}.db", n)
+        try:
+            queries, rows = count_queries(eng)
+        finally:
+            eng.dispose()
+        assert rows == 2 * n
+        counts[n] = queries
+    # 스케줄 1 + 작가 1 + 체크 1 + 이동시간 표 1 + 좌표 1
+    assert counts[10] == counts[100] == counts[1000] == 5, counts
+
+
+def test_offline_estimate_when_only_other_day_class(tmp_path):
+    # 토요일 스케줄인데 이 쌍의 이동시간은 일요일 시간대 값만 있음 → 고를 값이 없으므로 오프라인 추정
+    eng = seeded_engine(tmp_path / "app.db", 2)
+    with eng.begin() as conn:
+        conn.execute(insert(TravelTime).values(
+            origin=normalize_address("서울 작가동 8"), destination=normalize_address("서울 웨딩로 0"),
+            bucket="sun-0900", minutes=25, computed_at=NOW,
+        ))
+    try:
+        with Session(eng) as session:
+            rows = alerts.evaluate_alerts(session, NOW)
+    finally:
+        eng.dispose()
+    sources = {r["role"]: (r["travel_source"], r["travel_mins"]) for r in rows if r["schedule"].id == 1}
+    assert sources["서브"][0] == "offline" and sources["서브"][1] is not None, sources
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import time as timer
+from datetime import date, datetime, time
+
+import pandas as pd
+import pytest
+from sqlmodel import Session, select
+
+from app import offload
+from app.assignments import assign
+from app.auth import hash_password
+from app.db import engine
+from app.import_jobs import import_jobs
+from app.main import check_arrive
+from app.models import Checkin, Photographer, Schedule
+
+DAY = date(2026, 7, 4)
+
+
+@pytest.fixture(scope="module")
+def photographer(app_client):
+    """체크 테스트용 작가 1명 + 같은 날 스케줄 3개(2개는 같은 홀)"""
+    with Session(engine) as session:
+        p = Photographer(name="체크작가", username="checker", password_hash=hash_password("pw"), status="활성")
+        session.add(p)
+        session.commit()
+        ids = []
+        for t, venue in ((time(11, 0), "체크홀"), (time(14, 0), "체크홀"), (time(17, 0), "다른홀")):
+            s = Schedule(wedding_date=DAY, wedding_time=t, venue=venue, main_name="체크작가")
+            assign(session, s)
+            session.commit()
+            ids.append(s.id)
+        return p.id, ids
+
+
+def checkins(photographer_id: int) -> dict[int, Checkin]:
+    with Session(engine) as session:
+        rows = session.exec(select(Checkin).where(Checkin.photographer_id == photographer_id)).all()
+        return {c.schedule_id: c for c in rows}
+
+
+def p99(samples: list[float]) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+def big_workbook(path, n: int) -> None:
+    """열 기반 포맷(C=커플, F=촬영자, G=예식일, H=예식시간, J=웨딩홀) n행, 모두 가져올 수 있는 행"""
+    rows = [
+        [None, None, f"신랑{i}&신부{i}", None, None, f"부하작가{i % 50} 부하서브{i % 30}",
+         datetime(2026, 8, 1 + i % 28), datetime(2026, 8, 1, 10 + i % 8, 0), None, f"부하홀{i % 40}"]
+        for i in range(n)
+    ]
+    pd.DataFrame(rows, columns=list("ABCDEFGHIJ")).to_excel(path, index=False)
+
+
+def test_check_arrive_is_sync_handler():
+    # 사진 복사/정리/DB 작업은 스레드풀에서(이벤트 루프를 막지 않음)
+    assert not asyncio.iscoroutinefunction(check_arrive)
+
+
+def test_check_arrive_marks_same_venue_group(login, photographer):
+    pid, (first, second, other) = photographer
+    client = login("checker", "pw")
+    resp = client.post(
+        "/check/arrive",
+        data={"schedule_id": str(first)},
+        files={"photo": ("arrive.jpg", b"\xff\xd8\xff" + os.urandom(4096), "image/jpeg")},
+        follow_redirects=False,
+    )
+    assert resp.status_code == 302
+
+    rows = checkins(pid)
+    assert {first, second} <= set(rows) and other not in rows
+    for sid in (first, second):
+        c = rows[sid]
+        assert c.wake_time and c.depart_time and c.arrive_time
+        assert c.arrive_photo_path == rows[first].arrive_photo_path
+    name = rows[first].arrive_photo_path.rsplit("/", 1)[-1]
+    assert os.path.exists(os.path.join(os.environ["UPLOAD_DIR"], name))
+
+    # 허용하지 않는 확장자는 저장 안 함
+    resp = client.post(
+        "/check/arrive",
+        data={"schedule_id": str(other)},
+        files={"photo": ("x.exe", b"MZ", "application/octet-stream")},
+        follow_redirects=False,
+    )
+    assert resp.status_code == 302
+    assert other not in checkins(pid)
+
+
+def test_check_wake_p99_during_large_import(login, photographer, tmp_path, monkeypatch):
+    # 1만 행 스케줄 가져오기가 도는 동안에도 기상 체크 p99가 평소 수준(v3.44 이전: 약 2.6초)
+    pid, (first, _, _) = photographer
+    monkeypatch.setattr(offload, "IMPORT_PROCESSES", 1)  # 운영처럼 파싱은 프로세스 풀에서
+    path = tmp_path / "big.xlsx"
+    big_workbook(path, 10_000)
+
+    client = login("checker", "pw")
+    admin = login()
+
+    def wake() -> float:
+        t = timer.perf_counter()
+        resp = client.post("/check/wake", data={"schedule_id": str(first)}, follow_redirects=False)
+        assert resp.status_code == 302
+        return timer.perf_counter() - t
+
+    idle = [wake() for _ in range(30)]
+
+    with open(path, "rb") as f:
+        resp = admin.post("/admin/schedules/import", files={"file": ("big.xlsx", f)}, follow_redirects=False)
+    assert resp.status_code == 302
+    job = import_jobs.get(resp.headers["location"].split("job=")[1])
+
+    busy = []
+    deadline = timer.monotonic() + 120
+    while not job.finished and timer.monotonic() < deadline:
+        busy.append(wake())
+    assert job.status == "done", job.errors
+    assert (job.parsed, job.inserted) == (10_000, 10_000)
+    assert len(busy) >= 10
+
+    # 루프가 막히면 가져오기 전체 시간(초 단위)만큼 늦어짐. 저장 스레드와 CPU를 나눠 쓰는 만큼만 허용
+    # (CPU 1개 환경: 평소 p99 약 30ms, 가져오는 중 약 140ms)
+    assert p99(busy) < max(0.5, 10 * p99(idle)), (p99(idle), p99(busy), len(busy))
+    assert checkins(pid)[first].wake_time is not None
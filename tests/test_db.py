@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from app.db import make_engine
+
+# SQLite 운영 설정(v3.49/v3.50): WAL/busy_timeout pragma, 읽기 전용 복제본 엔진은 쓰기 거부, 동시 쓰기도 잠금 오류 없음
+
+
+@pytest.fixture
+def url(tmp_path):
+    return f"sqlite:///{tmp_path / 'app.db'}"
+
+
+def pragma(conn, name):
+    return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_sqlite_pragmas(url):
+    eng = make_engine(url)
+    try:
+        with eng.connect() as conn:
+            assert pragma(conn, "journal_mode") == "wal"
+            assert pragma(conn, "busy_timeout") == db.SQLITE_BUSY_TIMEOUT_MS
+            assert pragma(conn, "synchronous") == 1  # NORMAL
+            assert pragma(conn, "cache_size") == -db.SQLITE_CACHE_MB * 1024
+            assert pragma(conn, "temp_store") == 2  # MEMORY
+            assert pragma(conn, "query_only") == 0
+        assert eng.pool.size() == db.DB_POOL_SIZE
+        assert eng.pool._max_overflow == db.DB_MAX_OVERFLOW
+    finally:
+        eng.dispose()
+
+
+def test_read_engine_rejects_writes(url):
+    writer = make_engine(url)
+    reader = make_engine(url, read_only=True)
+    try:
+        with writer.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+            conn.exec_driver_sql("INSERT INTO t (v) VALUES ('a')")
+        with reader.connect() as conn:
+            assert pragma(conn, "query_only") == 1
+            assert conn.exec_driver_sql("SELECT v FROM t").scalars().all() == ["a"]
+            with pytest.raises(OperationalError, match="readonly"):
+                conn.exec_driver_sql("INSERT INTO t (v) VALUES ('b')")
+        with writer.connect() as conn:
+            assert conn.exec_driver_sql("SELECT count(*) FROM t").scalar() == 1
+    finally:
+        reader.dispose()
+        writer.dispose()
+
+
+def test_concurrent_writes_wait_instead_of_failing(url):
+    # 체크인 몰림: 스레드 여러 개가 짧은 쓰기 트랜잭션을 동시에 → busy_timeout으로 기다렸다가 모두 성공
+    # 읽기(WAL)는 쓰는 중에도 막히지 않음
+    eng = make_engine(url)
+    threads, writes = 16, 50
+    with eng.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE checkin (id INTEGER PRIMARY KEY, worker INTEGER, n INTEGER)")
+    errors = []
+    start = threading.Barrier(threads + 1)
+
+    def write(worker):
+        start.wait()
+        try:
+            for n in range(writes):
+                with eng.begin() as conn:
+                    conn.execute(text("INSERT INTO checkin (worker, n) VALUES (:w, :n)"), {"w": worker, "n": n})
+        except Exception as exc:  # pragma: no cover - 실패 시 메시지 확인용
+            errors.append(exc)
+
+    def read():
+        start.wait()
+        try:
+            for _ in range(writes):
+                with eng.connect() as conn:
+                    conn.exec_driver_sql("SELECT count(*) FROM checkin").scalar()
+        except Exception as exc:  # pragma: no cover
+            errors.append(exc)
+
+    workers = [threading.Thread(target=write, args=(w,)) for w in range(threads - 1)] + [threading.Thread(target=read)]
+    try:
+        for t in workers:
+            t.start()
+        start.wait()
+        for t in workers:
+            t.join()
+        assert errors == []
+        with eng.connect() as conn:
+            assert conn.exec_driver_sql("SELECT count(*) FROM checkin").scalar() == (threads - 1) * writes
+    finally:
+        eng.dispose()
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from app.http_client import HTTPStatusError, PooledHTTPClient
+
+# keep-alive 연결 재사용 / 429·5xx 재시도 / Retry-After 상한 / 재사용 연결 timeout (스텁 서버)
+
+GEOCODE = "/v2/local/search/address.json?query=%EC%84%9C%EC%9A%B8"
+DIRECTIONS = "/v1/directions?origin=1,2&destination=3,4"
+
+
+@pytest.fixture
+def client():
+    c = PooledHTTPClient(retries=3, backoff=0.01)
+    yield c
+    c.close()
+
+
+def ports(stub, prefix):
+    return [port for path, port in stub.requests if path.startswith(prefix)]
+
+
+def test_keepalive_reuses_one_connection(kakao_stub, client):
+    for _ in range(20):
+        assert client.get_json(kakao_stub.url + GEOCODE)["documents"]
+    assert len(ports(kakao_stub, "/v2/")) == 20
+    assert len(set(ports(kakao_stub, "/v2/"))) == 1
+
+
+def test_retries_5xx_then_succeeds(kakao_stub, client):
+    kakao_stub.fail, kakao_stub.retry_after = 2, "0"
+    data = client.get_json(kakao_stub.url + DIRECTIONS)
+    assert data["routes"][0]["summary"]["duration"] == kakao_stub.duration
+    assert len(kakao_stub.directions()) == 3
+    assert len(set(ports(kakao_stub, "/v1/"))) == 1  # 오류 응답 뒤에도 같은 연결
+
+
+def test_gives_up_after_retries(kakao_stub, client):
+    kakao_stub.fail = 10
+    with pytest.raises(HTTPStatusError) as exc:
+        client.get_json(kakao_stub.url + DIRECTIONS)
+    assert exc.value.status == 503
+    assert len(kakao_stub.directions()) == 1 + client.retries
+
+
+def test_no_retry_for_4xx(kakao_stub, client):
+    kakao_stub.fail, kakao_stub.fail_status = 1, 400
+    with pytest.raises(HTTPStatusError):
+        client.get_json(kakao_stub.url + DIRECTIONS)
+    assert len(kakao_stub.directions()) == 1
+
+
+def test_retry_after_is_capped(kakao_stub):
+    client = PooledHTTPClient(retries=1, max_retry_delay=0.05)
+    kakao_stub.fail, kakao_stub.fail_status, kakao_stub.retry_after = 1, 429, "3600"
+    t = time.perf_counter()
+    assert client.get_json(kakao_stub.url + DIRECTIONS)["routes"]
+    assert time.perf_counter() - t < 2
+    client.close()
+
+
+def test_reused_connection_uses_request_timeout(kakao_stub, client):
+    client.get_json(kakao_stub.url + DIRECTIONS, timeout=10)  # 연결은 timeout=10으로 열림
+    kakao_stub.hold()
+    t = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        client.get_json(kakao_stub.url + DIRECTIONS, timeout=0.2)
+    assert time.perf_counter() - t < 2
+    assert len(set(ports(kakao_stub, "/v1/"))) == 1  # 같은(재사용) 연결에서 시간 초과
+
+
+def test_benchmark_keepalive_vs_new_connections(kakao_stub, client):
+    # 마이크로 벤치마크: 같은 요청 200번 — 연결 풀 재사용 vs 매번 새 연결(Connection: close)
+    n = 200
+    url = kakao_stub.url + GEOCODE
+    client.get_json(url)
+
+    t = time.perf_counter()
+    for _ in range(n):
+        client.get_json(url)
+    pooled = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for _ in range(n):
+        client.get_json(url, headers={"Connection": "close"})
+    fresh = time.perf_counter() - t
+
+    assert len(set(ports(kakao_stub, "/v2/"))) == n  # close 요청마다 새 연결(첫 요청은 풀 연결)
+    print(f"keep-alive {pooled / n * 1000:.2f}ms/req, new connection {fresh / n * 1000:.2f}ms/req")
+    assert pooled < fresh
@@ -0,0 +1,112 @@
+import random
+import time as timer
+from datetime import date, datetime, time
+
+import pandas as pd
+import pytest
+
+from app import importer
+
+from . import reference_importer
+
+# 열 단위 파서(v3.39)가 셀 단위 기준 파서와 같은 행 dict(값/키 순서)를 내는지 무작위 워크북으로 비교
+SEEDS = range(20)
+
+
+def block_workbook(path, n: int) -> None:
+    """날짜 블록 포맷: 날짜 행/헤더 행/잘못된 날짜/줄바꿈 시간 칸/섞인 타입"""
+    rows = [["잡음", None, None, None, None]]
+    d = date(2026, 2, 7)
+    for i in range(n):
+        if i % 15 == 0:
+            d = date.fromordinal(d.toordinal() + 1)
+            rows.append([f"{d:%y}년 {d.month:02d}월 {d.day:02d}일 (토)", None, None, None, None])
+            rows.append(["웨딩홀", "시간", "촬영자(메인)", "촬영자(서브)", "촬영시간"])
+        venue = random.choice(["더채플\n(서울 강남구 1)", " 라움 ", "홀A (주소 (괄호))", "", None, "26년 02월 30일 잘못", 123])
+        tcell = random.choice([
+            "11:00\n김철수\n\n 이영희 ", "9:5", "24:00", "11:00", None, time(11, 0), "\n신랑", "13:30\r\n커플", "  10:30  \n a  b ",
+        ])
+        main = random.choice(["홍길동", " ", None, "김", 7.0])
+        sub = random.choice([None, "박", "  이  "])
+        shoot = random.choice([None, None, time(10, 15, 30), "9:40", "x", datetime(2026, 1, 1, 8, 0)])
+        rows.append([venue, tcell, main, sub, shoot])
+    pd.DataFrame(rows).to_excel(path, header=False, index=False)
+
+
+def column_workbook(path, n: int, mixed: bool) -> None:
+    """열 기반 포맷(G=예식일, H=예식시간, J=웨딩홀, C=커플, F=촬영자). mixed면 날짜/시간 열에 문자열/빈칸 섞음"""
+    rows = []
+    for i in range(n):
+        if mixed:
+            wd = random.choice([datetime(2026, 3, 2), "2026-03-04", None, "bad"])
+            wt = random.choice(["11:00", time(12, 0), None, "x", datetime(2026, 1, 1, 9, 30)])
+        else:
+            wd = datetime(2026, 3, 1 + i % 28)
+            wt = random.choice([datetime(2026, 3, 1, 11, 0), None])
+        rows.append([
+            None, None, random.choice(["A&B", None, " ", "c"]), None, None,
+            random.choice(["홍 김", ",박", None, "이,최  정", 3]), wd, wt, None, random.choice(["홀", None, " 홀2 "]),
+        ])
+    pd.DataFrame(rows, columns=list("ABCDEFGHIJ")).to_excel(path, index=False)
+
+
+WORKBOOKS = {
+    "block": lambda path: block_workbook(path, 300),
+    "columns": lambda path: column_workbook(path, 200, mixed=False),
+    "mixed": lambda path: column_workbook(path, 200, mixed=True),
+}
+
+
+def test_single_photographer_columns(tmp_path):
+    # 어느 행에도 서브 작가가 없으면 sub_name은 NaN이 아니라 None
+    path = tmp_path / "single.xlsx"
+    rows = [[None, None, "A", None, None, name, datetime(2026, 3, 2), None, None, "홀"] for name in ("홍길동", None, "김")]
+    pd.DataFrame(rows, columns=list("ABCDEFGHIJ")).to_excel(path, index=False)
+
+    parsed = importer.load_schedules_from_excel(str(path))
+
+    assert parsed == reference_importer.load_schedules_from_excel(str(path))
+    assert [r["sub_name"] for r in parsed] == [None, None, None]
+    assert [r["main_name"] for r in parsed] == ["홍길동", None, "김"]
+
+
+@pytest.mark.parametrize("kind", list(WORKBOOKS))
+@pytest.mark.parametrize("seed", SEEDS)
+def test_matches_reference_parser(tmp_path, kind, seed):
+    random.seed(seed)
+    path = tmp_path / f"{kind}.xlsx"
+    WORKBOOKS[kind](path)
+
+    expected = reference_importer.load_schedules_from_excel(str(path))
+    rows = importer.load_schedules_from_excel(str(path))
+
+    assert expected, "fixture should produce rows"
+    assert rows == expected
+    assert [list(r) for r in rows] == [list(r) for r in expected]
+
+
+@pytest.mark.parametrize("kind", ["block", "columns"])
+def test_parse_20k_rows_timed(tmp_path, monkeypatch, kind):
+    # 2만 행 워크북: 파싱(엑셀 읽기 제외)만 재서 기준 파서보다 충분히 빠른지(v3.39 약 8배), 결과는 같은지
+    random.seed(0)
+    path = tmp_path / f"{kind}.xlsx"
+    if kind == "block":
+        block_workbook(path, 20_000)
+    else:
+        column_workbook(path, 20_000, mixed=False)
+    raw = pd.read_excel(path, header=None)
+    frames = {None: raw, 0: importer._promote_header(raw.copy())}  # 0: pd.read_excel(header=0)과 같음
+
+    t = timer.perf_counter()
+    rows = importer._parse_sheet(frames[None].copy())
+    vectorized = timer.perf_counter() - t
+
+    monkeypatch.setattr(pd, "read_excel", lambda _path, header=0: frames[header].copy())
+    t = timer.perf_counter()
+    expected = reference_importer.load_schedules_from_excel(str(path))
+    per_cell = timer.perf_counter() - t
+
+    assert len(rows) > 10_000
+    assert rows == expected
+    assert vectorized < 5, vectorized
+    assert per_cell > 3 * vectorized, (per_cell, vectorized)
@@ -0,0 +1,85 @@
+import random
+from datetime import datetime, time
+
+import pandas as pd
+import pytest
+
+from app import importer
+
+from . import reference_importer
+from .test_importer_parser import WORKBOOKS
+
+# 스트리밍(openpyxl read_only) 경로가 pandas 경로와 같은 행을 내는지: 크기/'대용량' 체크와 상관없이 같은 가져오기 키
+
+
+def numeric_column_workbook(path) -> None:
+    # 빈 칸이 섞인 숫자 열: pandas는 float64(101.0), openpyxl은 int(101)로 읽음
+    rows = [
+        [None, None, couple, None, None, names, datetime(2026, 3, 2), time(11, 0), None, venue]
+        for couple, names, venue in ((101, 202, 303), (None, None, 304), (102.5, 203, 305))
+    ]
+    pd.DataFrame(rows, columns=list("ABCDEFGHIJ")).to_excel(path, index=False)
+
+
+def numeric_block_workbook(path) -> None:
+    rows = [["26년 03월 02일 (월)", None, None, None], ["웨딩홀", "시간", "메인", "서브"]]
+    rows += [[11, "11:00", 5, None], [12.0, "12:00\n7", None, 7], [13, None, 6.0, 8]]
+    pd.DataFrame(rows).to_excel(path, header=False, index=False)
+
+
+def assert_same(path) -> list[dict]:
+    rows = importer.load_schedules_from_excel(str(path))
+    streamed = list(importer.iter_schedules_from_excel(str(path)))
+    assert streamed == rows
+    return rows
+
+
+def test_numeric_cells_columns(tmp_path):
+    path = tmp_path / "numeric_columns.xlsx"
+    numeric_column_workbook(path)
+
+    rows = assert_same(path)
+
+    assert [(r["venue"], r["couple"], r["main_name"]) for r in rows] == [
+        ("303", "101", "202"), ("304", None, None), ("305", "102.5", "203"),
+    ]
+
+
+def test_numeric_cells_block(tmp_path):
+    path = tmp_path / "numeric_block.xlsx"
+    numeric_block_workbook(path)
+
+    rows = assert_same(path)
+
+    assert [(r["venue"], r["main_name"], r["sub_name"]) for r in rows] == [
+        ("11", "5", None), ("12", None, "7"), ("13", "6", "8"),
+    ]
+
+
+def test_integer_floats_written_as_int(tmp_path):
+    # v3.41에서 바뀐 동작: 정수값 실수 셀은 "101.0"이 아니라 "101"(v3.39 기준 파서는 "101.0")
+    path = tmp_path / "numeric_columns.xlsx"
+    numeric_column_workbook(path)
+
+    old = reference_importer.load_schedules_from_excel(str(path))
+    new = importer.load_schedules_from_excel(str(path))
+
+    assert [(r["couple"], r["main_name"], r["raw_photographers"]) for r in old] == [
+        ("101.0", "202.0", "202.0"), (None, None, ""), ("102.5", "203.0", "203.0"),
+    ]
+    assert [(r["couple"], r["main_name"], r["raw_photographers"]) for r in new] == [
+        ("101", "202", "202"), (None, None, ""), ("102.5", "203", "203"),
+    ]
+    # 그 밖의 필드는 같음
+    strip = lambda r: {k: v for k, v in r.items() if k not in ("couple", "main_name", "raw_photographers")}
+    assert [strip(r) for r in new] == [strip(r) for r in old]
+
+
+@pytest.mark.parametrize("kind", list(WORKBOOKS))
+@pytest.mark.parametrize("seed", range(5))
+def test_stream_matches_pandas(tmp_path, kind, seed):
+    random.seed(seed)
+    path = tmp_path / f"{kind}.xlsx"
+    WORKBOOKS[kind](path)
+
+    assert assert_same(path)
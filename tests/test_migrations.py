@@ -0,0 +1,197 @@
+import shutil
+import sqlite3
+from datetime import date, datetime, time
+
+import pytest
+from sqlalchemy import func, inspect
+from sqlmodel import Session, SQLModel, select
+
+from app import importer
+from app.db import make_engine
+from app.migrations import MIGRATIONS, has_column, upgrade
+from app.models import Checkin, Photographer, SchemaMigration, Schedule, ScheduleAssignment
+from app.schedule_import import import_schedule_rows
+
+from . import reference_importer
+from .test_importer_stream import numeric_column_workbook
+
+# v3.16 이전 app.db(v3.4~v3.16 컬럼, 작가 id, 유니크 인덱스 없음, 같은 (스케줄, 작가) 체크 중복)를
+# 임시 폴더에 복사한 뒤 CLI upgrade와 같은 순서(create_all → upgrade)로 2번 실행
+
+LEGACY_SCHEMA = """
+CREATE TABLE photographer (
+    id INTEGER NOT NULL, name VARCHAR NOT NULL, status VARCHAR NOT NULL,
+    username VARCHAR NOT NULL, password_hash VARCHAR NOT NULL, is_admin BOOLEAN NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX ix_photographer_name ON photographer (name);
+CREATE UNIQUE INDEX ix_photographer_username ON photographer (username);
+CREATE TABLE schedule (
+    id INTEGER NOT NULL, wedding_date DATE NOT NULL, wedding_time TIME, venue VARCHAR NOT NULL,
+    main_name VARCHAR, created_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_schedule_wedding_date ON schedule (wedding_date);
+CREATE INDEX ix_schedule_venue ON schedule (venue);
+CREATE INDEX ix_schedule_main_name ON schedule (main_name);
+CREATE TABLE checkin (
+    id INTEGER NOT NULL, schedule_id INTEGER NOT NULL, photographer_name VARCHAR NOT NULL,
+    wake_time DATETIME, depart_time DATETIME, arrive_time DATETIME,
+    created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id), FOREIGN KEY(schedule_id) REFERENCES schedule (id)
+);
+CREATE INDEX ix_checkin_schedule_id ON checkin (schedule_id);
+CREATE INDEX ix_checkin_photographer_name ON checkin (photographer_name);
+"""
+
+CREATED = "2026-04-01 09:00:00.000000"
+
+
+@pytest.fixture(scope="module")
+def legacy_db(tmp_path_factory):
+    path = tmp_path_factory.mktemp("legacy") / "app.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany(
+        "INSERT INTO photographer VALUES (?, ?, '활성', ?, 'x', 0)",
+        [(1, "김작가", "kim"), (2, "이작가", "lee")],
+    )
+    conn.executemany(
+        "INSERT INTO schedule VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (1, "2026-05-02", "11:00:00.000000", "A홀", "김작가", CREATED),
+            (2, "2026-05-02", "14:30:00.000000", "B홀", "김작가", CREATED),
+            (3, "2026-05-03", "12:00:00.000000", "A홀", "박작가", CREATED),  # 작가 계정 없음
+            (4, "2026-05-03", None, "C홀", "이작가", CREATED),
+            (5, "2026-05-04", "10:00:00.000000", "D홀", "김작가", CREATED),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO checkin VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (1, 1, "김작가", "2026-05-02 07:00:00.000000", None, None, CREATED, "2026-05-02 07:00:00.000000"),
+            (2, 1, "김작가", "2026-05-02 07:10:00.000000", "2026-05-02 08:00:00.000000", None, CREATED,
+             "2026-05-02 08:00:00.000000"),
+            (3, 1, "김작가", None, None, "2026-05-02 09:05:00.000000", CREATED, "2026-05-02 09:05:00.000000"),
+            (4, 2, "김작가", "2026-05-02 09:00:00.000000", None, None, CREATED, "2026-05-02 09:00:00.000000"),
+            # 체크 뒤 이름이 바뀐 작가(이름으로 못 찾음)
+            (5, 1, "이작가(구)", "2026-05-02 07:20:00.000000", None, None, CREATED, "2026-05-02 07:20:00.000000"),
+            (6, 5, "옛작가", "2026-05-04 06:00:00.000000", None, None, CREATED, "2026-05-04 06:00:00.000000"),
+            (7, 4, "이작가(구)", "2026-05-03 07:00:00.000000", None, None, CREATED, "2026-05-03 07:00:00.000000"),
+            (8, 3, "박작가", "2026-05-03 07:00:00.000000", None, None, CREATED, "2026-05-03 07:00:00.000000"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def engine(legacy_db, tmp_path):
+    path = tmp_path / "app.db"
+    shutil.copy(legacy_db, path)
+    eng = make_engine(f"sqlite:///{path}")
+    yield eng
+    eng.dispose()
+
+
+def index_names(engine, table):
+    return {i["name"] for i in inspect(engine).get_indexes(table)}
+
+
+def test_upgrade_legacy_db_twice(engine):
+    SQLModel.metadata.create_all(engine)
+    # 0001까지 실행 후(서브 작가 컬럼 추가) 1/5번 스케줄에 서브 작가를 넣고 나머지 실행
+    assert [m.version for m in upgrade(engine, target=1, log=lambda _: None)] == [1]
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE schedule SET sub_name = '이작가' WHERE id IN (1, 5)")
+    ran = upgrade(engine, log=lambda _: None)
+    assert [m.version for m in ran] == sorted(m.version for m in MIGRATIONS)[1:]
+    # 다시 실행: 밀린 마이그레이션 없음, 결과 같음
+    SQLModel.metadata.create_all(engine)
+    assert upgrade(engine, log=lambda _: None) == []
+
+    # 컬럼
+    for model in (Schedule, Checkin):
+        for column in model.__table__.c:
+            assert has_column(engine, model.__tablename__, column.name), (model.__tablename__, column.name)
+    for name in ("phone", "gender", "role", "address", "region", "has_car", "start_date", "memo"):
+        assert has_column(engine, "photographer", name)
+
+    with Session(engine) as session:
+        assert set(session.exec(select(SchemaMigration.version)).all()) == {m.version for m in MIGRATIONS}
+
+        # 0002: 빈 도착목표 = 예식시간 - 2시간(알림 기본값과 같음), 촬영시작은 비워 둠
+        schedules = {s.id: s for s in session.exec(select(Schedule)).all()}
+        assert schedules[1].arrival_target_time == time(9, 0)
+        assert schedules[2].arrival_target_time == time(12, 30)
+        assert schedules[4].arrival_target_time is None
+        assert all(s.shoot_start_time is None for s in schedules.values())
+
+        # 0003: 중복 체크는 가장 먼저 만든 행에 합침(시각은 가장 이른 값, 수정시각은 가장 늦은 값)
+        checkins = session.exec(select(Checkin).order_by(Checkin.id)).all()
+        assert [(c.id, c.schedule_id, c.photographer_name) for c in checkins] == [
+            (1, 1, "김작가"), (4, 2, "김작가"), (5, 1, "이작가(구)"), (6, 5, "옛작가"), (7, 4, "이작가(구)"), (8, 3, "박작가"),
+        ]
+        merged = checkins[0]
+        assert merged.wake_time == datetime(2026, 5, 2, 7, 0)
+        assert merged.depart_time == datetime(2026, 5, 2, 8, 0)
+        assert merged.arrive_time == datetime(2026, 5, 2, 9, 5)
+        assert merged.updated_at == datetime(2026, 5, 2, 9, 5)
+
+        # 0004: 이름 → 작가 id, 이름으로 못 찾은 체크는 남은 담당 자리가 1개일 때만 그 작가
+        # (5: 김작가가 이미 체크한 1번 스케줄의 서브, 7: 메인만 있는 4번, 6: 자리 2개라 모름, 8: 작가 계정 없음)
+        assert [c.photographer_id for c in checkins] == [1, 1, 2, None, 2, None]
+        assert [(s.main_photographer_id, s.sub_photographer_id) for s in schedules.values()] == [
+            (1, 2), (1, None), (None, None), (2, None), (1, 2),
+        ]
+        rows = session.exec(select(ScheduleAssignment).order_by(ScheduleAssignment.schedule_id)).all()
+        assert [(a.schedule_id, a.photographer_id, a.role, str(a.wedding_date)) for a in rows] == [
+            (1, 1, "main", "2026-05-02"),
+            (1, 2, "sub", "2026-05-02"),
+            (2, 1, "main", "2026-05-02"),
+            (4, 2, "main", "2026-05-03"),
+            (5, 1, "main", "2026-05-04"),
+            (5, 2, "sub", "2026-05-04"),
+        ]
+
+    # 인덱스: 이름 기준 인덱스는 지우고 작가 id/연결 테이블 인덱스로
+    assert index_names(engine, "checkin") == {
+        "ix_checkin_schedule_id", "ix_checkin_photographer_name", "uq_checkin_schedule_photographer_id",
+    }
+    assert index_names(engine, "scheduleassignment") == {
+        "ix_assignment_photographer_date", "uq_assignment_schedule_photographer",
+    }
+    assert index_names(engine, "schedule") == {"ix_schedule_wedding_date", "ix_schedule_venue", "ix_schedule_main_name"}
+
+
+def test_int_cell_strings(tmp_path):
+    # 0005: v3.41 이전 기본 가져오기가 저장한 "101.0" → "101", 같은 파일을 다시 가져와도 추가/수정 없음
+    eng = make_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    SQLModel.metadata.create_all(eng)
+    path = tmp_path / "numeric_columns.xlsx"
+    numeric_column_workbook(path)
+    with Session(eng) as session:
+        assert import_schedule_rows(session, reference_importer.load_schedules_from_excel(str(path))) == (3, 0)
+        old_id = session.exec(select(Photographer.id).where(Photographer.name == "202.0")).one()
+        session.add(Checkin(schedule_id=1, photographer_name="202.0", photographer_id=old_id))
+        # 이미 "9"로 다시 가져온 중복이 있는 행은 그대로
+        session.add(Schedule(wedding_date=date(2026, 3, 3), venue="홀", couple="9.0"))
+        session.add(Schedule(wedding_date=date(2026, 3, 3), venue="홀", couple="9"))
+        session.commit()
+
+    upgrade(eng, log=lambda _: None)
+
+    with Session(eng) as session:
+        rows = session.exec(select(Schedule).order_by(Schedule.id)).all()
+        assert [(s.venue, s.couple, s.main_name, s.raw_photographers) for s in rows] == [
+            ("303", "101", "202", "202"), ("304", None, None, ""), ("305", "102.5", "203", "203"),
+            ("홀", "9.0", None, None), ("홀", "9", None, None),
+        ]
+        assert rows[0].main_photographer_id == old_id
+        assert session.get(Photographer, old_id).name == "202"
+        assert session.exec(select(Checkin.photographer_name)).all() == ["202"]
+
+        assert import_schedule_rows(session, importer.load_schedules_from_excel(str(path))) == (0, 0)
+        assert session.exec(select(func.count()).select_from(Photographer)).one() == 2
+    eng.dispose()
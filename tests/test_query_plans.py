@@ -0,0 +1,104 @@
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.dialects import sqlite
+from sqlmodel import SQLModel, select
+
+from app.assignments import assigned_schedules, assignment_values
+from app.db import make_engine
+from app.models import Checkin, Photographer, Schedule, ScheduleAssignment
+
+# 자주 쓰는 조회가 v3.51/v3.53 복합 인덱스를 타는지 EXPLAIN QUERY PLAN으로 확인
+# (운영과 같이 create_all + ANALYZE 후, main.py/alerts.py와 같은 조회문)
+
+DAY = date(2026, 5, 2)
+VENUES = [f"웨딩홀{i}" for i in range(30)]
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    path = tmp_path_factory.mktemp("plans") / "app.db"
+    eng = make_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(eng)
+    rnd = random.Random(0)
+    with eng.begin() as conn:
+        conn.execute(insert(Photographer), [
+            {"id": i, "name": f"작가{i}", "status": "활성", "username": f"p{i}", "password_hash": "x", "is_admin": False}
+            for i in range(1, 41)
+        ])
+        schedules, assignments, checkins = [], [], []
+        sid = 0
+        for d in range(120):
+            day = DAY - timedelta(days=60) + timedelta(days=d)
+            for _ in range(15):
+                sid += 1
+                main_id, sub_id = rnd.sample(range(1, 41), 2)
+                schedules.append({
+                    "id": sid, "wedding_date": day, "wedding_time": time(rnd.randint(10, 18), 0),
+                    "venue": rnd.choice(VENUES), "main_name": f"작가{main_id}", "sub_name": f"작가{sub_id}",
+                    "main_photographer_id": main_id, "sub_photographer_id": sub_id, "created_at": datetime(2026, 3, 1),
+                })
+                assignments += assignment_values(sid, day, main_id, sub_id)
+                if day < DAY:
+                    checkins += [
+                        {"schedule_id": sid, "photographer_id": pid, "photographer_name": f"작가{pid}",
+                         "wake_time": datetime.combine(day, time(6, 0)),
+                         "created_at": datetime(2026, 3, 1), "updated_at": datetime(2026, 3, 1)}
+                        for pid in (main_id, sub_id)
+                    ]
+        conn.execute(insert(Schedule), schedules)
+        conn.execute(insert(ScheduleAssignment), assignments)
+        conn.execute(insert(Checkin), checkins)
+    with eng.begin() as conn:
+        conn.exec_driver_sql("PRAGMA analysis_limit=1000")
+        conn.exec_driver_sql("ANALYZE")
+    yield eng
+    eng.dispose()
+
+
+def plan(engine, stmt) -> str:
+    sql = stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        return "\n".join(r[-1] for r in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+def assert_assigned_plan(p: str) -> None:
+    assert (
+        "SEARCH scheduleassignment USING INDEX ix_assignment_photographer_date"
+        " (photographer_id=? AND wedding_date>? AND wedding_date<?)"
+    ) in p, p
+    assert "SEARCH schedule USING INTEGER PRIMARY KEY (rowid=?)" in p, p
+    assert "SCAN" not in p, p
+
+
+def test_wake_my_schedules(engine):
+    # check_wake: 오늘 내 스케줄
+    assert_assigned_plan(plan(engine, assigned_schedules(7, DAY)))
+
+
+def test_depart_arrive_same_venue(engine):
+    # check_depart/check_arrive: 오늘 같은 홀의 내 스케줄
+    assert_assigned_plan(plan(engine, assigned_schedules(7, DAY).where(Schedule.venue == VENUES[3])))
+
+
+def test_my_schedules_range(engine):
+    # /my: 날짜 범위 + 정렬(정렬은 결과 행만 임시 B-tree)
+    q = assigned_schedules(7, DAY, DAY + timedelta(days=30)).order_by(Schedule.wedding_date, Schedule.wedding_time)
+    assert_assigned_plan(plan(engine, q))
+
+
+def test_get_or_create_checkin(engine):
+    q = select(Checkin).where((Checkin.schedule_id == 100) & (Checkin.photographer_id == 7))
+    p = plan(engine, q)
+    assert "SEARCH checkin USING INDEX uq_checkin_schedule_photographer_id (schedule_id=? AND photographer_id=?)" in p, p
+
+
+def test_alert_group_refresh(engine):
+    # AlertState._refresh: 바뀐 스케줄과 같은 (날짜, 웨딩홀) 묶음
+    dates = {DAY, DAY + timedelta(days=1)}
+    venues = {VENUES[1], VENUES[2], VENUES[5]}
+    q = select(Schedule).where(Schedule.wedding_date.in_(dates) & Schedule.venue.in_(venues))
+    p = plan(engine, q)
+    assert "SEARCH schedule USING INDEX ix_schedule_date_venue (wedding_date=? AND venue=?)" in p, p
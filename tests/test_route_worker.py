@@ -0,0 +1,134 @@
+import threading
+import time
+import uuid
+
+import pytest
+from sqlmodel import Session, SQLModel
+
+from app import alerts, route_worker as route_worker_module
+from app.db import engine
+from app.route_worker import RouteWorker
+from app.travel_times import load_travel_table
+
+# 이동시간 워커(스텁 Kakao 서버): 같은 작업 1번만, 실패 후 재시도 대기, 대기열 상한, 미리 계산은 전용 스레드
+
+
+@pytest.fixture(autouse=True)
+def tables():
+    SQLModel.metadata.create_all(engine)
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    """작업이 끝나면 alert_state.invalidate에 넘긴 스케줄 id"""
+    seen: list[set[int]] = []
+    monkeypatch.setattr(alerts.alert_state, "invalidate", lambda ids=None: seen.append(set(ids or ())))
+    return seen
+
+
+@pytest.fixture
+def worker():
+    w = RouteWorker(max_workers=2, max_pending=3)
+    yield w
+    w.shutdown()
+
+
+def new_pair() -> tuple[str, str]:
+    key = uuid.uuid4().hex[:8]
+    return f"서울 작가로 {key}", f"서울 웨딩로 {key}"
+
+
+def wait_idle(w: RouteWorker, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while w.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert w.pending_count() == 0
+
+
+def wait_for(cond, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cond()
+
+
+def test_same_job_computed_once(kakao_stub, worker, invalidated):
+    pair = new_pair()
+    kakao_stub.hold()
+    assert worker.submit(pair, schedule_id=1)
+    wait_for(lambda: kakao_stub.directions())  # 워커가 길찾기 응답을 기다리는 중
+    assert not worker.submit(pair, schedule_id=2)  # 같은 쌍은 대기 중인 작업에 스케줄만 추가
+    assert worker.is_pending(pair)
+    kakao_stub.release.set()
+    wait_idle(worker)
+
+    assert len(kakao_stub.directions()) == 1
+    assert {1, 2} in invalidated
+    with Session(engine) as session:
+        assert load_travel_table(session, [pair])[pair][""].minutes == 30
+
+
+def test_failed_job_waits_for_cooldown(kakao_stub, worker, invalidated, monkeypatch):
+    pair = new_pair()
+    kakao_stub.fail, kakao_stub.fail_status = 1, 400  # 재시도하지 않는 오류
+    assert worker.submit(pair, schedule_id=1)
+    wait_idle(worker)
+    assert worker.failed_count() == 1
+    assert not worker.submit(pair, schedule_id=1)  # 재시도 대기 중
+    assert len(kakao_stub.directions()) == 1
+
+    monkeypatch.setattr(route_worker_module, "ROUTE_RETRY_AFTER", 0)
+    assert worker.submit(pair, schedule_id=1)
+    wait_idle(worker)
+    assert len(kakao_stub.directions()) == 2
+    assert worker.failed_count() == 0  # 성공하면 실패 기록 삭제
+
+
+def test_expired_failures_are_pruned(kakao_stub, worker, invalidated, monkeypatch):
+    monkeypatch.setattr(route_worker_module, "ROUTE_RETRY_AFTER", 0.2)
+    kakao_stub.fail, kakao_stub.fail_status = 4, 400
+    for _ in range(3):
+        assert worker.submit(new_pair())
+    wait_idle(worker)
+    assert worker.failed_count() == 3
+    time.sleep(0.25)
+    assert worker.submit(new_pair())
+    wait_idle(worker)
+    assert worker.failed_count() == 1  # 재시도 대기가 끝난 3개는 정리
+
+
+def test_max_pending(kakao_stub, worker, invalidated):
+    kakao_stub.hold()
+    pairs = [new_pair() for _ in range(4)]
+    assert all(worker.submit(p) for p in pairs[:3])
+    assert not worker.submit(pairs[3])  # 대기열 가득(max_pending=3)
+    assert worker.pending_count() == 3
+    kakao_stub.release.set()
+    wait_idle(worker)
+    assert worker.submit(pairs[3])
+    wait_idle(worker)
+    assert len(kakao_stub.directions()) == 4
+
+
+def test_prewarm_does_not_block_live_jobs(kakao_stub, invalidated, monkeypatch):
+    # 미리 계산이 오래 걸려도 알림 화면 작업(워커 1개)은 바로 처리
+    w = RouteWorker(max_workers=1, max_pending=10)
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_prefetch(days):
+        started.set()
+        finish.wait(10)
+        return 0
+
+    monkeypatch.setattr(w, "prefetch_upcoming", slow_prefetch)
+    try:
+        assert w.prewarm(7)
+        assert started.wait(5)
+        assert not w.prewarm(7)  # 이미 실행 중
+        pair = new_pair()
+        assert w.submit(pair, schedule_id=9)
+        wait_idle(w, timeout=5)
+        assert {9} in invalidated
+    finally:
+        finish.set()
+        w.shutdown()
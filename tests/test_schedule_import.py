@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlmodel import Session, SQLModel, select
+
+from app import accounts, schedule_import
+from app.db import engine
+from app.models import Photographer, Schedule
+from app.schedule_import import import_schedules_file
+
+
+@pytest.fixture(autouse=True)
+def tables():
+    SQLModel.metadata.create_all(engine)
+
+
+def test_stream_import_provisions_each_name_once(tmp_path, monkeypatch):
+    # 스트리밍 저장: 작가 이름 조회는 새 이름이 나온 청크에서만(청크 5개, 새 이름은 1번째/5번째 청크)
+    monkeypatch.setattr(schedule_import, "IMPORT_CHUNK_SIZE", 10)
+    calls = []
+    load_account_names = accounts.load_account_names
+    monkeypatch.setattr(accounts, "load_account_names", lambda s: calls.append(1) or load_account_names(s))
+
+    tag = uuid.uuid4().hex[:6]
+    names = [f"청크작가{tag}{i % 3}" for i in range(40)] + [f"늦은작가{tag}"] * 10
+    path = tmp_path / "stream.xlsx"
+    rows = [
+        [None, None, f"커플{tag}-{i}", None, None, nm, datetime(2026, 9, 1 + i % 28), datetime(2026, 9, 1, 11, 0), None, "청크홀"]
+        for i, nm in enumerate(names)
+    ]
+    pd.DataFrame(rows, columns=list("ABCDEFGHIJ")).to_excel(path, index=False)
+
+    with Session(engine) as session:
+        assert import_schedules_file(session, str(path), mode="stream") == (50, 0)
+        assert len(calls) == 2
+
+        created = session.exec(select(Photographer.name).where(Photographer.name.contains(tag))).all()
+        assert sorted(created) == sorted(set(names))
+        linked = session.exec(select(Schedule.main_photographer_id).where(Schedule.couple.contains(tag))).all()
+        assert len(linked) == 50 and all(linked)
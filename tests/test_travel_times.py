@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel
+
+from app import alerts
+from app.db import engine
+from app.models import Schedule, TravelTime
+from app.route_worker import compute_travel_time
+from app.travel_times import departure_bucket, load_travel_table, storage_bucket
+
+
+@pytest.fixture(autouse=True)
+def tables():
+    SQLModel.metadata.create_all(engine)
+
+
+class RecordingWorker:
+    def __init__(self) -> None:
+        self.jobs = []
+
+    def submit(self, pair, schedule_id=None, bucket="", departure=None) -> bool:
+        self.jobs.append((pair, bucket, departure))
+        return True
+
+    def is_pending(self, pair, bucket="") -> bool:
+        return any(j[0] == pair and j[1] == bucket for j in self.jobs)
+
+
+def new_pair() -> tuple[str, str]:
+    key = uuid.uuid4().hex[:8]
+    return f"서울 작가로 {key}", f"서울 웨딩로 {key}"
+
+
+def buckets(pair) -> dict[str, int]:
+    with Session(engine) as session:
+        return {b: r.minutes for b, r in load_travel_table(session, [pair]).get(pair, {}).items()}
+
+
+def test_storage_bucket():
+    now = datetime(2026, 5, 2, 9, 0)
+    assert storage_bucket("sat-0730", datetime(2026, 5, 9, 7, 30), now) == "sat-0730"
+    assert storage_bucket("sat-0730", datetime(2026, 5, 2, 7, 30), now) == ""  # 이미 지난 출발
+    assert storage_bucket("sat-0730", None, now) == ""
+    assert storage_bucket("", datetime(2026, 5, 9, 7, 30), now) == ""
+
+
+def test_past_departure_saved_without_bucket(kakao_stub):
+    # 지난 출발 시각: 현재 교통(/v1/directions) 결과를 시간대 무관 값으로 저장
+    pair = new_pair()
+    departure = datetime.now() - timedelta(hours=3)
+    bucket = departure_bucket(departure)
+    assert compute_travel_time(pair, bucket, departure) == 30
+    assert [p.split("?")[0] for p in kakao_stub.directions()] == ["/v1/directions"]
+    assert buckets(pair) == {"": 30}
+
+    # 같은 작업이 다시 와도 저장된 값 사용(길찾기 다시 호출 안 함)
+    assert compute_travel_time(pair, bucket, departure) == 30
+    assert len(kakao_stub.directions()) == 1
+
+
+def test_future_departure_saved_under_bucket(kakao_stub):
+    pair = new_pair()
+    departure = datetime.now() + timedelta(days=2)
+    bucket = departure_bucket(departure)
+    assert compute_travel_time(pair, bucket, departure) == 30
+    assert [p.split("?")[0] for p in kakao_stub.directions()] == ["/v1/future/directions"]
+    assert buckets(pair) == {bucket: 30}
+
+
+def test_no_bucket_refresh_for_past_departure(monkeypatch):
+    # 시간대 무관 값이 있고 출발 시각이 지났으면 시간대 값 보충 작업을 넣지 않음
+    worker = RecordingWorker()
+    monkeypatch.setattr(alerts, "route_worker", worker)
+    pair = new_pair()
+    generic = {"": TravelTime(origin=pair[0], destination=pair[1], bucket="", minutes=40)}
+    past = Schedule(id=1, wedding_date=datetime.now().date(), venue="홀")
+    arrival = datetime.now() - timedelta(hours=1)
+    assert alerts.resolve_travel_minutes(past, pair, generic, arrival)[:1] == (40,)
+    assert worker.jobs == []
+
+    arrival = datetime.now() + timedelta(days=2)
+    assert alerts.resolve_travel_minutes(past, pair, generic, arrival)[:1] == (40,)
+    assert [j[1] for j in worker.jobs] == [departure_bucket(arrival - timedelta(minutes=40))]